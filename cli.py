@@ -8,12 +8,14 @@ Usage:
     python cli.py generate-ads --config examples/saas_config.json
     python cli.py generate-upsell --config examples/saas_config.json
     python cli.py run-workflow --config examples/saas_config.json
+    python cli.py serve --targets targets.json
 """
 
 import json
 import asyncio
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import typer
 
@@ -32,6 +34,75 @@ def load_config(config_path: str):
     return CampaignConfiguration(**data)
 
 
+def open_cache(cache_file: str, no_cache: bool, cache_ttl: Optional[float]):
+    """Open the on-disk LLM response cache used by the generate commands."""
+    from src.generators.cache import ResponseCache
+
+    return ResponseCache(Path(cache_file), ttl_seconds=cache_ttl, bypass=no_cache)
+
+
+CACHE_FILE_OPTION = typer.Option(
+    "llm_cache.sqlite", "--cache-file", help="On-disk cache of LLM responses"
+)
+NO_CACHE_OPTION = typer.Option(
+    False, "--no-cache", help="Ignore cached responses (still refreshes the cache)"
+)
+CACHE_TTL_OPTION = typer.Option(
+    None, "--cache-ttl", help="Maximum age of cached responses, in seconds"
+)
+
+
+@contextmanager
+def record_telemetry(
+    command: str, telemetry_file: Optional[str], telemetry_format: str
+):
+    """Tag LLM calls with the command and write their telemetry at the end."""
+    from src.telemetry.llm import make_sink, telemetry
+
+    sink = make_sink(Path(telemetry_file), telemetry_format) if telemetry_file else None
+    try:
+        with telemetry.context(command=command):
+            yield
+    finally:
+        if sink is not None:
+            sink.write(telemetry)
+    totals = telemetry.aggregate("command").get(command)
+    if totals:
+        typer.echo(
+            f"LLM calls: {totals['calls']} ({totals['retries']} retries), "
+            f"cost: ${totals['cost_usd']:.4f}"
+        )
+        typer.echo(
+            f"Tokens: {totals['input_tokens']} input, "
+            f"{totals['cache_read_input_tokens']} cache read, "
+            f"{totals['cache_creation_input_tokens']} cache write "
+            f"({totals['cache_hit_rate']:.0%} cache hit rate)"
+        )
+
+
+def open_backend(name: str, **llm_options):
+    """Create the generator backend; `llm_options` only apply to "llm"."""
+    from src.generators.backends import make_backend
+
+    try:
+        return make_backend(name, **(llm_options if name == "llm" else {}))
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--backend")
+
+
+BACKEND_OPTION = typer.Option(
+    "llm",
+    "--backend",
+    help="Generator backend: llm, or template (offline and deterministic)",
+)
+TELEMETRY_FILE_OPTION = typer.Option(
+    None, "--telemetry-file", help="Write per-call LLM tokens, latency and cost"
+)
+TELEMETRY_FORMAT_OPTION = typer.Option(
+    "json", "--telemetry-format", help="Telemetry file format: json or prometheus"
+)
+
+
 @app.command()
 def test_connection():
     """Test connection to the Google Ads API."""
@@ -65,15 +136,23 @@ def test_connection():
 def generate_personas(
     config: str = typer.Option(..., "--config", "-c", help="Path to config JSON"),
     output: Optional[str] = typer.Option(None, "--output", "-o", help="Output file"),
+    backend: str = BACKEND_OPTION,
+    cache_file: str = CACHE_FILE_OPTION,
+    no_cache: bool = NO_CACHE_OPTION,
+    cache_ttl: Optional[float] = CACHE_TTL_OPTION,
+    telemetry_file: Optional[str] = TELEMETRY_FILE_OPTION,
+    telemetry_format: str = TELEMETRY_FORMAT_OPTION,
 ):
     """Generate buyer personas for a campaign."""
-    from src.generators.persona_generator import generate_personas as gen_personas
-
     typer.echo(f"Loading config from {config}...")
     campaign_config = load_config(config)
+    generator = open_backend(backend)
 
     typer.echo("Generating personas (this may take a moment)...")
-    personas = gen_personas(campaign_config)
+    with record_telemetry("generate-personas", telemetry_file, telemetry_format):
+        personas = generator.generate_personas(
+            campaign_config, cache=open_cache(cache_file, no_cache, cache_ttl)
+        )
 
     typer.secho(f"\nGenerated {len(personas.personas)} personas:", fg=typer.colors.GREEN)
     for i, p in enumerate(personas.personas, 1):
@@ -92,13 +171,27 @@ def generate_personas(
 def generate_ads(
     config: str = typer.Option(..., "--config", "-c", help="Path to config JSON"),
     persona_name: str = typer.Option("Default Persona", "--persona", "-p", help="Persona name"),
+    overgenerate: bool = typer.Option(
+        False,
+        "--overgenerate",
+        help="Request surplus candidates and select valid copy locally",
+    ),
+    stream: bool = typer.Option(
+        False, "--stream", help="Stream copy and abort early on rule violations"
+    ),
+    backend: str = BACKEND_OPTION,
+    cache_file: str = CACHE_FILE_OPTION,
+    no_cache: bool = NO_CACHE_OPTION,
+    cache_ttl: Optional[float] = CACHE_TTL_OPTION,
+    telemetry_file: Optional[str] = TELEMETRY_FILE_OPTION,
+    telemetry_format: str = TELEMETRY_FORMAT_OPTION,
 ):
     """Generate polarity ad copy (Pull/Push) for a persona."""
-    from src.generators.ad_copy_generator import generate_polarity_ads
     from src.generators.persona_generator import PersonaSchema
 
     typer.echo(f"Loading config from {config}...")
     campaign_config = load_config(config)
+    generator = open_backend(backend, overgenerate=overgenerate, stream=stream)
 
     # Create a sample persona for demo
     persona = PersonaSchema(
@@ -109,7 +202,11 @@ def generate_ads(
     )
 
     typer.echo(f"Generating ads for persona: {persona.name}...")
-    ads = generate_polarity_ads(persona, campaign_config)
+    cache = open_cache(cache_file, no_cache, cache_ttl)
+    with record_telemetry("generate-ads", telemetry_file, telemetry_format):
+        ads = asyncio.run(
+            generator.agenerate_polarity_ads(persona, campaign_config, cache=cache)
+        )
 
     for ad in ads:
         typer.secho(f"\n{ad.angle} Ad:", fg=typer.colors.CYAN)
@@ -120,6 +217,98 @@ def generate_ads(
         for d in ad.copy.descriptions[:2]:
             typer.echo(f"    - {d}")
 
+    from src.generators.selection import ad_copy_stats
+
+    typer.echo(
+        f"\nCalls per ad: {ad_copy_stats.calls_per_ad:.2f}, "
+        f"retry rate: {ad_copy_stats.retry_rate:.0%}"
+    )
+
+
+@app.command()
+def generate_batch(
+    configs: List[str] = typer.Option(
+        ..., "--config", "-c", help="Path to a config JSON (repeatable)"
+    ),
+    max_concurrency: int = typer.Option(
+        16, "--max-concurrency", help="Maximum in-flight LLM calls"
+    ),
+    batch_api: bool = typer.Option(
+        False,
+        "--batch-api",
+        help="Submit through the Message Batches API (cheaper, not interactive)",
+    ),
+    poll_seconds: float = typer.Option(
+        30.0, "--poll-seconds", help="Batch status polling interval"
+    ),
+    stream: bool = typer.Option(
+        False, "--stream", help="Stream copy and abort early on rule violations"
+    ),
+    backend: str = BACKEND_OPTION,
+    cache_file: str = CACHE_FILE_OPTION,
+    no_cache: bool = NO_CACHE_OPTION,
+    cache_ttl: Optional[float] = CACHE_TTL_OPTION,
+    telemetry_file: Optional[str] = TELEMETRY_FILE_OPTION,
+    telemetry_format: str = TELEMETRY_FORMAT_OPTION,
+):
+    """Generate personas and Pull/Push ads for many configs concurrently."""
+    from src.generators.pipeline import GenerationPipeline
+
+    campaign_configs = [load_config(path) for path in configs]
+    cache = open_cache(cache_file, no_cache, cache_ttl)
+
+    if batch_api and backend != "llm":
+        raise typer.BadParameter(
+            "The Message Batches API needs the llm backend.", param_hint="--backend"
+        )
+    if batch_api:
+        from src.generators.batch import AnthropicBatchBackend, BatchGenerator
+
+        generator = BatchGenerator(
+            AnthropicBatchBackend(), poll_seconds=poll_seconds, cache=cache
+        )
+        with record_telemetry("generate-batch", telemetry_file, telemetry_format):
+            results = generator.run(campaign_configs)
+        failed = [result for result in results if result.error]
+        for result in failed:
+            typer.secho(
+                f"[{configs[result.config_index]}] {result.kind} failed: "
+                f"{result.error}",
+                fg=typer.colors.RED,
+            )
+        typer.echo(
+            f"Generated {len(results) - len(failed)} of {len(results)} results "
+            f"in {generator.batches_submitted} batches."
+        )
+        return
+
+    pipeline = GenerationPipeline(
+        max_concurrency=max_concurrency,
+        cache=cache,
+        backend=open_backend(backend, stream=stream),
+    )
+
+    async def run():
+        async for result in pipeline.stream(campaign_configs):
+            source = configs[result.config_index]
+            if result.error:
+                typer.secho(
+                    f"[{source}] {result.kind} failed: {result.error}",
+                    fg=typer.colors.RED,
+                )
+            elif result.kind == "personas":
+                names = ", ".join(p.name for p in result.value.personas)
+                typer.echo(f"[{source}] Personas: {names}")
+            else:
+                typer.echo(
+                    f"[{source}] {result.angle} ad for {result.persona.name}: "
+                    f"{result.value.copy.headlines[0]}"
+                )
+
+    with record_telemetry("generate-batch", telemetry_file, telemetry_format):
+        asyncio.run(run())
+    typer.echo(json.dumps(pipeline.stats.summary(), indent=2))
+
 
 @app.command()
 def generate_upsell(
@@ -144,6 +333,8 @@ def generate_upsell(
 @app.command()
 def run_workflow(
     config: str = typer.Option(..., "--config", "-c", help="Path to config JSON"),
+    telemetry_file: Optional[str] = TELEMETRY_FILE_OPTION,
+    telemetry_format: str = TELEMETRY_FORMAT_OPTION,
 ):
     """Run the full campaign setup workflow with Claude Agent."""
     from src.agent.client import client
@@ -155,7 +346,8 @@ def run_workflow(
     typer.echo("\nStarting campaign setup workflow...")
     typer.echo("The agent will ask for approval before creating the campaign.\n")
 
-    result = asyncio.run(run_setup(client, campaign_config))
+    with record_telemetry("run-workflow", telemetry_file, telemetry_format):
+        result = asyncio.run(run_setup(client, campaign_config))
 
     if result.status == "SUCCESS":
         typer.secho(f"\n{result.status}: {result.message}", fg=typer.colors.GREEN)
@@ -165,6 +357,105 @@ def run_workflow(
         typer.secho(f"\n{result.status}: {result.message}", fg=typer.colors.YELLOW)
 
 
+@app.command()
+def serve(
+    targets: str = typer.Option(
+        ...,
+        "--targets",
+        "-t",
+        help='Path to targets JSON: [{"customer_id", "start_date", "campaign_ids"}]',
+    ),
+    max_concurrency: int = typer.Option(8, "--max-concurrency", help="Worker count"),
+    status_file: Optional[str] = typer.Option(
+        None, "--status-file", help="Write job runtimes and lag to this JSON file"
+    ),
+    snapshot_file: str = typer.Option(
+        "monitor_snapshots.json",
+        "--snapshot-file",
+        help="Metrics snapshots used to skip unchanged ad groups",
+    ),
+    journal_file: str = typer.Option(
+        "action_journal.json",
+        "--journal-file",
+        help="Journal of applied pauses and bid increases, to make re-runs idempotent",
+    ),
+):
+    """Run monitors and optimizers continuously as a resident scheduler."""
+    from src.config.google_ads_client import get_google_ads_client
+    from src.monitoring.snapshots import SnapshotStore
+    from src.mutations.journal import ActionJournal
+    from src.scheduler.scheduler import MonitorScheduler, build_account_jobs
+
+    with open(targets, "r") as f:
+        target_list = json.load(f)
+
+    client = get_google_ads_client()
+    if not client:
+        typer.secho("FAILED: Could not initialize client", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    scheduler = MonitorScheduler(
+        max_concurrency=max_concurrency,
+        status_path=Path(status_file) if status_file else None,
+    )
+    snapshots = SnapshotStore(Path(snapshot_file))
+    journal = ActionJournal(Path(journal_file))
+    for job in build_account_jobs(
+        client, target_list, snapshots=snapshots, journal=journal
+    ):
+        scheduler.add_job(job, run_immediately=False)
+
+    typer.echo(
+        f"Watching {len(target_list)} accounts with {len(scheduler.jobs)} jobs. "
+        "Press Ctrl+C to stop."
+    )
+    asyncio.run(scheduler.run())
+
+
+@app.command()
+def optimize(
+    targets: str = typer.Option(
+        ...,
+        "--targets",
+        "-t",
+        help='Path to targets JSON: [{"customer_id", "campaign_ids"}]',
+    ),
+    max_workers: int = typer.Option(16, "--max-workers", help="Parallel targets"),
+    plan_file: Optional[str] = typer.Option(
+        None, "--plan-file", help="Write a mutation plan here instead of mutating"
+    ),
+    journal_file: str = typer.Option(
+        "action_journal.json",
+        "--journal-file",
+        help="Journal of applied pauses and bid increases, to make re-runs idempotent",
+    ),
+):
+    """Run persona optimization over many campaigns in parallel."""
+    from src.config.google_ads_client import get_google_ads_client
+    from src.mutations.journal import ActionJournal
+    from src.optimization.persona_optimizer import PersonaOptimizer
+    from src.optimization.runner import OptimizerRunner, expand_targets
+
+    with open(targets, "r") as f:
+        target_pairs = expand_targets(json.load(f))
+
+    client = get_google_ads_client()
+    if not client:
+        typer.secho("FAILED: Could not initialize client", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    runner = OptimizerRunner(
+        PersonaOptimizer(client=client),
+        max_workers=max_workers,
+        journal=ActionJournal(Path(journal_file)),
+    )
+    report = runner.run(target_pairs, plan_only=plan_file is not None)
+    if plan_file is not None and report.plan is not None:
+        report.plan.save(Path(plan_file))
+        typer.echo(f"Plan with {len(report.plan)} changes saved to {plan_file}")
+    typer.echo(json.dumps(report.summary(), indent=2))
+
+
 @app.command()
 def list_examples():
     """List available example configurations."""
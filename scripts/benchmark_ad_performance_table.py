@@ -0,0 +1,86 @@
+"""
+Benchmarks AdPerformanceTable against a list of pydantic AdPerformance models.
+
+Reports construction time and traced memory per 100k rows.
+
+Usage:
+    python scripts/benchmark_ad_performance_table.py [--rows 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.models.ad_performance import AdPerformance  # noqa: E402
+from src.monitoring.ad_performance_table import AdPerformanceTable  # noqa: E402
+
+
+def _rows(n: int):
+    for i in range(n):
+        yield (
+            i,
+            i // 50,
+            f"customers/1234567890/adGroupAds/{i // 50}~{i}",
+            (i % 37) / 1000,
+            100 + i % 900,
+            i % 40,
+        )
+
+
+def _build_models(n: int):
+    return [
+        AdPerformance(
+            ad_id=str(ad_id),
+            ad_group_ad_resource_name=resource_name,
+            ctr=ctr,
+            impressions=impressions,
+            clicks=clicks,
+        )
+        for ad_id, _, resource_name, ctr, impressions, clicks in _rows(n)
+    ]
+
+
+def _build_table(n: int):
+    table = AdPerformanceTable()
+    for row in _rows(n):
+        table.append(*row)
+    return table
+
+
+def _measure(label: str, build, n: int):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build(n)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    scale = 100_000 / n
+    print(
+        f"{label:<22} {elapsed * scale:8.3f} s/100k  "
+        f"{current * scale / 1e6:8.1f} MB/100k retained  "
+        f"{peak * scale / 1e6:8.1f} MB/100k peak"
+    )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"Building {args.rows} rows...")
+    _measure("AdPerformance list", _build_models, args.rows)
+    table = _measure("AdPerformanceTable", _build_table, args.rows)
+
+    start = time.perf_counter()
+    table.below_ctr(0.01).sort_by("ctr")
+    print(f"{'filter + sort':<22} {time.perf_counter() - start:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
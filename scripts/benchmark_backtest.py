@@ -0,0 +1,72 @@
+"""
+Benchmarks a backtest parameter sweep over a year of synthetic daily data.
+
+Usage:
+    python scripts/benchmark_backtest.py [--campaigns 200] [--days 365]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.optimization.backtest import (  # noqa: E402
+    PersonaRuleVariant,
+    ScalerVariant,
+    backtest_budget_scaling,
+    backtest_persona_rules,
+    make_grid,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--campaigns", type=int, default=200)
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    shape = (args.days, args.campaigns)
+    budgets = np.full(shape, 1000 * 1_000_000)
+    spend = rng.uniform(0.5, 1.0, size=shape) * budgets
+    conversions = rng.poisson(rng.uniform(0, 20, size=args.campaigns), size=shape)
+
+    scaler_grid = make_grid(
+        ScalerVariant,
+        pause_below=[0.5, 0.75, 1.0, 1.25],
+        golden_below=[3.5, 4.0, 4.5, 5.0, 6.0],
+        max_daily_change=[0.05, 0.1, 0.15, 0.2, 0.3],
+    )
+    start = time.perf_counter()
+    result = backtest_budget_scaling(
+        budgets, spend, conversions, avg_ltv=200, variants=scaler_grid
+    )
+    print(
+        f"Budget sweep: {len(scaler_grid)} variants x {args.campaigns} campaigns x "
+        f"{args.days} days in {time.perf_counter() - start:.2f} s "
+        f"(best variant: {scaler_grid[result.best()]})"
+    )
+
+    persona_grid = make_grid(
+        PersonaRuleVariant,
+        zero_conversion_cutoff_micros=np.arange(1000, 5001, 500) * 1_000_000,
+        min_winning_conversions=[3, 5, 8, 10],
+        bid_increase_percentage=[0.1, 0.2, 0.3],
+    )
+    start = time.perf_counter()
+    result = backtest_persona_rules(
+        spend, conversions, target_cpa_micros=100 * 1_000_000, variants=persona_grid
+    )
+    print(
+        f"Persona sweep: {len(persona_grid)} variants x {args.campaigns} ad groups x "
+        f"{args.days} days in {time.perf_counter() - start:.2f} s "
+        f"(best variant: {persona_grid[result.best()]})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmarks the GoldenRatioScaler batch API against the scalar functions.
+
+Usage:
+    python scripts/benchmark_golden_ratio_batch.py [--rows 1000000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.budget.golden_ratio_scaler import GoldenRatioScaler  # noqa: E402
+
+
+def _scalar(budgets, conversions, spend, avg_ltv):
+    return [
+        GoldenRatioScaler.calculate_new_budget(
+            b, GoldenRatioScaler.calculate_ltv_cac_ratio(c, s, avg_ltv)
+        )
+        for b, c, s in zip(budgets, conversions, spend)
+    ]
+
+
+def _batch(budgets, conversions, spend, avg_ltv):
+    ratios = GoldenRatioScaler.calculate_ltv_cac_ratio_batch(
+        conversions, spend, avg_ltv
+    )
+    return GoldenRatioScaler.calculate_new_budget_batch(budgets, ratios)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    budgets = rng.integers(100, 2500, size=args.rows) * 1_000_000
+    conversions = rng.integers(0, 50, size=args.rows)
+    spend = rng.integers(0, 20_000, size=args.rows) * 1_000_000
+
+    start = time.perf_counter()
+    batch = _batch(budgets, conversions, spend, 200.0)
+    batch_elapsed = time.perf_counter() - start
+    print(f"batch   {batch_elapsed:8.3f} s for {args.rows} rows")
+
+    scalar_inputs = (budgets.tolist(), conversions.tolist(), spend.tolist(), 200.0)
+    start = time.perf_counter()
+    scalar = _scalar(*scalar_inputs)
+    scalar_elapsed = time.perf_counter() - start
+    print(f"scalar  {scalar_elapsed:8.3f} s for {args.rows} rows")
+
+    assert batch.tolist() == scalar
+    print(f"speedup {scalar_elapsed / batch_elapsed:8.1f}x (results identical)")
+
+
+if __name__ == "__main__":
+    main()
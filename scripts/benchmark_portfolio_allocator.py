@@ -0,0 +1,44 @@
+"""
+Benchmarks portfolio budget allocation over a synthetic MCC.
+
+Usage:
+    python scripts/benchmark_portfolio_allocator.py [--campaigns 10000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.budget.portfolio_allocator import allocate_portfolio_budgets  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--campaigns", type=int, default=10_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    current = rng.integers(100, 2500, size=args.campaigns) * 1_000_000
+    conversions = rng.integers(0, 50, size=args.campaigns)
+    spend = rng.integers(0, 20_000, size=args.campaigns) * 1_000_000
+    ceiling = int(current.sum() * 0.9)
+
+    start = time.perf_counter()
+    allocation = allocate_portfolio_budgets(
+        current, conversions, spend, 200, total_budget_ceiling_micros=ceiling
+    )
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"Allocated {args.campaigns} campaigns in {elapsed * 1000:.1f} ms "
+        f"(ceiling binding: {allocation.ceiling_binding})."
+    )
+
+
+if __name__ == "__main__":
+    main()
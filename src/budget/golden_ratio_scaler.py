@@ -2,6 +2,8 @@
 
 import math
 
+import numpy as np
+
 # Constants based on PRD Section 3.3.1
 MAX_DAILY_BUDGET_MICROS = 2000 * 1_000_000
 CIRCUIT_BREAKER_THRESHOLD_MICROS = 2400 * 1_000_000
@@ -103,3 +105,82 @@ class GoldenRatioScaler:
         new_budget = min(target_budget, MAX_DAILY_BUDGET_MICROS)
 
         return math.ceil(new_budget)
+
+    @staticmethod
+    def calculate_ltv_cac_ratio_batch(
+        conversions, total_spend_micros, avg_ltv
+    ) -> np.ndarray:
+        """
+        Array counterpart of `calculate_ltv_cac_ratio`.
+
+        Args:
+            conversions: Array of conversion counts.
+            total_spend_micros: Array of total ad spend in micros.
+            avg_ltv: Average Lifetime Value (scalar or array).
+
+        Returns:
+            An array of LTV:CAC ratios; 0.0 where conversions are zero and
+            inf where spend is zero but conversions are not.
+        """
+        conversions = np.asarray(conversions, dtype=np.float64)
+        total_spend = np.asarray(total_spend_micros, dtype=np.float64) / 1_000_000
+        avg_ltv = np.asarray(avg_ltv, dtype=np.float64)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cac = total_spend / conversions
+            ratio = avg_ltv / cac
+        return np.select(
+            [conversions == 0, cac == 0], [0.0, np.inf], default=ratio
+        ).astype(np.float64)
+
+    @staticmethod
+    def get_scaling_factor_batch(ltv_cac) -> np.ndarray:
+        """
+        Array counterpart of `get_scaling_factor`.
+
+        Args:
+            ltv_cac: Array of LTV to CAC ratios.
+
+        Returns:
+            An array of scaling factors.
+        """
+        ltv_cac = np.asarray(ltv_cac, dtype=np.float64)
+        return np.select(
+            [ltv_cac < 1.0, ltv_cac < 3.0, ltv_cac < 4.0],
+            [PAUSE_FACTOR, MAINTAIN_FACTOR, GOLDEN_RATIO_SCALE_UP],
+            default=AGGRESSIVE_SCALE_UP,
+        )
+
+    @staticmethod
+    def calculate_new_budget_batch(current_budget_micros, ltv_cac) -> np.ndarray:
+        """
+        Array counterpart of `calculate_new_budget`, returning identical values.
+
+        Args:
+            current_budget_micros: Array of current daily budgets in micros.
+            ltv_cac: Array of LTV to CAC ratios.
+
+        Returns:
+            An int64 array of new daily budgets in micros.
+        """
+        current = np.asarray(current_budget_micros, dtype=np.float64)
+        scaling_factor = GoldenRatioScaler.get_scaling_factor_batch(ltv_cac)
+        target = current * scaling_factor
+
+        # Gradual scaling: <20% change per day (same comparisons as the scalar path)
+        max_change = current * MAX_DAILY_CHANGE_PERCENTAGE
+        new_budget = np.where(
+            (target > current) & (target - current > max_change),
+            current + max_change,
+            target,
+        )
+        new_budget = np.where(
+            (target < current) & (current - target > max_change),
+            current - max_change,
+            new_budget,
+        )
+
+        # Circuit breaker: Cap the new budget at the maximum daily limit.
+        new_budget = np.minimum(new_budget, MAX_DAILY_BUDGET_MICROS)
+        new_budget = np.where(scaling_factor == PAUSE_FACTOR, 0.0, new_budget)
+        return np.ceil(new_budget).astype(np.int64)
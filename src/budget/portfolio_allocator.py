@@ -0,0 +1,109 @@
+# src/budget/portfolio_allocator.py
+
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.budget.golden_ratio_scaler import (
+    MAX_DAILY_BUDGET_MICROS,
+    MAX_DAILY_CHANGE_PERCENTAGE,
+    PAUSE_FACTOR,
+    GoldenRatioScaler,
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PortfolioAllocation:
+    """The result of a portfolio budget allocation, one element per campaign."""
+
+    budgets_micros: np.ndarray
+    ltv_cac: np.ndarray
+    scaling_factors: np.ndarray
+    ceiling_binding: bool
+
+
+def allocate_portfolio_budgets(
+    current_budgets_micros,
+    conversions,
+    total_spend_micros,
+    avg_ltv,
+    total_budget_ceiling_micros: int,
+) -> PortfolioAllocation:
+    """
+    Allocates next-day budgets across all campaigns under a shared ceiling.
+
+    Each campaign first gets its `GoldenRatioScaler.calculate_new_budget_batch`
+    budget, i.e. its Golden Ratio target clamped to the ±20% daily change
+    limit and `MAX_DAILY_BUDGET_MICROS`. If the portfolio total
+    then exceeds `total_budget_ceiling_micros`, budgets are cut back towards
+    their -20% floor starting with the lowest LTV:CAC campaigns, so the best
+    campaigns keep their increases. If even every floor exceeds the ceiling,
+    all campaigns are set to their floor and a warning is logged, since the
+    daily change limit takes precedence.
+
+    Args:
+        current_budgets_micros: Current daily budgets in micros.
+        conversions: Conversions per campaign.
+        total_spend_micros: Total spend per campaign in micros.
+        avg_ltv: Average customer LTV (scalar or per campaign).
+        total_budget_ceiling_micros: The global daily spend ceiling in micros.
+
+    Returns:
+        A PortfolioAllocation with integer budgets in micros.
+    """
+    current = np.asarray(current_budgets_micros, dtype=np.float64)
+    ltv_cac = GoldenRatioScaler.calculate_ltv_cac_ratio_batch(
+        conversions, total_spend_micros, avg_ltv
+    )
+    scaling_factors = GoldenRatioScaler.get_scaling_factor_batch(ltv_cac)
+    paused = scaling_factors == PAUSE_FACTOR
+
+    desired = GoldenRatioScaler.calculate_new_budget_batch(current, ltv_cac)
+    floor = np.where(
+        paused,
+        0.0,
+        np.minimum(
+            current - current * MAX_DAILY_CHANGE_PERCENTAGE, MAX_DAILY_BUDGET_MICROS
+        ),
+    )
+
+    excess = desired.sum() - total_budget_ceiling_micros
+    if excess <= 0:
+        return PortfolioAllocation(
+            budgets_micros=desired,
+            ltv_cac=ltv_cac,
+            scaling_factors=scaling_factors,
+            ceiling_binding=False,
+        )
+
+    room = desired - floor
+    if room.sum() < excess:
+        logger.warning(
+            "Global budget ceiling cannot be met without exceeding the daily "
+            "change limit; setting every campaign to its minimum budget."
+        )
+        budgets = floor
+    else:
+        # Cut the lowest LTV:CAC campaigns first, down to their floor.
+        order = np.argsort(ltv_cac, kind="stable")
+        room_sorted = room[order]
+        room_before = np.cumsum(room_sorted) - room_sorted
+        cuts = np.empty_like(room)
+        cuts[order] = np.clip(excess - room_before, 0.0, room_sorted)
+        budgets = desired - cuts
+        logger.info(
+            f"Global ceiling binding: reduced portfolio budget by {excess / 1_000_000:.2f}."
+        )
+
+    # Round down to stay under the ceiling, but never below the change limit.
+    return PortfolioAllocation(
+        budgets_micros=np.maximum(np.floor(budgets), np.ceil(floor)).astype(np.int64),
+        ltv_cac=ltv_cac,
+        scaling_factors=scaling_factors,
+        ceiling_binding=True,
+    )
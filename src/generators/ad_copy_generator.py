@@ -2,22 +2,52 @@
 TASK-023: Implement Polarity Ad Copy Generator
 """
 
-from typing import List, Literal
-from jinja2 import Template
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Literal, Optional, Type, TypeVar, cast
 from pydantic import BaseModel, Field, field_validator
 import instructor
-from anthropic import Anthropic
-import yaml
-from pathlib import Path
+from instructor.client import AsyncInstructor
+from anthropic import Anthropic, AsyncAnthropic, RateLimitError
+from src.generators.cache import ResponseCache, make_key
+from src.generators.prompt_cache import cached_user_message
+from src.generators.selection import ad_copy_stats, dedupe
+from src.generators.templates import get_registry
 from src.models.configuration import CampaignConfiguration
+from src.telemetry.llm import telemetry
 from src.generators.persona_generator import PersonaSchema
 
-# Configure instructor with the Anthropic client
+# Configure instructor with the Anthropic clients
 client = instructor.from_anthropic(Anthropic())
+# from_anthropic is annotated to return the sync client for AsyncAnthropic too
+async_client = cast(AsyncInstructor, instructor.from_anthropic(AsyncAnthropic()))
+
+Angle = Literal["PULL", "PUSH"]
+ANGLES: List[Angle] = ["PULL", "PUSH"]
+MODEL = "claude-3-haiku-20240307"
 
 # Keyword blocklist for policy pre-checks
 KEYWORD_BLOCKLIST = ["guarantee", "free", "100%", "risk-free"]
 
+HEADLINE_MAX_LENGTH = 30
+DESCRIPTION_MAX_LENGTH = 90
+# Candidates requested per call in over-generation mode.
+CANDIDATE_HEADLINES = 20
+CANDIDATE_DESCRIPTIONS = 8
+# Items kept from the candidates (AdCopySchema allows 15 and 4).
+SELECTED_HEADLINES = 10
+SELECTED_DESCRIPTIONS = 4
+
+
+def _item_error(text: str, kind: str, max_length: int) -> Optional[str]:
+    """Returns why a headline or description is invalid, or None."""
+    if len(text) > max_length:
+        return f"{kind} must be {max_length} characters or less."
+    if any(blocked in text.lower() for blocked in KEYWORD_BLOCKLIST):
+        return f"Ad copy contains a blocked keyword: {text}"
+    return None
+
 
 class AdCopySchema(BaseModel):
     """Pydantic model for a single ad copy variation."""
@@ -29,69 +59,427 @@ class AdCopySchema(BaseModel):
     @classmethod
     def validate_headlines(cls, headlines):
         for h in headlines:
-            if len(h) > 30:
-                raise ValueError("Headline must be 30 characters or less.")
-            if any(blocked in h.lower() for blocked in KEYWORD_BLOCKLIST):
-                raise ValueError(f"Ad copy contains a blocked keyword: {h}")
+            error = _item_error(h, "Headline", HEADLINE_MAX_LENGTH)
+            if error:
+                raise ValueError(error)
         return headlines
 
     @field_validator("descriptions")
     @classmethod
     def validate_descriptions(cls, descriptions):
         for d in descriptions:
-            if len(d) > 90:
-                raise ValueError("Description must be 90 characters or less.")
-            if any(blocked in d.lower() for blocked in KEYWORD_BLOCKLIST):
-                raise ValueError(f"Ad copy contains a blocked keyword: {d}")
+            error = _item_error(d, "Description", DESCRIPTION_MAX_LENGTH)
+            if error:
+                raise ValueError(error)
         return descriptions
 
 
+class AdCopyDraft(BaseModel):
+    """
+    Ad copy as returned by the LLM, before per-item validation.
+
+    Only the list sizes are enforced, so one bad headline does not discard
+    the whole response; `find_invalid_items` reports the items to repair.
+    """
+
+    headlines: List[str] = Field(..., min_length=3, max_length=15)
+    descriptions: List[str] = Field(..., min_length=2, max_length=4)
+
+
+class AdCopyRepair(BaseModel):
+    """Replacements for the invalid items, in the order they were listed."""
+
+    headlines: List[str] = Field(default_factory=list)
+    descriptions: List[str] = Field(default_factory=list)
+
+
+class AdCopyCandidates(BaseModel):
+    """A surplus of candidate headlines and descriptions, best first."""
+
+    headlines: List[str] = Field(..., min_length=3, max_length=40)
+    descriptions: List[str] = Field(..., min_length=2, max_length=16)
+
+
+@dataclass
+class InvalidItem:
+    """One headline or description that fails validation."""
+
+    field: str  # "headlines" or "descriptions"
+    index: int
+    text: str
+    reason: str
+
+
+def find_invalid_items(draft: BaseModel) -> List[InvalidItem]:
+    """Returns every headline and description that AdCopySchema would reject."""
+    invalid = []
+    for field, kind, max_length in (
+        ("headlines", "Headline", HEADLINE_MAX_LENGTH),
+        ("descriptions", "Description", DESCRIPTION_MAX_LENGTH),
+    ):
+        for index, text in enumerate(getattr(draft, field)):
+            reason = _item_error(text, kind, max_length)
+            if reason:
+                invalid.append(InvalidItem(field, index, text, reason))
+    return invalid
+
+
+def apply_repairs(
+    draft: AdCopyDraft, invalid: List[InvalidItem], repair: AdCopyRepair
+) -> AdCopyDraft:
+    """Returns the draft with each invalid item replaced by its repair."""
+    fields = {
+        "headlines": list(draft.headlines),
+        "descriptions": list(draft.descriptions),
+    }
+    for field in fields:
+        items = [item for item in invalid if item.field == field]
+        for item, replacement in zip(items, getattr(repair, field)):
+            fields[field][item.index] = replacement
+    return AdCopyDraft(**fields)
+
+
+def finalize_copy(draft: AdCopyDraft) -> AdCopySchema:
+    """
+    Drops any items still invalid after repair and validates the rest.
+
+    Raises:
+        ValidationError: If too few valid headlines or descriptions remain.
+    """
+    invalid = {(item.field, item.index) for item in find_invalid_items(draft)}
+    return AdCopySchema(
+        headlines=[
+            h for i, h in enumerate(draft.headlines) if ("headlines", i) not in invalid
+        ],
+        descriptions=[
+            d
+            for i, d in enumerate(draft.descriptions)
+            if ("descriptions", i) not in invalid
+        ],
+    )
+
+
 class AdVariation(BaseModel):
     """Represents a single ad variation with a specific angle."""
 
-    angle: Literal["PULL", "PUSH"]
+    angle: Angle
     copy: AdCopySchema
 
 
+def select_copy(candidates: AdCopyCandidates) -> AdCopySchema:
+    """
+    Selects valid, distinct headlines and descriptions from candidates.
+
+    Invalid items are filtered with the AdCopySchema rules, near-duplicates
+    are removed, and the highest-ranked remaining items are kept.
+
+    Raises:
+        ValidationError: If too few valid, distinct candidates remain.
+    """
+    selected = {}
+    for field, kind, max_length, limit in (
+        ("headlines", "Headline", HEADLINE_MAX_LENGTH, SELECTED_HEADLINES),
+        ("descriptions", "Description", DESCRIPTION_MAX_LENGTH, SELECTED_DESCRIPTIONS),
+    ):
+        texts = [t.strip() for t in getattr(candidates, field)]
+        valid = [t for t in texts if t and not _item_error(t, kind, max_length)]
+        distinct, duplicates = dedupe(valid)
+        ad_copy_stats.add(
+            candidates=len(texts),
+            rejected_invalid=len(texts) - len(valid),
+            rejected_duplicate=duplicates,
+        )
+        selected[field] = distinct[:limit]
+    return AdCopySchema(**selected)
+
+
+def _render_message(
+    angle: Angle,
+    persona: PersonaSchema,
+    config: CampaignConfiguration,
+    overgenerate: bool = False,
+) -> Dict[str, Any]:
+    """
+    Renders the user message for an angle.
+
+    The angle's rules and examples form a static prefix, marked for prompt
+    caching when it is long enough for MODEL; only the persona and campaign
+    context vary per call. With `overgenerate`, the suffix asks for a
+    surplus of candidates.
+    """
+    registry = get_registry()
+    static_prefix = registry.render(
+        f"setup/generate_polarity_ads.yaml#{angle.lower()}_template",
+        keyword_blocklist=KEYWORD_BLOCKLIST,
+    )
+    parts = [
+        registry.render(
+            "setup/generate_polarity_ads.yaml#context_template",
+            persona=persona,
+            config=config,
+        )
+    ]
+    if overgenerate:
+        parts.append(
+            registry.render(
+                "setup/generate_polarity_ads.yaml#overgenerate_template",
+                headline_count=CANDIDATE_HEADLINES,
+                description_count=CANDIDATE_DESCRIPTIONS,
+            )
+        )
+    return cached_user_message(static_prefix, "\n\n".join(parts), model=MODEL)
+
+
+def _cache_key(message: Dict[str, Any]) -> str:
+    return make_key(MODEL, json.dumps(message, sort_keys=True), AdCopySchema)
+
+
+def _render_repair_message(angle: Angle, invalid: List[InvalidItem]) -> Dict[str, Any]:
+    """Renders a request to rewrite only the invalid items."""
+    prompt = get_registry().render(
+        "setup/repair_ad_copy.yaml",
+        angle=angle,
+        items=invalid,
+        headline_max_length=HEADLINE_MAX_LENGTH,
+        description_max_length=DESCRIPTION_MAX_LENGTH,
+        keyword_blocklist=KEYWORD_BLOCKLIST,
+    )
+    return {"role": "user", "content": prompt}
+
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def _create(
+    response_model: Type[ModelT], message: Dict[str, Any], max_tokens: int
+) -> ModelT:
+    """
+    Requests `response_model` from the LLM with instructor.
+
+    instructor annotates `messages` with OpenAI's message types, so the
+    Anthropic-style message is passed untyped.
+    """
+    return client.messages.create(
+        model=MODEL,
+        max_tokens=max_tokens,
+        messages=cast(Any, [message]),
+        response_model=response_model,
+    )
+
+
+async def _acreate(
+    response_model: Type[ModelT], message: Dict[str, Any], max_tokens: int
+) -> ModelT:
+    """Async variant of `_create`."""
+    return await async_client.messages.create(
+        model=MODEL,
+        max_tokens=max_tokens,
+        messages=cast(Any, [message]),
+        response_model=response_model,
+    )
+
+
+def _repair_copy(draft: AdCopyDraft, angle: Angle, max_repairs: int) -> AdCopySchema:
+    """Repairs the invalid items of a draft with small targeted requests."""
+    for _ in range(max_repairs):
+        invalid = find_invalid_items(draft)
+        if not invalid:
+            break
+        print(f"Repairing {len(invalid)} invalid items in {angle} ad.")
+        ad_copy_stats.add(calls=1)
+        with telemetry.track("ad_repair", MODEL) as call:
+            repair = _create(
+                AdCopyRepair, _render_repair_message(angle, invalid), max_tokens=512
+            )
+            call.record_response(repair)
+        draft = apply_repairs(draft, invalid, repair)
+    return finalize_copy(draft)
+
+
+async def _arepair_copy(
+    draft: AdCopyDraft, angle: Angle, max_repairs: int
+) -> AdCopySchema:
+    """Async variant of `_repair_copy`."""
+    for _ in range(max_repairs):
+        invalid = find_invalid_items(draft)
+        if not invalid:
+            break
+        print(f"Repairing {len(invalid)} invalid items in {angle} ad.")
+        ad_copy_stats.add(calls=1)
+        with telemetry.track("ad_repair", MODEL) as call:
+            repair = await _acreate(
+                AdCopyRepair, _render_repair_message(angle, invalid), max_tokens=512
+            )
+            call.record_response(repair)
+        draft = apply_repairs(draft, invalid, repair)
+    return finalize_copy(draft)
+
+
+def _request_copy(
+    angle: Angle,
+    message: Dict[str, Any],
+    attempt: int,
+    max_repairs: int,
+    overgenerate: bool,
+) -> AdCopySchema:
+    """Requests one angle's copy and turns it into a valid AdCopySchema."""
+    if overgenerate:
+        with telemetry.track("ad_copy", MODEL, attempt=attempt) as call:
+            candidates = _create(AdCopyCandidates, message, max_tokens=2048)
+            call.record_response(candidates)
+        return select_copy(candidates)
+    with telemetry.track("ad_copy", MODEL, attempt=attempt) as call:
+        draft = _create(AdCopyDraft, message, max_tokens=1024)
+        call.record_response(draft)
+    return _repair_copy(draft, angle, max_repairs)
+
+
+async def _arequest_copy(
+    angle: Angle,
+    message: Dict[str, Any],
+    attempt: int,
+    max_repairs: int,
+    overgenerate: bool,
+) -> AdCopySchema:
+    """Async variant of `_request_copy`."""
+    if overgenerate:
+        with telemetry.track("ad_copy", MODEL, attempt=attempt) as call:
+            candidates = await _acreate(AdCopyCandidates, message, max_tokens=2048)
+            call.record_response(candidates)
+        return select_copy(candidates)
+    with telemetry.track("ad_copy", MODEL, attempt=attempt) as call:
+        draft = await _acreate(AdCopyDraft, message, max_tokens=1024)
+        call.record_response(draft)
+    return await _arepair_copy(draft, angle, max_repairs)
+
+
+def _generate_angle(
+    angle: Angle,
+    message: Dict[str, Any],
+    max_retries: int,
+    cache: Optional[ResponseCache] = None,
+    overgenerate: bool = False,
+) -> AdVariation:
+    """Generates one angle, retrying on validation errors."""
+    key = _cache_key(message)
+    cached = cache.get(key, AdCopySchema) if cache is not None else None
+    if cached is not None:
+        return AdVariation(angle=angle, copy=cached)
+
+    for attempt in range(max_retries):
+        ad_copy_stats.add(attempts=1, retries=int(attempt > 0), calls=1)
+        try:
+            ad_copy = _request_copy(angle, message, attempt, max_retries, overgenerate)
+            ad_copy_stats.add(ads=1)
+            if cache is not None:
+                cache.set(key, ad_copy)
+            return AdVariation(angle=angle, copy=ad_copy)
+        except Exception as e:
+            print(f"Validation failed on attempt {attempt + 1} for {angle} ad: {e}")
+            if attempt + 1 == max_retries:
+                raise  # Re-raise the exception if all retries fail
+    raise ValueError(f"max_retries must be at least 1, got {max_retries}.")
+
+
 def generate_polarity_ads(
-    persona: PersonaSchema, config: CampaignConfiguration, max_retries: int = 3
+    persona: PersonaSchema,
+    config: CampaignConfiguration,
+    max_retries: int = 3,
+    cache: Optional[ResponseCache] = None,
+    overgenerate: bool = False,
 ) -> List[AdVariation]:
     """
     Generates two ad variations (Pull and Push) for a given persona.
     Includes a retry mechanism to handle validation errors from the LLM.
+    Angles found in `cache` are returned without calling the LLM.
+
+    Headlines or descriptions that break the length or keyword rules are
+    rewritten with targeted repair requests (up to `max_retries`); the
+    valid items of the response are kept. With `overgenerate`, each call
+    asks for a surplus of candidates and `select_copy` picks a valid subset
+    locally instead.
     """
-    template_path = (
-        Path(__file__).parent.parent.parent
-        / "prompts"
-        / "setup"
-        / "generate_polarity_ads.yaml"
-    )
-    with open(template_path, "r") as f:
-        templates = yaml.safe_load(f)
+    return [
+        _generate_angle(
+            angle,
+            _render_message(angle, persona, config, overgenerate),
+            max_retries,
+            cache,
+            overgenerate,
+        )
+        for angle in ANGLES
+    ]
 
-    ad_variations: List[AdVariation] = []
 
-    for angle in ["PULL", "PUSH"]:
-        template_str = templates[f"{angle.lower()}_template"]
-        template = Template(template_str)
+async def _agenerate_angle(
+    angle: Angle,
+    message: Dict[str, Any],
+    max_retries: int,
+    cache: Optional[ResponseCache] = None,
+    overgenerate: bool = False,
+) -> AdVariation:
+    """Generates one angle with the async client, retrying independently."""
+    key = _cache_key(message)
+    cached = cache.get(key, AdCopySchema) if cache is not None else None
+    if cached is not None:
+        return AdVariation(angle=angle, copy=cached)
 
-        prompt = template.render(
-            persona=persona, config=config, keyword_blocklist=KEYWORD_BLOCKLIST
-        )
+    for attempt in range(max_retries):
+        ad_copy_stats.add(attempts=1, retries=int(attempt > 0), calls=1)
+        try:
+            ad_copy = await _arequest_copy(
+                angle, message, attempt, max_retries, overgenerate
+            )
+            ad_copy_stats.add(ads=1)
+            if cache is not None:
+                cache.set(key, ad_copy)
+            return AdVariation(angle=angle, copy=ad_copy)
+        except RateLimitError:
+            raise  # Immediate retries would only deepen the rate limiting
+        except Exception as e:
+            print(f"Validation failed on attempt {attempt + 1} for {angle} ad: {e}")
+            if attempt + 1 == max_retries:
+                raise
+    raise ValueError(f"max_retries must be at least 1, got {max_retries}.")
 
-        for attempt in range(max_retries):
-            try:
-                ad_copy = client.messages.create(
-                    model="claude-3-haiku-20240307",
-                    max_tokens=1024,
-                    messages=[{"role": "user", "content": prompt}],
-                    response_model=AdCopySchema,
+
+async def agenerate_ad_variation(
+    persona: PersonaSchema,
+    config: CampaignConfiguration,
+    angle: Angle,
+    max_retries: int = 3,
+    cache: Optional[ResponseCache] = None,
+    overgenerate: bool = False,
+) -> AdVariation:
+    """
+    Generates a single angle ("PULL" or "PUSH") for a persona asynchronously.
+    """
+    message = _render_message(angle, persona, config, overgenerate)
+    return await _agenerate_angle(angle, message, max_retries, cache, overgenerate)
+
+
+async def agenerate_polarity_ads(
+    persona: PersonaSchema,
+    config: CampaignConfiguration,
+    max_retries: int = 3,
+    cache: Optional[ResponseCache] = None,
+    overgenerate: bool = False,
+) -> List[AdVariation]:
+    """
+    Async variant of `generate_polarity_ads`.
+
+    Both angles are requested at once with the AsyncAnthropic client, and
+    each angle retries on its own, so a persona takes about as long as its
+    slowest angle rather than the sum of all calls. Variations are returned
+    in PULL, PUSH order.
+    """
+    return list(
+        await asyncio.gather(
+            *(
+                agenerate_ad_variation(
+                    persona, config, angle, max_retries, cache, overgenerate
                 )
-                ad_variations.append(AdVariation(angle=angle, copy=ad_copy))
-                break  # Success, exit retry loop
-            except Exception as e:
-                print(f"Validation failed on attempt {attempt + 1} for {angle} ad: {e}")
-                if attempt + 1 == max_retries:
-                    raise  # Re-raise the exception if all retries fail
-
-    return ad_variations
+                for angle in ANGLES
+            )
+        )
+    )
@@ -0,0 +1,384 @@
+"""
+Generator backends: interchangeable sources of personas and ad copy.
+
+Every backend exposes the same API, so the CLI, GenerationPipeline and tests
+can switch between them:
+
+    generate_personas(config, cache=None) -> PersonaListSchema
+    agenerate_personas(config, cache=None) -> PersonaListSchema
+    generate_polarity_ads(persona, config, max_retries=3, cache=None)
+        -> List[AdVariation]
+    agenerate_ad_variation(persona, config, angle, max_retries=3, cache=None)
+        -> AdVariation
+    agenerate_polarity_ads(persona, config, max_retries=3, cache=None)
+        -> List[AdVariation]
+
+Backends:
+    LLMBackend: The Anthropic generators (the default).
+    TemplateBackend: Deterministic, offline output built from the config with
+        templates and the AdCopySchema rules. It needs no network or API key
+        and runs thousands of configs per second, for dry runs, benchmarks
+        and tests of everything downstream of generation.
+"""
+
+import asyncio
+import hashlib
+import re
+from typing import List, Optional
+
+from src.generators import ad_copy_generator, persona_generator, streaming
+from src.generators.ad_copy_generator import (
+    ANGLES,
+    DESCRIPTION_MAX_LENGTH,
+    HEADLINE_MAX_LENGTH,
+    AdCopySchema,
+    AdVariation,
+    Angle,
+    _item_error,
+)
+from src.generators.cache import ResponseCache
+from src.generators.persona_generator import PersonaListSchema, PersonaSchema
+from src.generators.selection import dedupe
+from src.models.configuration import CampaignConfiguration
+from src.models.enums import MonetizationModel, VerticalType
+
+
+class LLMBackend:
+    """Generates with the Anthropic LLM (see ad_copy_generator, streaming)."""
+
+    name = "llm"
+
+    def __init__(self, overgenerate: bool = False, stream: bool = False):
+        """
+        Args:
+            overgenerate: Request surplus candidates and select copy locally.
+            stream: Stream ad copy and abort early on rule violations.
+        """
+        self.overgenerate = overgenerate
+        self.stream = stream
+
+    def generate_personas(
+        self, config: CampaignConfiguration, cache: Optional[ResponseCache] = None
+    ) -> PersonaListSchema:
+        return persona_generator.generate_personas(config, cache=cache)
+
+    async def agenerate_personas(
+        self, config: CampaignConfiguration, cache: Optional[ResponseCache] = None
+    ) -> PersonaListSchema:
+        return await persona_generator.agenerate_personas(config, cache=cache)
+
+    def generate_polarity_ads(
+        self,
+        persona: PersonaSchema,
+        config: CampaignConfiguration,
+        max_retries: int = 3,
+        cache: Optional[ResponseCache] = None,
+    ) -> List[AdVariation]:
+        if self.stream:
+            return [
+                streaming.stream_ad_variation(
+                    persona, config, angle, max_retries, cache=cache
+                )
+                for angle in ANGLES
+            ]
+        return ad_copy_generator.generate_polarity_ads(
+            persona, config, max_retries, cache=cache, overgenerate=self.overgenerate
+        )
+
+    async def agenerate_ad_variation(
+        self,
+        persona: PersonaSchema,
+        config: CampaignConfiguration,
+        angle: Angle,
+        max_retries: int = 3,
+        cache: Optional[ResponseCache] = None,
+    ) -> AdVariation:
+        if self.stream:
+            return await streaming.astream_ad_variation(
+                persona, config, angle, max_retries, cache=cache
+            )
+        return await ad_copy_generator.agenerate_ad_variation(
+            persona,
+            config,
+            angle,
+            max_retries,
+            cache=cache,
+            overgenerate=self.overgenerate,
+        )
+
+    async def agenerate_polarity_ads(
+        self,
+        persona: PersonaSchema,
+        config: CampaignConfiguration,
+        max_retries: int = 3,
+        cache: Optional[ResponseCache] = None,
+    ) -> List[AdVariation]:
+        return list(
+            await asyncio.gather(
+                *(
+                    self.agenerate_ad_variation(
+                        persona, config, angle, max_retries, cache=cache
+                    )
+                    for angle in ANGLES
+                )
+            )
+        )
+
+
+# Persona archetypes: name prefix, ad group key, pain point, purchase driver.
+# Fields: {offer} (the offer name) and {product} (the vertical's noun).
+PERSONA_ARCHETYPES = [
+    (
+        "Busy",
+        "busy",
+        "Has little time to compare {product} and needs results fast.",
+        "Wants {offer} to save time and effort.",
+    ),
+    (
+        "Budget-Minded",
+        "budget",
+        "Worries about paying for {product} with no clear payoff.",
+        "Wants proof that {offer} is worth the price.",
+    ),
+    (
+        "Ambitious",
+        "growth",
+        "Feels behind competitors who already invest in {product}.",
+        "Wants {offer} to get ahead and grow faster.",
+    ),
+]
+
+VERTICAL_NOUNS = {
+    VerticalType.SAAS: "software",
+    VerticalType.EDUCATION: "training",
+    VerticalType.SERVICE: "services",
+    VerticalType.E_COMMERCE: "products",
+}
+
+CALLS_TO_ACTION = {
+    MonetizationModel.TRIPWIRE_UPSELL: "Start Small Today",
+    MonetizationModel.DIRECT_SALE: "Order Today",
+    MonetizationModel.LEAD_GEN: "Get Your Quote",
+    MonetizationModel.BOOK_CALL: "Book a Call",
+}
+
+# Candidate copy per angle, best first. Fields: {offer}, {value}, {audience},
+# {pain}, {cta}. Candidates breaking a rule once filled in are skipped, so the
+# trailing ones are short and field-free to always leave enough valid items.
+HEADLINE_TEMPLATES = {
+    "PULL": [
+        "{offer}",
+        "Try {offer}",
+        "{offer} for {audience}",
+        "Discover {offer}",
+        "{value}",
+        "{cta}",
+        "Get Results Faster",
+        "Start Your Journey",
+        "See What's Possible",
+    ],
+    "PUSH": [
+        "Still Struggling?",
+        "{offer} Can Help",
+        "Stop Waiting, Try {offer}",
+        "{audience}: Don't Fall Behind",
+        "{cta}",
+        "Don't Fall Behind",
+        "Fix It Today",
+        "Stop Settling for Less",
+    ],
+}
+DESCRIPTION_TEMPLATES = {
+    "PULL": [
+        "{value}. {cta}.",
+        "{offer} is built for {audience}. {cta}.",
+        "Join {audience} who chose {offer}. {cta}.",
+        "See what you can achieve. {cta}.",
+        "Take the next step toward your goals today.",
+    ],
+    "PUSH": [
+        "{pain}.",
+        "Still dealing with it? {offer} helps. {cta}.",
+        "Don't let it hold you back any longer. {cta}.",
+        "Stop putting it off. The longer you wait, the harder it gets.",
+    ],
+}
+MAX_HEADLINES = 10
+MAX_DESCRIPTIONS = 4
+
+
+def _fit(text: str, max_length: int) -> str:
+    """Shortens text to max_length at a word boundary."""
+    if len(text) <= max_length:
+        return text
+    cut = text[: max_length + 1].rsplit(" ", 1)[0]
+    return cut[:max_length].rstrip(" ,;:-")
+
+
+def _clause(text: str) -> str:
+    """Strips trailing punctuation and whitespace from a config field."""
+    return text.strip().rstrip(".!?;:").strip()
+
+
+def _sentence(text: str) -> str:
+    """The first sentence of a field, without its final punctuation."""
+    return _clause(re.split(r"(?<=[.!?])\s", text.strip(), maxsplit=1)[0])
+
+
+def _audience(config: CampaignConfiguration) -> str:
+    """The head of the target audience, e.g. "Project managers"."""
+    head = re.split(
+        r"[,.;:(]| and | or | who | with | seeking | looking ",
+        config.target_audience_broad.strip(),
+        maxsplit=1,
+    )[0]
+    return _clause(head) or _clause(config.target_audience_broad)
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z]+", "_", text.lower()).strip("_")
+
+
+def _seed(*parts: str) -> int:
+    """A stable seed (unlike hash(), not salted per process)."""
+    digest = hashlib.sha256("\x00".join(parts).encode()).hexdigest()
+    return int(digest[:8], 16)
+
+
+def _fill(
+    templates: List[str], fields: dict, kind: str, max_length: int, limit: int
+) -> List[str]:
+    """Fills in templates and keeps the valid, distinct results, best first."""
+    candidates = []
+    for template in templates:
+        text = template.format(**fields)
+        if not _item_error(text, kind, max_length):
+            candidates.append(text)
+    kept, _ = dedupe(candidates)
+    return kept[:limit]
+
+
+class TemplateBackend:
+    """
+    Generates schema-valid personas and ad copy offline from templates.
+
+    Output is deterministic: the same config (and persona and angle) always
+    produces the same copy, while different configs rotate through the
+    templates so bulk runs are varied.
+    """
+
+    name = "template"
+
+    def generate_personas(
+        self, config: CampaignConfiguration, cache: Optional[ResponseCache] = None
+    ) -> PersonaListSchema:
+        """Builds one persona per archetype. `cache` is accepted and unused."""
+        fields = {
+            "offer": _fit(_clause(config.offer_name), 100),
+            "product": VERTICAL_NOUNS[config.vertical_type],
+        }
+        audience = _audience(config)
+        personas = []
+        for prefix, key, pain_point, purchase_driver in PERSONA_ARCHETYPES:
+            ad_group = _fit(f"persona_{key}_{_slug(audience)}", 60).rstrip("_")
+            personas.append(
+                PersonaSchema(
+                    name=_fit(f"{prefix} {audience}", 50),
+                    pain_point=_fit(pain_point.format(**fields), 200),
+                    purchase_driver=_fit(purchase_driver.format(**fields), 150),
+                    ad_group_name=ad_group,
+                )
+            )
+        return PersonaListSchema(personas=personas)
+
+    async def agenerate_personas(
+        self, config: CampaignConfiguration, cache: Optional[ResponseCache] = None
+    ) -> PersonaListSchema:
+        return self.generate_personas(config, cache=cache)
+
+    def generate_ad_variation(
+        self, persona: PersonaSchema, config: CampaignConfiguration, angle: Angle
+    ) -> AdVariation:
+        """Builds one angle's copy from the angle's templates."""
+        fields = {
+            "offer": _clause(config.offer_name),
+            "value": _sentence(config.value_proposition_primary),
+            "audience": _audience(config),
+            "pain": _clause(persona.pain_point),
+            "cta": CALLS_TO_ACTION[config.monetization_model],
+        }
+        seed = _seed(config.offer_name, persona.name, angle)
+        headlines = _fill(
+            self._rotate(HEADLINE_TEMPLATES[angle], seed),
+            # Long offer names are shortened to fit into headline templates
+            {**fields, "offer": _fit(fields["offer"], 20)},
+            "Headline",
+            HEADLINE_MAX_LENGTH,
+            MAX_HEADLINES,
+        )
+        descriptions = _fill(
+            self._rotate(DESCRIPTION_TEMPLATES[angle], seed),
+            fields,
+            "Description",
+            DESCRIPTION_MAX_LENGTH,
+            MAX_DESCRIPTIONS,
+        )
+        return AdVariation(
+            angle=angle,
+            copy=AdCopySchema(headlines=headlines, descriptions=descriptions),
+        )
+
+    @staticmethod
+    def _rotate(templates: List[str], seed: int) -> List[str]:
+        """
+        Rotates the config-specific templates; the field-free fallbacks at
+        the end keep their place so they are only used when needed.
+        """
+        specific = [t for t in templates if "{" in t]
+        fallbacks = [t for t in templates if "{" not in t]
+        offset = seed % len(specific)
+        return specific[offset:] + specific[:offset] + fallbacks
+
+    def generate_polarity_ads(
+        self,
+        persona: PersonaSchema,
+        config: CampaignConfiguration,
+        max_retries: int = 3,
+        cache: Optional[ResponseCache] = None,
+    ) -> List[AdVariation]:
+        return [self.generate_ad_variation(persona, config, angle) for angle in ANGLES]
+
+    async def agenerate_ad_variation(
+        self,
+        persona: PersonaSchema,
+        config: CampaignConfiguration,
+        angle: Angle,
+        max_retries: int = 3,
+        cache: Optional[ResponseCache] = None,
+    ) -> AdVariation:
+        return self.generate_ad_variation(persona, config, angle)
+
+    async def agenerate_polarity_ads(
+        self,
+        persona: PersonaSchema,
+        config: CampaignConfiguration,
+        max_retries: int = 3,
+        cache: Optional[ResponseCache] = None,
+    ) -> List[AdVariation]:
+        return self.generate_polarity_ads(persona, config)
+
+
+BACKENDS = {"llm": LLMBackend, "template": TemplateBackend}
+
+
+def make_backend(name: str = "llm", **options):
+    """
+    Returns the backend for a name ("llm" or "template").
+
+    Args:
+        name: The backend name.
+        **options: Constructor options, e.g. `overgenerate` for "llm".
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown generator backend: {name}")
+    return BACKENDS[name](**options)
@@ -0,0 +1,385 @@
+"""
+Message Batches mode for bulk, offline persona and ad-copy generation.
+
+BatchGenerator collects the persona requests for every configuration into one
+batch, then one ad-copy request per persona and angle into a second batch.
+Each batch is submitted, polled until it ends, and validated. Requests that
+fail or do not validate are resubmitted in a smaller batch, up to
+`max_rounds`. Batches are processed asynchronously by the API at a lower
+price and outside the real-time rate limits.
+
+Ad copy is requested as a lenient draft, as in the real-time generator: a
+draft with invalid headlines or descriptions is followed by a small repair
+request for just those items in the next round, and once the rounds run out
+the items still invalid are dropped.
+
+Backends:
+    AnthropicBatchBackend: The Message Batches API.
+    LocalBatchBackend: An in-process stand-in that answers each request with a
+        callable, for offline tests and dry runs.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type, cast
+
+from pydantic import BaseModel
+
+from src.generators.ad_copy_generator import (
+    ANGLES,
+    AdCopyDraft,
+    AdCopyRepair,
+    AdCopySchema,
+    AdVariation,
+    Angle,
+    InvalidItem,
+    _cache_key,
+    _render_message,
+    _render_repair_message,
+    apply_repairs,
+    finalize_copy,
+    find_invalid_items,
+)
+from src.generators.cache import ResponseCache, make_key
+from src.generators.persona_generator import MODEL, PersonaListSchema, _render_prompt
+from src.generators.pipeline import GenerationResult
+from src.generators.structured import build_params, parse_message
+from src.models.configuration import CampaignConfiguration
+from src.telemetry.llm import telemetry
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_SECONDS = 30.0
+DEFAULT_MAX_ROUNDS = 3
+
+
+@dataclass
+class BatchOutcome:
+    """The result of one request in a batch: a Message, or an error."""
+
+    custom_id: str
+    message: Any = None
+    error: Optional[str] = None
+
+
+class AnthropicBatchBackend:
+    """Submits batches to the Anthropic Message Batches API."""
+
+    def __init__(self, client=None):
+        if client is None:
+            from anthropic import Anthropic
+
+            client = Anthropic()
+        self.client = client
+
+    def submit(self, requests: List[Dict[str, Any]]) -> str:
+        return self.client.messages.batches.create(requests=requests).id
+
+    def is_done(self, batch_id: str) -> bool:
+        batch = self.client.messages.batches.retrieve(batch_id)
+        return batch.processing_status == "ended"
+
+    def results(self, batch_id: str) -> Iterator[BatchOutcome]:
+        for entry in self.client.messages.batches.results(batch_id):
+            if entry.result.type == "succeeded":
+                yield BatchOutcome(entry.custom_id, message=entry.result.message)
+            else:
+                error = getattr(entry.result, "error", None)
+                yield BatchOutcome(
+                    entry.custom_id, error=str(error) if error else entry.result.type
+                )
+
+
+class LocalBatchBackend:
+    """
+    An in-process stand-in for the Message Batches API.
+
+    `respond` receives a request's params and returns a Message (or raises).
+    A batch reports as ended after `polls_until_done` status checks.
+    """
+
+    def __init__(
+        self,
+        respond: Callable[[Dict[str, Any]], Any],
+        polls_until_done: int = 1,
+    ):
+        self.respond = respond
+        self.polls_until_done = polls_until_done
+        self.submitted: List[List[Dict[str, Any]]] = []
+        self._batches: Dict[str, Tuple[List[Dict[str, Any]], int]] = {}
+        self._ids = count(1)
+
+    def submit(self, requests: List[Dict[str, Any]]) -> str:
+        batch_id = f"local_batch_{next(self._ids)}"
+        self.submitted.append(list(requests))
+        self._batches[batch_id] = (list(requests), 0)
+        return batch_id
+
+    def is_done(self, batch_id: str) -> bool:
+        requests, polls = self._batches[batch_id]
+        self._batches[batch_id] = (requests, polls + 1)
+        return polls + 1 >= self.polls_until_done
+
+    def results(self, batch_id: str) -> Iterator[BatchOutcome]:
+        requests, _ = self._batches[batch_id]
+        for request in requests:
+            try:
+                message = self.respond(request["params"])
+            except Exception as e:
+                yield BatchOutcome(request["custom_id"], error=str(e))
+            else:
+                yield BatchOutcome(request["custom_id"], message=message)
+
+
+@dataclass
+class _Job:
+    """One logical request, resubmitted until it validates."""
+
+    custom_id: str
+    params: Dict[str, Any]
+    response_model: Type[BaseModel]
+    cache_key: str
+    result: GenerationResult
+    config_label: str = ""
+    # Set for ad jobs, whose drafts are repaired rather than resubmitted.
+    angle: Optional[Angle] = None
+    draft: Optional[AdCopyDraft] = None
+    invalid: List[InvalidItem] = field(default_factory=list)
+
+
+class BatchGenerator:
+    """
+    Generates personas and Pull/Push ads for many configurations via batches.
+
+    Usage:
+        generator = BatchGenerator(AnthropicBatchBackend())
+        results = generator.run(configs)
+    """
+
+    def __init__(
+        self,
+        backend,
+        poll_seconds: float = DEFAULT_POLL_SECONDS,
+        max_rounds: int = DEFAULT_MAX_ROUNDS,
+        cache: Optional[ResponseCache] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            backend: AnthropicBatchBackend, LocalBatchBackend or equivalent.
+            poll_seconds: Delay between batch status checks.
+            max_rounds: Submissions per request before it is reported failed.
+            cache: An optional response cache, checked before submitting.
+            sleep: Sleep function (for tests).
+        """
+        self.backend = backend
+        self.poll_seconds = poll_seconds
+        self.max_rounds = max_rounds
+        self.cache = cache
+        self.sleep = sleep
+        self.batches_submitted = 0
+
+    def run(self, configs: List[CampaignConfiguration]) -> List[GenerationResult]:
+        """
+        Generates personas, then ads for every persona, for all configs.
+
+        Returns:
+            One result per persona list and per ad, with `error` set on
+            requests that still failed after `max_rounds` submissions.
+        """
+        persona_jobs = []
+        for index, config in enumerate(configs):
+            prompt = _render_prompt(config)
+            persona_jobs.append(
+                self._job(
+                    f"personas-{index}",
+                    {"role": "user", "content": prompt},
+                    PersonaListSchema,
+                    make_key(MODEL, prompt, PersonaListSchema),
+                    GenerationResult(config_index=index, kind="personas"),
+                    config.offer_name,
+                )
+            )
+        self._process(persona_jobs)
+
+        ad_jobs = []
+        for job in persona_jobs:
+            if job.result.error is not None:
+                continue
+            index = job.result.config_index
+            for number, persona in enumerate(job.result.value.personas):
+                for angle in ANGLES:
+                    message = _render_message(angle, persona, configs[index])
+                    ad_jobs.append(
+                        self._job(
+                            f"ad-{index}-{number}-{angle.lower()}",
+                            message,
+                            AdCopyDraft,
+                            _cache_key(message),
+                            GenerationResult(
+                                config_index=index,
+                                kind="ad",
+                                persona=persona,
+                                angle=angle,
+                            ),
+                            configs[index].offer_name,
+                            angle,
+                        )
+                    )
+        self._process(ad_jobs)
+        return [job.result for job in persona_jobs + ad_jobs]
+
+    @staticmethod
+    def _job(
+        custom_id,
+        message,
+        response_model,
+        cache_key,
+        result,
+        config_label="",
+        angle: Optional[Angle] = None,
+    ) -> _Job:
+        return _Job(
+            custom_id=custom_id,
+            params=build_params(message, response_model),
+            response_model=response_model,
+            cache_key=cache_key,
+            result=result,
+            config_label=config_label,
+            angle=angle,
+        )
+
+    def _complete(self, job: _Job, value: BaseModel, cached: bool = False):
+        """Stores a job's validated value (wrapped in an AdVariation for ads)."""
+        if self.cache is not None and not cached:
+            self.cache.set(job.cache_key, value)
+        job.result.error = None
+        job.result.value = (
+            value
+            if job.angle is None
+            else AdVariation(angle=job.angle, copy=cast(AdCopySchema, value))
+        )
+
+    @staticmethod
+    def _review_copy(
+        job: _Job, angle: Angle, value: BaseModel
+    ) -> Optional[AdCopySchema]:
+        """
+        Takes an ad draft, or applies a repair to the job's draft, and returns
+        the copy once every item is valid. Otherwise the job is switched to a
+        repair request for the invalid items, and None is returned.
+        """
+        if job.draft is None:
+            draft = cast(AdCopyDraft, value)
+        else:
+            draft = apply_repairs(job.draft, job.invalid, cast(AdCopyRepair, value))
+        invalid = find_invalid_items(draft)
+        if not invalid:
+            return finalize_copy(draft)
+        job.draft, job.invalid = draft, invalid
+        job.response_model = AdCopyRepair
+        job.params = build_params(
+            _render_repair_message(angle, invalid), AdCopyRepair, max_tokens=512
+        )
+        return None
+
+    def _process(self, jobs: List[_Job]):
+        """Resolves jobs from the cache, then submits the rest in rounds."""
+        pending = {}
+        for job in jobs:
+            model: Type[BaseModel] = job.response_model
+            if job.angle is not None:
+                model = AdCopySchema  # Ads are cached as copy, not drafts
+            cached = (
+                self.cache.get(job.cache_key, model) if self.cache is not None else None
+            )
+            if cached is not None:
+                self._complete(job, cached, cached=True)
+            else:
+                pending[job.custom_id] = job
+
+        for round_number in range(1, self.max_rounds + 1):
+            if not pending:
+                return
+            errors = self._submit_round(pending, round_number)
+            pending = {custom_id: pending[custom_id] for custom_id in errors}
+            for custom_id, error in errors.items():
+                pending[custom_id].result.error = error
+            if pending:
+                logger.warning(
+                    f"{len(pending)} batch requests failed or need repair "
+                    f"in round {round_number}."
+                )
+
+        # Out of rounds: keep the valid items of unfinished drafts, as the
+        # real-time generator does after its last repair
+        for job in pending.values():
+            if job.draft is None:
+                continue
+            try:
+                self._complete(job, finalize_copy(job.draft))
+            except ValueError as e:  # Includes pydantic's ValidationError
+                job.result.error = str(e)
+
+    def _submit_round(
+        self, pending: Dict[str, _Job], round_number: int = 1
+    ) -> Dict[str, str]:
+        """Submits one batch, waits for it, and returns errors by custom_id."""
+        batch_id = self.backend.submit(
+            [
+                {"custom_id": job.custom_id, "params": job.params}
+                for job in pending.values()
+            ]
+        )
+        self.batches_submitted += 1
+        logger.info(f"Submitted batch {batch_id} with {len(pending)} requests.")
+        started = time.perf_counter()
+        while not self.backend.is_done(batch_id):
+            self.sleep(self.poll_seconds)
+        elapsed = time.perf_counter() - started
+
+        errors = {custom_id: "Missing from batch results." for custom_id in pending}
+        for outcome in self.backend.results(batch_id):
+            job = pending.get(outcome.custom_id)
+            if job is None:
+                continue
+            operation = (
+                "batch_ad_repair"
+                if job.draft is not None
+                else f"batch_{job.result.kind}"
+            )
+            with telemetry.context(config=job.config_label), telemetry.track(
+                operation,
+                MODEL,
+                attempt=round_number - 1,
+                batch=True,
+                latency_seconds=elapsed,
+            ) as call:
+                if outcome.error is not None:
+                    call.fail(outcome.error)
+                    errors[outcome.custom_id] = outcome.error
+                    continue
+                call.record_response(outcome.message)
+                try:
+                    parsed = parse_message(outcome.message, job.response_model)
+                    value = (
+                        parsed
+                        if job.angle is None
+                        else self._review_copy(job, job.angle, parsed)
+                    )
+                except ValueError as e:  # Includes pydantic's ValidationError
+                    call.fail(str(e))
+                    errors[outcome.custom_id] = str(e)
+                    continue
+            if value is None:
+                errors[
+                    outcome.custom_id
+                ] = f"{len(job.invalid)} invalid ad copy items sent for repair."
+                continue
+            self._complete(job, value)
+            del errors[outcome.custom_id]
+        return errors
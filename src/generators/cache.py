@@ -0,0 +1,192 @@
+"""
+Content-addressed on-disk cache for validated LLM responses.
+
+Responses are keyed by a hash of (model, rendered prompt, response schema)
+and stored as the validated pydantic model's JSON in a SQLite database, so
+an unchanged configuration is served from disk instead of the API. SQLite's
+file locking makes the cache safe to share between processes.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path("llm_cache.sqlite")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Seconds to wait for another process's write lock before giving up.
+LOCK_TIMEOUT_SECONDS = 30.0
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def make_key(model: str, prompt: str, response_model: Type[BaseModel]) -> str:
+    """
+    Returns the cache key for a request.
+
+    The response schema is part of the key, so changing a field or a
+    constraint on the pydantic model invalidates earlier responses.
+    """
+    schema = json.dumps(response_model.model_json_schema(), sort_keys=True)
+    digest = hashlib.sha256()
+    for part in (model, prompt, schema):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """
+    A SQLite-backed cache of validated LLM responses.
+
+    Entries are evicted least-recently-used first once the stored payloads
+    exceed `max_bytes`. When `ttl_seconds` is set, older entries are treated
+    as misses. Set `bypass` to skip lookups while still refreshing entries.
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CACHE_PATH,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl_seconds: Optional[float] = None,
+        bypass: bool = False,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            path: The SQLite database file (created if missing).
+            max_bytes: The total payload size kept before evicting.
+            ttl_seconds: Maximum entry age, or None to keep entries forever.
+            bypass: Ignore cached entries (responses are still stored).
+            clock: Returns the current time in seconds (for tests).
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.bypass = bypass
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " payload TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed_at"
+                " ON responses (accessed_at)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A connection per operation keeps the cache usable from any thread.
+        conn = sqlite3.connect(self.path, timeout=LOCK_TIMEOUT_SECONDS)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str, response_model: Type[ModelT]) -> Optional[ModelT]:
+        """Returns the cached response for a key, or None on a miss."""
+        if self.bypass:
+            self.misses += 1
+            return None
+
+        now = self.clock()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT payload, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self._expired(row[1], now):
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is not None:
+                conn.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+        if row is None:
+            self.misses += 1
+            return None
+
+        try:
+            value = response_model.model_validate_json(row[0])
+        except ValidationError:
+            logger.warning(
+                f"Discarding cached response {key[:12]} that no longer validates."
+            )
+            self.delete(key)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: BaseModel):
+        """Stores a validated response and evicts entries over the size limit."""
+        payload = value.model_dump_json()
+        now = self.clock()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (key, payload, size, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now),
+            )
+            self._evict(conn)
+
+    def delete(self, key: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self):
+        """Removes every cached response."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def total_bytes(self) -> int:
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()[0]
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def _evict(self, conn: sqlite3.Connection):
+        (total,) = conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at, rowid"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logger.info(
+            f"Evicted {evicted} cached responses to stay under {self.max_bytes} bytes."
+        )
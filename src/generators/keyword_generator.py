@@ -5,10 +5,41 @@ This module generates keyword ideas based on the campaign configuration.
 """
 
 from dataclasses import dataclass
-from typing import List
+from heapq import nlargest
+from typing import Iterator, List, Set, Tuple
 import re
 from src.models.configuration import CampaignConfiguration
 
+MIN_KEYWORDS = 10
+MAX_KEYWORDS = 30
+
+# Only the first seed words are combined, so time and memory stay bounded
+# however long the value proposition is.
+MAX_SEED_WORDS = 48
+# Non-adjacent pairs are only formed between words this close in the text.
+PAIR_WINDOW = 4
+
+# Scores: phrases that appear verbatim in the text rank above looser pairs,
+# and every word shared with the offer name adds to the score.
+ADJACENT_SCORE = 2.0
+OFFER_WORD_SCORE = 1.0
+
+STOPWORDS = {
+    "and",
+    "are",
+    "but",
+    "for",
+    "from",
+    "into",
+    "our",
+    "that",
+    "the",
+    "this",
+    "with",
+    "you",
+    "your",
+}
+
 
 @dataclass
 class Keyword:
@@ -18,52 +49,101 @@ class Keyword:
     match_type: str
 
 
-def generate_keywords(config: CampaignConfiguration) -> List[Keyword]:
+def _seed_words(
+    config: CampaignConfiguration,
+) -> Tuple[List[str], List[bool], Set[str]]:
+    """
+    Returns the first MAX_SEED_WORDS tokens of the offer name and value
+    proposition, whether each one can be part of a keyword, and the offer
+    name's words.
+
+    Punctuation, and the boundary between the offer name and the value
+    proposition, are kept as unusable tokens so phrases do not span them.
+    """
+    offer_words = set(re.findall(r"\w+", config.offer_name.lower()))
+    seed_text = f"{config.offer_name} | {config.value_proposition_primary}"
+    words = []
+    for match in re.finditer(r"\w+|[^\w\s]", seed_text.lower()):
+        words.append(match.group())
+        if len(words) == MAX_SEED_WORDS:
+            break
+    usable = [
+        word in offer_words
+        or (len(word) > 2 and word.isalnum() and word not in STOPWORDS)
+        for word in words
+    ]
+    return words, usable, offer_words
+
+
+def _candidates(
+    words: List[str], usable: List[bool], offer_words: Set[str]
+) -> Iterator[Tuple[float, int, str]]:
+    """
+    Lazily yields (score, -position, text) for 2 and 3-word combinations.
+
+    Verbatim 2 and 3-word phrases get ADJACENT_SCORE; ordered pairs of words
+    up to PAIR_WINDOW apart score 1 / distance. Each offer-name word adds
+    OFFER_WORD_SCORE. The negated position breaks ties in text order.
+    """
+    for start in range(len(words)):
+        if not usable[start]:
+            continue
+        for end in range(start + 1, min(start + PAIR_WINDOW, len(words) - 1) + 1):
+            if not usable[end] or words[end] == words[start]:
+                continue
+            distance = end - start
+            pair = (words[start], words[end])
+            score = ADJACENT_SCORE if distance == 1 else 1.0 / distance
+            yield (
+                score + OFFER_WORD_SCORE * sum(w in offer_words for w in pair),
+                -start,
+                " ".join(pair),
+            )
+        phrase = words[start : start + 3]
+        if len(phrase) == 3 and all(usable[start : start + 3]):
+            yield (
+                ADJACENT_SCORE
+                + OFFER_WORD_SCORE * sum(w in offer_words for w in phrase),
+                -start,
+                " ".join(phrase),
+            )
+
+
+def _unique(candidates: Iterator[Tuple[float, int, str]], exclude: Set[str]):
+    """Drops repeated texts (and `exclude`), keeping the earliest occurrence."""
+    seen = set(exclude)
+    for candidate in candidates:
+        if candidate[2] not in seen:
+            seen.add(candidate[2])
+            yield candidate
+
+
+def generate_keywords(
+    config: CampaignConfiguration, max_keywords: int = MAX_KEYWORDS
+) -> List[Keyword]:
     """
     Generates a list of PHRASE match keywords from the campaign config.
 
-    The strategy is to combine the offer name and value proposition to create
-    a seed list of terms, then generate 2 and 3-word combinations.
+    The offer name comes first. Combinations of the offer name and value
+    proposition words are scored by adjacency in the original text and
+    overlap with the offer name, and only the best `max_keywords` are kept
+    with a bounded heap rather than materializing and sorting them all.
+    Single words are added when there are fewer than MIN_KEYWORDS.
     """
-    # Combine offer and value prop, clean, and split into unique terms
-    seed_text = f"{config.offer_name} {config.value_proposition_primary}"
-    words = re.findall(r"\b\w+\b", seed_text.lower())
-    unique_words = sorted(list(set([w for w in words if len(w) > 2])))
-
-    # Use a set to ensure keyword uniqueness
-    keywords = set()
-
-    # 1. Add the exact offer name
-    keywords.add(config.offer_name.lower())
-
-    # 2. Generate 2-word combinations (bigrams)
-    if len(unique_words) >= 2:
-        for i in range(len(unique_words)):
-            for j in range(i + 1, len(unique_words)):
-                keywords.add(f"{unique_words[i]} {unique_words[j]}")
-                keywords.add(f"{unique_words[j]} {unique_words[i]}")
-
-    # 3. Generate 3-word combinations (trigrams) if we need more
-    if len(keywords) < 20 and len(unique_words) >= 3:
-        for i in range(len(unique_words)):
-            for j in range(i + 1, len(unique_words)):
-                for k in range(j + 1, len(unique_words)):
-                    keywords.add(
-                        f"{unique_words[i]} {unique_words[j]} {unique_words[k]}"
-                    )
-
-    # 4. Ensure we have between 10 and 30 keywords
-    final_keywords = sorted(list(keywords))
-
-    # If we have too few, add single words until we reach 10
-    if len(final_keywords) < 10:
-        for word in unique_words:
-            if len(final_keywords) < 10:
-                final_keywords.append(word)
-
-    # If we have too many, slice the list to the max limit
-    if len(final_keywords) > 30:
-        final_keywords = final_keywords[:30]
+    offer = config.offer_name.lower()
+    words, usable, offer_words = _seed_words(config)
+
+    best = nlargest(
+        max_keywords - 1, _unique(_candidates(words, usable, offer_words), {offer})
+    )
+    keywords = [offer] + [text for _, _, text in best]
+
+    # If we have too few, add single words until we reach the minimum
+    for word, ok in zip(words, usable):
+        if len(keywords) >= MIN_KEYWORDS:
+            break
+        if ok and word not in keywords:
+            keywords.append(word)
 
     # Return as a list of Keyword objects
-    return [Keyword(text=kw, match_type="PHRASE") for kw in final_keywords]
+    return [Keyword(text=kw, match_type="PHRASE") for kw in keywords]
@@ -2,17 +2,23 @@
 TASK-022: Implement Persona Generation with LLM
 """
 
-from typing import List
-from jinja2 import Template
+from typing import List, Optional, cast
 from pydantic import BaseModel, Field
 import instructor
-from anthropic import Anthropic
+from instructor.client import AsyncInstructor
+from anthropic import Anthropic, AsyncAnthropic
+from src.generators.cache import ResponseCache, make_key
+from src.generators.templates import get_registry
 from src.models.configuration import CampaignConfiguration
-from pathlib import Path
+from src.telemetry.llm import telemetry
 
 # Configure instructor with the Anthropic client
 # Note: The API key will be automatically picked up from the ANTHROPIC_API_KEY environment variable.
 client = instructor.from_anthropic(Anthropic())
+# from_anthropic is annotated to return the sync client for AsyncAnthropic too
+async_client = cast(AsyncInstructor, instructor.from_anthropic(AsyncAnthropic()))
+
+MODEL = "claude-3-haiku-20240307"
 
 
 class PersonaSchema(BaseModel):
@@ -26,34 +32,73 @@ class PersonaListSchema(BaseModel):
     personas: List[PersonaSchema] = Field(..., min_length=3, max_length=3)
 
 
-def generate_personas(config: CampaignConfiguration) -> PersonaListSchema:
+def _render_prompt(config: CampaignConfiguration) -> str:
+    return get_registry().render("setup/generate_personas.yaml", config=config)
+
+
+def generate_personas(
+    config: CampaignConfiguration, cache: Optional[ResponseCache] = None
+) -> PersonaListSchema:
     """
     Generates a list of three personas based on the campaign configuration.
+
+    When a `cache` is given, an unchanged prompt returns the stored personas
+    without calling the LLM.
     """
-    template_path = (
-        Path(__file__).parent.parent.parent
-        / "prompts"
-        / "setup"
-        / "generate_personas.yaml"
-    )
+    prompt = _render_prompt(config)
+    key = make_key(MODEL, prompt, PersonaListSchema)
+    if cache is not None:
+        cached = cache.get(key, PersonaListSchema)
+        if cached is not None:
+            return cached
 
-    with open(template_path, "r") as f:
-        template_str = f.read()
+    # Generate the personas using the LLM and validate with the Pydantic schema
+    with telemetry.track("personas", MODEL) as call:
+        response = client.messages.create(
+            model=MODEL,
+            max_tokens=1024,
+            messages=[
+                {
+                    "role": "user",
+                    "content": prompt,
+                }
+            ],
+            response_model=PersonaListSchema,
+        )
+        call.record_response(response)
 
-    template = Template(template_str)
-    prompt = template.render(config=config)
+    if cache is not None:
+        cache.set(key, response)
+    return response
 
-    # Generate the personas using the LLM and validate with the Pydantic schema
-    response = client.messages.create(
-        model="claude-3-haiku-20240307",
-        max_tokens=1024,
-        messages=[
-            {
-                "role": "user",
-                "content": prompt,
-            }
-        ],
-        response_model=PersonaListSchema,
-    )
 
+async def agenerate_personas(
+    config: CampaignConfiguration, cache: Optional[ResponseCache] = None
+) -> PersonaListSchema:
+    """
+    Async variant of `generate_personas` using the AsyncAnthropic client.
+    """
+    prompt = _render_prompt(config)
+    key = make_key(MODEL, prompt, PersonaListSchema)
+    if cache is not None:
+        cached = cache.get(key, PersonaListSchema)
+        if cached is not None:
+            return cached
+
+    with telemetry.track("personas", MODEL) as call:
+        response = await async_client.messages.create(
+            model=MODEL,
+            max_tokens=1024,
+            messages=[
+                {
+                    "role": "user",
+                    "content": prompt,
+                }
+            ],
+            response_model=PersonaListSchema,
+        )
+        call.record_response(response)
+
+    if cache is not None:
+        cache.set(key, response)
     return response
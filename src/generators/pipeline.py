@@ -0,0 +1,308 @@
+"""
+Bounded-concurrency generation pipeline for personas and ad angles.
+
+Schedules `agenerate_personas` for every configuration and, as each persona
+list arrives, one `agenerate_ad_variation` job per persona and angle. All
+jobs share one AdaptiveLimiter, and results stream back as they finish.
+
+A job makes its LLM calls (validation retries and repairs included) one
+after another, so the limit on in-flight jobs is also the limit on in-flight
+LLM calls. Job counts are kept in PipelineStats; the LLM calls behind them
+are counted by the telemetry.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional
+
+from src.generators.ad_copy_generator import ANGLES
+from src.generators.backends import LLMBackend
+from src.generators.cache import ResponseCache
+from src.generators.persona_generator import PersonaSchema
+from src.models.configuration import CampaignConfiguration
+from src.telemetry.llm import telemetry
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_RATE_LIMIT_RETRIES = 5
+DEFAULT_BACKOFF_SECONDS = 1.0
+# Consecutive successes before the concurrency limit is raised by one.
+SUCCESSES_PER_INCREASE = 4
+# HTTP statuses that signal rate limiting or overload.
+RATE_LIMIT_STATUS_CODES = (429, 529)
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """Returns whether an API error means the caller should slow down."""
+    return getattr(error, "status_code", None) in RATE_LIMIT_STATUS_CODES
+
+
+class AdaptiveLimiter:
+    """
+    An async concurrency limit that adapts to rate limiting (AIMD).
+
+    The limit never exceeds `max_concurrency`. It is halved whenever a job
+    is rate limited and raised by one after every `SUCCESSES_PER_INCREASE`
+    consecutive successes, so throughput converges on what the API allows.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        min_concurrency: int = 1,
+        initial_concurrency: Optional[int] = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.limit = initial_concurrency or max_concurrency
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._successes = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    async def release(self, rate_limited: bool = False):
+        async with self._condition:
+            self.in_flight -= 1
+            if rate_limited:
+                self._successes = 0
+                self.limit = max(self.min_concurrency, self.limit // 2)
+                logger.warning(f"Rate limited; concurrency limit now {self.limit}.")
+            else:
+                self._successes += 1
+                if (
+                    self._successes >= SUCCESSES_PER_INCREASE
+                    and self.limit < self.max_concurrency
+                ):
+                    self._successes = 0
+                    self.limit += 1
+            self._condition.notify_all()
+
+
+@dataclass
+class GenerationResult:
+    """One completed (or failed) generation job."""
+
+    config_index: int
+    kind: str  # "personas" or "ad"
+    value: Any = None
+    persona: Optional[PersonaSchema] = None
+    angle: Optional[str] = None
+    error: Optional[str] = None
+    latency_seconds: float = 0.0
+
+
+@dataclass
+class PipelineStats:
+    """
+    Job counts and timings for a pipeline run.
+
+    A job is one generator invocation (a persona list or one ad angle) and
+    may make several LLM calls; `llm_calls` is the number of calls the
+    telemetry recorded during the run.
+    """
+
+    jobs: int = 0
+    failures: int = 0
+    rate_limited: int = 0
+    llm_calls: int = 0
+    wall_seconds: float = 0.0
+    peak_concurrency: int = 0
+    job_latencies: List[float] = field(default_factory=list)
+    config_latencies: List[float] = field(default_factory=list)
+
+    @property
+    def jobs_per_second(self) -> float:
+        return self.jobs / self.wall_seconds if self.wall_seconds else 0.0
+
+    @property
+    def llm_calls_per_job(self) -> float:
+        return self.llm_calls / self.jobs if self.jobs else 0.0
+
+    def summary(self) -> dict:
+        """Returns the statistics as a JSON-serializable dict."""
+        latencies = sorted(self.job_latencies)
+        return {
+            "jobs": self.jobs,
+            "failures": self.failures,
+            "rate_limited": self.rate_limited,
+            "llm_calls": self.llm_calls,
+            "llm_calls_per_job": self.llm_calls_per_job,
+            "wall_seconds": self.wall_seconds,
+            "jobs_per_second": self.jobs_per_second,
+            "peak_concurrency": self.peak_concurrency,
+            "p50_job_seconds": latencies[len(latencies) // 2] if latencies else None,
+            "max_job_seconds": latencies[-1] if latencies else None,
+            "max_config_seconds": max(self.config_latencies, default=None),
+        }
+
+
+class GenerationPipeline:
+    """
+    Generates personas and Pull/Push ads for many configurations at once.
+
+    Usage:
+        pipeline = GenerationPipeline(max_concurrency=16)
+        async for result in pipeline.stream(configs):
+            ...
+        print(pipeline.stats.summary())
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_retries: int = 3,
+        rate_limit_retries: int = DEFAULT_RATE_LIMIT_RETRIES,
+        backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+        generate_personas: Optional[Callable[..., Awaitable]] = None,
+        generate_ad: Optional[Callable[..., Awaitable]] = None,
+        cache: Optional[ResponseCache] = None,
+        backend=None,
+    ):
+        """
+        Args:
+            max_concurrency: The global cap on in-flight jobs (and so on
+                in-flight LLM calls, which a job makes one at a time).
+            max_retries: Validation retries per ad angle.
+            rate_limit_retries: Retries of a job after rate limiting.
+            backoff_seconds: Base delay after rate limiting (doubles per retry).
+            generate_personas: Async persona generator (config -> list schema).
+                Defaults to the backend's `agenerate_personas`.
+            generate_ad: Async ad generator (persona, config, angle, retries).
+                Defaults to the backend's `agenerate_ad_variation`.
+            cache: A response cache passed to both generators as `cache=`.
+            backend: A generator backend (see backends.py); LLMBackend if None.
+        """
+        self.max_concurrency = max_concurrency
+        self.limiter = AdaptiveLimiter(max_concurrency)
+        self.max_retries = max_retries
+        self.rate_limit_retries = rate_limit_retries
+        self.backoff_seconds = backoff_seconds
+        self.backend = backend if backend is not None else LLMBackend()
+        generate_personas = generate_personas or self.backend.agenerate_personas
+        generate_ad = generate_ad or self.backend.agenerate_ad_variation
+        if cache is not None:
+            generate_personas = partial(generate_personas, cache=cache)
+            generate_ad = partial(generate_ad, cache=cache)
+        self.generate_personas = generate_personas
+        self.generate_ad = generate_ad
+        self.stats = PipelineStats()
+
+    async def _call(self, func: Callable[..., Awaitable], *args):
+        """Runs one job under the limiter, backing off when rate limited."""
+        for attempt in range(self.rate_limit_retries + 1):
+            await self.limiter.acquire()
+            started = time.perf_counter()
+            try:
+                result = await func(*args)
+            except Exception as e:
+                rate_limited = is_rate_limited(e)
+                await self.limiter.release(rate_limited=rate_limited)
+                if not rate_limited or attempt == self.rate_limit_retries:
+                    raise
+                self.stats.rate_limited += 1
+                await asyncio.sleep(self.backoff_seconds * 2**attempt)
+                continue
+            await self.limiter.release()
+            self.stats.job_latencies.append(time.perf_counter() - started)
+            return result
+
+    async def _run_job(
+        self, queue: asyncio.Queue, result: GenerationResult, func, *args
+    ):
+        started = time.perf_counter()
+        self.stats.jobs += 1
+        try:
+            result.value = await self._call(func, *args)
+        except Exception as e:
+            self.stats.failures += 1
+            result.error = str(e)
+            logger.error(f"Generation job failed ({result.kind}): {e}")
+        result.latency_seconds = time.perf_counter() - started
+        await queue.put(result)
+
+    async def _run_config(
+        self, queue: asyncio.Queue, index: int, config: CampaignConfiguration
+    ):
+        started = time.perf_counter()
+        # Tags the LLM calls of this config (and its child tasks) in telemetry
+        with telemetry.context(config=config.offer_name):
+            personas = GenerationResult(config_index=index, kind="personas")
+            await self._run_job(queue, personas, self.generate_personas, config)
+            if personas.error is None:
+                await asyncio.gather(
+                    *(
+                        self._run_job(
+                            queue,
+                            GenerationResult(
+                                config_index=index,
+                                kind="ad",
+                                persona=persona,
+                                angle=angle,
+                            ),
+                            self.generate_ad,
+                            persona,
+                            config,
+                            angle,
+                            self.max_retries,
+                        )
+                        for persona in personas.value.personas
+                        for angle in ANGLES
+                    )
+                )
+        self.stats.config_latencies.append(time.perf_counter() - started)
+
+    async def stream(
+        self, configs: List[CampaignConfiguration]
+    ) -> AsyncIterator[GenerationResult]:
+        """
+        Runs every configuration and yields results in completion order.
+
+        A failed job is yielded with `error` set; it does not stop other jobs.
+        """
+        self.stats = PipelineStats()
+        self.limiter = AdaptiveLimiter(self.max_concurrency)
+        queue: asyncio.Queue = asyncio.Queue()
+        started = time.perf_counter()
+        calls_before = telemetry.total_calls
+        tasks = [
+            asyncio.create_task(self._run_config(queue, index, config))
+            for index, config in enumerate(configs)
+        ]
+        done = asyncio.gather(*tasks)
+        try:
+            while not (done.done() and queue.empty()):
+                getter = asyncio.ensure_future(queue.get())
+                await asyncio.wait({getter, done}, return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield getter.result()
+                else:
+                    getter.cancel()
+            done.result()  # Surface unexpected (non-job) errors
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.stats.wall_seconds = time.perf_counter() - started
+            self.stats.peak_concurrency = self.limiter.peak_in_flight
+            self.stats.llm_calls = telemetry.total_calls - calls_before
+            logger.info(
+                f"Generation pipeline finished {self.stats.jobs} jobs "
+                f"({self.stats.llm_calls} LLM calls) in "
+                f"{self.stats.wall_seconds:.1f}s ({self.stats.jobs_per_second:.2f} jobs/s)."
+            )
+
+    async def run(self, configs: List[CampaignConfiguration]) -> List[GenerationResult]:
+        """Runs every configuration and returns all results in completion order."""
+        return [result async for result in self.stream(configs)]
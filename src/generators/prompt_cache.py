@@ -0,0 +1,45 @@
+"""
+Anthropic prompt caching for generation prompts.
+
+Prompts are sent as a static prefix, marked with `cache_control` once it is
+long enough for the model to cache, followed by a small dynamic suffix. The
+API then reuses the processed prefix across calls, which cuts input-token
+cost and time-to-first-token. The cache read/write token counts of each
+response are recorded by the LLM telemetry (src/telemetry/llm.py).
+"""
+
+from typing import Any, Dict, Optional
+
+CACHE_CONTROL = {"type": "ephemeral"}
+# The shortest prompt prefix, in tokens, that each model will cache.
+MIN_CACHEABLE_TOKENS = {
+    "claude-3-haiku-20240307": 2048,
+    "claude-3-5-sonnet-20241022": 1024,
+}
+# Rough characters per token of English prompt text, to estimate lengths.
+CHARS_PER_TOKEN = 4
+
+
+def is_cacheable(text: str, model: str) -> bool:
+    """Returns whether `text` is estimated to reach `model`'s cacheable length."""
+    return len(text) / CHARS_PER_TOKEN >= MIN_CACHEABLE_TOKENS.get(model, 0)
+
+
+def cached_user_message(
+    static_prefix: str, dynamic_suffix: str, model: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Builds a user message whose static prefix is cached by the API.
+
+    Prefixes shorter than the model's MIN_CACHEABLE_TOKENS are processed
+    normally without caching, so when `model` is given the prefix is only
+    marked if `is_cacheable`; the message keeps the same two blocks either
+    way.
+    """
+    prefix: Dict[str, Any] = {"type": "text", "text": static_prefix}
+    if model is None or is_cacheable(static_prefix, model):
+        prefix["cache_control"] = CACHE_CONTROL
+    return {
+        "role": "user",
+        "content": [prefix, {"type": "text", "text": dynamic_suffix}],
+    }
@@ -0,0 +1,114 @@
+"""
+Local selection of ad copy from over-generated candidates, and ad-copy metrics.
+
+Checking length and blocklist rules locally is instant, so asking the model
+for a surplus of candidates and filtering them here replaces most retry
+round trips. Near-duplicate candidates are removed so the selected subset
+stays varied.
+"""
+
+import re
+import threading
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import List, Tuple
+
+# Candidates at least this similar (after normalization) are duplicates.
+DUPLICATE_SIMILARITY = 0.85
+
+_NON_WORD = re.compile(r"[^a-z0-9%]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercases and strips punctuation and extra whitespace for comparison."""
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def is_near_duplicate(
+    first: str, second: str, threshold: float = DUPLICATE_SIMILARITY
+) -> bool:
+    a, b = normalize(first), normalize(second)
+    if a == b:
+        return True
+    return SequenceMatcher(None, a, b).ratio() >= threshold
+
+
+def dedupe(
+    texts: List[str], threshold: float = DUPLICATE_SIMILARITY
+) -> Tuple[List[str], int]:
+    """
+    Removes near-duplicates, keeping the first (highest-ranked) of each group.
+
+    Returns:
+        The kept texts in their original order, and the number removed.
+    """
+    kept: List[str] = []
+    for text in texts:
+        if not any(is_near_duplicate(text, other, threshold) for other in kept):
+            kept.append(text)
+    return kept, len(texts) - len(kept)
+
+
+@dataclass
+class AdCopyStats:
+    """Counts of LLM calls, retries, candidate filtering and aborted streams."""
+
+    ads: int = 0
+    attempts: int = 0
+    retries: int = 0
+    calls: int = 0
+    candidates: int = 0
+    rejected_invalid: int = 0
+    rejected_duplicate: int = 0
+    aborted_streams: int = 0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def add(self, **counts: int):
+        """Increments the named counters."""
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    @property
+    def retry_rate(self) -> float:
+        """The share of generation attempts that were retries."""
+        return self.retries / self.attempts if self.attempts else 0.0
+
+    @property
+    def calls_per_ad(self) -> float:
+        return self.calls / self.ads if self.ads else 0.0
+
+    def reset(self):
+        with self._lock:
+            for name in (
+                "ads",
+                "attempts",
+                "retries",
+                "calls",
+                "candidates",
+                "rejected_invalid",
+                "rejected_duplicate",
+                "aborted_streams",
+            ):
+                setattr(self, name, 0)
+
+    def summary(self) -> dict:
+        """Returns the counters and rates as a JSON-serializable dict."""
+        return {
+            "ads": self.ads,
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "calls": self.calls,
+            "candidates": self.candidates,
+            "rejected_invalid": self.rejected_invalid,
+            "rejected_duplicate": self.rejected_duplicate,
+            "aborted_streams": self.aborted_streams,
+            "retry_rate": self.retry_rate,
+            "calls_per_ad": self.calls_per_ad,
+        }
+
+
+# Process-wide ad-copy generation metrics.
+ad_copy_stats = AdCopyStats()
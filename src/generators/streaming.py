@@ -0,0 +1,298 @@
+"""
+Streaming ad-copy generation with early abort on rule violations.
+
+The ad copy is streamed as the JSON input of a forced tool call. Each
+headline and description is checked against the AdCopySchema rules while it
+is still being written. At the first fatal violation (an item over its
+character limit, a blocked keyword, or too many items), the stream is closed
+and a new attempt starts at once, rather than waiting for the full response
+and discarding it.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from anthropic import Anthropic, AsyncAnthropic
+
+from src.generators.ad_copy_generator import (
+    DESCRIPTION_MAX_LENGTH,
+    HEADLINE_MAX_LENGTH,
+    KEYWORD_BLOCKLIST,
+    MODEL,
+    AdCopySchema,
+    AdVariation,
+    Angle,
+    _cache_key,
+    _item_error,
+    _render_message,
+)
+from src.generators.cache import ResponseCache
+from src.generators.persona_generator import PersonaSchema
+from src.generators.selection import ad_copy_stats
+from src.generators.structured import build_params, parse_message
+from src.models.configuration import CampaignConfiguration
+from src.telemetry.llm import telemetry
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Raw clients: instructor does not stream partial Anthropic responses.
+client = Anthropic()
+async_client = AsyncAnthropic()
+
+# Per field: the label used in errors, the character limit and the item cap.
+FIELD_RULES = {
+    "headlines": ("Headline", HEADLINE_MAX_LENGTH, 15),
+    "descriptions": ("Description", DESCRIPTION_MAX_LENGTH, 4),
+}
+
+_SIMPLE_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+
+@dataclass
+class RuleViolation(Exception):
+    """A fatal rule violation found in a partially streamed response."""
+
+    field: str
+    index: int
+    text: str
+    reason: str
+
+    def __str__(self) -> str:
+        return f"{self.field}[{self.index}]: {self.reason}"
+
+
+class StreamingCopyValidator:
+    """
+    Checks streamed JSON of the form {"headlines": [...], "descriptions": [...]}.
+
+    `feed` accepts chunks of the JSON text as they arrive and raises
+    RuleViolation as soon as an item, complete or still being written,
+    breaks a rule that no continuation could fix.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.items: Dict[str, List[str]] = {field: [] for field in FIELD_RULES}
+        self._stack: List[str] = []
+        self._key: Optional[str] = None
+        self._in_string = False
+        self._escape: Optional[str] = None  # Pending escape sequence
+        self._value = ""
+
+    def feed(self, chunk: str):
+        self.text += chunk
+        for char in chunk:
+            if self._in_string:
+                self._feed_string(char)
+            elif char == '"':
+                self._in_string = True
+                self._value = ""
+            elif char in "{[":
+                self._stack.append(char)
+            elif char in "}]":
+                if self._stack:
+                    self._stack.pop()
+
+    def _feed_string(self, char: str):
+        if self._escape is not None:
+            self._escape += char
+            if self._escape[0] != "u":
+                self._value += _SIMPLE_ESCAPES.get(self._escape, self._escape)
+                self._escape = None
+            elif len(self._escape) == 5:
+                self._value = _append_code_point(self._value, int(self._escape[1:], 16))
+                self._escape = None
+            else:
+                return
+        elif char == "\\":
+            self._escape = ""
+            return
+        elif char == '"':
+            self._in_string = False
+            self._end_string()
+            return
+        else:
+            self._value += char
+        field = self._item_field()
+        if field is not None:
+            self._check(field, self._value, complete=False)
+
+    def _item_field(self) -> Optional[str]:
+        """Returns the field whose array item is being read, if any."""
+        if self._stack == ["{", "["] and self._key in FIELD_RULES:
+            return self._key
+        return None
+
+    def _end_string(self):
+        field = self._item_field()
+        if self._stack == ["{"]:
+            self._key = self._value  # A top-level key (values are arrays)
+        elif field is not None:
+            self._check(field, self._value, complete=True)
+            self.items[field].append(self._value)
+
+    def _check(self, field: str, text: str, complete: bool):
+        kind, max_length, max_items = FIELD_RULES[field]
+        index = len(self.items[field])
+        if index >= max_items:
+            raise RuleViolation(field, index, text, f"More than {max_items} {field}.")
+        if complete:
+            reason = _item_error(text, kind, max_length)
+        elif len(text) > max_length:
+            reason = f"{kind} must be {max_length} characters or less."
+        elif any(blocked in text.lower() for blocked in KEYWORD_BLOCKLIST):
+            reason = f"Ad copy contains a blocked keyword: {text}"
+        else:
+            reason = None
+        if reason:
+            raise RuleViolation(field, index, text, reason)
+
+
+def _append_code_point(text: str, code: int) -> str:
+    """
+    Appends a \\u-escaped code point, combining a UTF-16 surrogate pair
+    (e.g. \\uD83D\\uDE00) into one character as json.loads does, so
+    lengths are measured as in the parsed response.
+    """
+    if 0xDC00 <= code <= 0xDFFF and text and 0xD800 <= ord(text[-1]) <= 0xDBFF:
+        high = ord(text[-1])
+        return text[:-1] + chr(0x10000 + ((high - 0xD800) << 10) + (code - 0xDC00))
+    return text + chr(code)
+
+
+def _partial_json(event: Any) -> Optional[str]:
+    """Returns the partial tool-input JSON carried by a stream event, if any."""
+    if getattr(event, "type", None) != "content_block_delta":
+        return None
+    delta = event.delta
+    if getattr(delta, "type", None) != "input_json_delta":
+        return None
+    return delta.partial_json
+
+
+def _abort(
+    angle: Angle,
+    attempt: int,
+    violation: RuleViolation,
+    validator: StreamingCopyValidator,
+):
+    ad_copy_stats.add(aborted_streams=1)
+    logger.warning(
+        f"Aborted {angle} stream on attempt {attempt + 1} after "
+        f"{len(validator.text)} characters: {violation}"
+    )
+
+
+def stream_ad_variation(
+    persona: PersonaSchema,
+    config: CampaignConfiguration,
+    angle: Angle,
+    max_retries: int = 3,
+    cache: Optional[ResponseCache] = None,
+) -> AdVariation:
+    """
+    Generates one angle, aborting and retrying a stream on a rule violation.
+    """
+    message = _render_message(angle, persona, config)
+    key = _cache_key(message)
+    cached = cache.get(key, AdCopySchema) if cache is not None else None
+    if cached is not None:
+        return AdVariation(angle=angle, copy=cached)
+
+    params = build_params(message, AdCopySchema)
+    for attempt in range(max_retries):
+        ad_copy_stats.add(attempts=1, retries=int(attempt > 0), calls=1)
+        validator = StreamingCopyValidator()
+        try:
+            with telemetry.track("ad_copy_stream", MODEL, attempt=attempt) as call:
+                with client.messages.stream(**params) as stream:
+                    for event in stream:
+                        call.first_token()
+                        partial_json = _partial_json(event)
+                        if partial_json:
+                            validator.feed(partial_json)
+                    final = stream.get_final_message()
+                call.record_response(final)
+                ad_copy = parse_message(final, AdCopySchema)
+        except RuleViolation as violation:
+            _abort(angle, attempt, violation, validator)
+            if attempt + 1 == max_retries:
+                raise
+            continue
+        except ValueError as e:  # Includes pydantic's ValidationError
+            logger.warning(
+                f"Validation failed on attempt {attempt + 1} for {angle} ad: {e}"
+            )
+            if attempt + 1 == max_retries:
+                raise
+            continue
+        ad_copy_stats.add(ads=1)
+        if cache is not None:
+            cache.set(key, ad_copy)
+        return AdVariation(angle=angle, copy=ad_copy)
+    raise ValueError(f"max_retries must be at least 1, got {max_retries}.")
+
+
+async def astream_ad_variation(
+    persona: PersonaSchema,
+    config: CampaignConfiguration,
+    angle: Angle,
+    max_retries: int = 3,
+    cache: Optional[ResponseCache] = None,
+) -> AdVariation:
+    """
+    Async variant of `stream_ad_variation`.
+
+    Takes the same arguments as `agenerate_ad_variation`, so it can be
+    passed to GenerationPipeline as `generate_ad`.
+    """
+    message = _render_message(angle, persona, config)
+    key = _cache_key(message)
+    cached = cache.get(key, AdCopySchema) if cache is not None else None
+    if cached is not None:
+        return AdVariation(angle=angle, copy=cached)
+
+    params = build_params(message, AdCopySchema)
+    for attempt in range(max_retries):
+        ad_copy_stats.add(attempts=1, retries=int(attempt > 0), calls=1)
+        validator = StreamingCopyValidator()
+        try:
+            with telemetry.track("ad_copy_stream", MODEL, attempt=attempt) as call:
+                async with async_client.messages.stream(**params) as stream:
+                    async for event in stream:
+                        call.first_token()
+                        partial_json = _partial_json(event)
+                        if partial_json:
+                            validator.feed(partial_json)
+                    final = await stream.get_final_message()
+                call.record_response(final)
+                ad_copy = parse_message(final, AdCopySchema)
+        except RuleViolation as violation:
+            _abort(angle, attempt, violation, validator)
+            if attempt + 1 == max_retries:
+                raise
+            continue
+        except ValueError as e:  # Includes pydantic's ValidationError
+            logger.warning(
+                f"Validation failed on attempt {attempt + 1} for {angle} ad: {e}"
+            )
+            if attempt + 1 == max_retries:
+                raise
+            continue
+        ad_copy_stats.add(ads=1)
+        if cache is not None:
+            cache.set(key, ad_copy)
+        return AdVariation(angle=angle, copy=ad_copy)
+    raise ValueError(f"max_retries must be at least 1, got {max_retries}.")
@@ -0,0 +1,57 @@
+"""
+Structured output with native Anthropic tool use.
+
+The instructor client is used for ordinary calls. Batch requests and
+streamed responses are sent with the raw SDK instead: the response model is
+offered as the only tool, the model is forced to call it, and the tool
+input is validated against the model.
+"""
+
+from typing import Any, Dict, Type, TypeVar
+
+from pydantic import BaseModel
+
+from src.generators.persona_generator import MODEL
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+MAX_TOKENS = 1024
+
+
+def build_params(
+    message: Dict[str, Any],
+    response_model: Type[BaseModel],
+    max_tokens: int = MAX_TOKENS,
+) -> Dict[str, Any]:
+    """
+    Builds Messages API params that force a structured response.
+
+    The response model is offered as the only tool and the model is required
+    to call it, so the tool input is the structured output.
+    """
+    return {
+        "model": MODEL,
+        "max_tokens": max_tokens,
+        "messages": [message],
+        "tools": [
+            {
+                "name": response_model.__name__,
+                "description": f"Return the {response_model.__name__}.",
+                "input_schema": response_model.model_json_schema(),
+            }
+        ],
+        "tool_choice": {"type": "tool", "name": response_model.__name__},
+    }
+
+
+def parse_message(message: Any, response_model: Type[ModelT]) -> ModelT:
+    """
+    Validates the tool call in a Message against the response model.
+
+    Raises:
+        ValueError: If the message has no tool call, or it does not validate.
+    """
+    for block in getattr(message, "content", None) or []:
+        if getattr(block, "type", None) == "tool_use":
+            return response_model.model_validate(block.input)
+    raise ValueError("Response has no structured tool call.")
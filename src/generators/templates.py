@@ -0,0 +1,135 @@
+"""
+Compiled prompt-template registry shared by the generators.
+
+Every file under `prompts/` is compiled once into a shared Jinja
+environment with a bytecode cache. A template is only reloaded when its
+file's mtime changes, so rendering is a cache lookup plus render.
+
+Templates are addressed by their path relative to `prompts/`. A key inside
+a YAML mapping of templates is addressed with a `#` suffix, e.g.
+"setup/generate_polarity_ads.yaml#pull_template".
+"""
+
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+import yaml
+from jinja2 import (
+    BaseLoader,
+    Environment,
+    FileSystemBytecodeCache,
+    Template,
+    TemplateNotFound,
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PROMPTS_DIR = Path(__file__).parent.parent.parent / "prompts"
+KEY_SEPARATOR = "#"
+
+
+class PromptLoader(BaseLoader):
+    """Loads prompt files, or single templates from a YAML mapping, by mtime."""
+
+    def __init__(self, prompts_dir: Path = PROMPTS_DIR):
+        self.prompts_dir = Path(prompts_dir)
+
+    def get_source(self, environment: Environment, template: str):
+        name, _, key = template.partition(KEY_SEPARATOR)
+        path = self.prompts_dir / name
+        if not path.is_file():
+            raise TemplateNotFound(template)
+
+        mtime = path.stat().st_mtime
+        source = path.read_text()
+        if key:
+            templates = yaml.safe_load(source)
+            if not isinstance(templates, dict) or key not in templates:
+                raise TemplateNotFound(template)
+            source = templates[key]
+
+        def uptodate() -> bool:
+            try:
+                return path.stat().st_mtime == mtime
+            except OSError:
+                return False
+
+        return source, str(path), uptodate
+
+    def list_templates(self):
+        return sorted(
+            path.relative_to(self.prompts_dir).as_posix()
+            for path in self.prompts_dir.rglob("*")
+            if path.is_file()
+        )
+
+
+class TemplateRegistry:
+    """A shared, cached Jinja environment for the prompt templates."""
+
+    def __init__(
+        self,
+        prompts_dir: Path = PROMPTS_DIR,
+        bytecode_cache_dir: Optional[Path] = None,
+    ):
+        """
+        Args:
+            prompts_dir: The root directory of the prompt templates.
+            bytecode_cache_dir: Where compiled templates are cached across
+                processes (default: a per-user temporary directory).
+        """
+        self.loader = PromptLoader(prompts_dir)
+        self.environment = Environment(
+            loader=self.loader,
+            bytecode_cache=FileSystemBytecodeCache(
+                str(bytecode_cache_dir) if bytecode_cache_dir else None
+            ),
+            auto_reload=True,
+            cache_size=-1,
+        )
+
+    def get(self, name: str) -> Template:
+        """Returns the compiled template, reloading it if its file changed."""
+        return self.environment.get_template(name)
+
+    def render(self, name: str, /, **context: Any) -> str:
+        """Renders a template by name."""
+        return self.get(name).render(**context)
+
+    def preload(self) -> int:
+        """
+        Compiles every file under the prompts directory, plus each template in
+        YAML mappings of templates.
+
+        Returns:
+            The number of templates compiled.
+        """
+        count = 0
+        for name in self.loader.list_templates():
+            self.get(name)
+            count += 1
+            if not name.endswith((".yaml", ".yml")):
+                continue
+            try:
+                data = yaml.safe_load((self.loader.prompts_dir / name).read_text())
+            except yaml.YAMLError:
+                continue
+            if isinstance(data, dict):
+                for key, value in data.items():
+                    if isinstance(value, str):
+                        self.get(f"{name}{KEY_SEPARATOR}{key}")
+                        count += 1
+        logger.debug(f"Preloaded {count} prompt templates.")
+        return count
+
+
+@lru_cache(maxsize=None)
+def get_registry() -> TemplateRegistry:
+    """Returns the process-wide TemplateRegistry, compiling all prompts once."""
+    registry = TemplateRegistry()
+    registry.preload()
+    return registry
@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+
+
+class AdPerformance(BaseModel):
+    """Data model for ad performance metrics."""
+
+    ad_id: str = Field(..., description="The ID of the ad.")
+    ad_group_ad_resource_name: str = Field(
+        ..., description="The resource name of the ad group ad."
+    )
+    ctr: float = Field(..., description="The click-through rate of the ad.")
+    impressions: int = Field(
+        ..., description="The number of impressions the ad received."
+    )
+    clicks: int = Field(..., description="The number of clicks the ad received.")
@@ -0,0 +1,174 @@
+# src/monitoring/ad_performance_table.py
+
+import sys
+from array import array
+from typing import Callable, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from src.models.ad_performance import AdPerformance
+
+# numpy dtype of each numeric column (matching the `array` typecodes).
+COLUMN_DTYPES = {
+    "ad_ids": np.int64,
+    "ad_group_ids": np.int64,
+    "ctr": np.float64,
+    "impressions": np.int64,
+    "clicks": np.int64,
+}
+
+Indices = Union[Sequence[int], np.ndarray]
+
+
+class AdPerformanceTable:
+    """
+    A compact struct-of-arrays table of ad performance rows.
+
+    Bulk paths (100k+ ads) hold one typed `array` per column instead of one
+    pydantic `AdPerformance` per row. Resource names are interned so repeated
+    loads of the same account share string storage. Rows are converted to
+    `AdPerformance` only at API boundaries via `to_ad_performance`.
+
+    Filtering and sorting run on numpy views of the columns (see `column`),
+    with boolean masks and `np.argsort` rather than per-row Python loops.
+    """
+
+    __slots__ = (
+        "ad_ids",
+        "ad_group_ids",
+        "resource_names",
+        "ctr",
+        "impressions",
+        "clicks",
+    )
+
+    def __init__(self):
+        self.ad_ids = array("q")
+        self.ad_group_ids = array("q")
+        self.resource_names: List[str] = []
+        self.ctr = array("d")
+        self.impressions = array("q")
+        self.clicks = array("q")
+
+    def __len__(self) -> int:
+        return len(self.ad_ids)
+
+    def append(
+        self,
+        ad_id: int,
+        ad_group_id: int,
+        resource_name: str,
+        ctr: float,
+        impressions: int,
+        clicks: int,
+    ):
+        """Appends a single row to the table."""
+        self.ad_ids.append(int(ad_id))
+        self.ad_group_ids.append(int(ad_group_id))
+        self.resource_names.append(sys.intern(resource_name))
+        self.ctr.append(float(ctr))
+        self.impressions.append(int(impressions))
+        self.clicks.append(int(clicks))
+
+    @classmethod
+    def from_rows(cls, rows: Iterable) -> "AdPerformanceTable":
+        """
+        Builds a table from Google Ads API rows without per-row validation.
+
+        Args:
+            rows: `GoogleAdsRow` objects with ad_group_ad, ad_group and metrics fields.
+        """
+        table = cls()
+        for row in rows:
+            table.append(
+                row.ad_group_ad.ad.id,
+                row.ad_group.id,
+                row.ad_group_ad.resource_name,
+                row.metrics.ctr,
+                row.metrics.impressions,
+                row.metrics.clicks,
+            )
+        return table
+
+    @classmethod
+    def from_ads(
+        cls, ads: Iterable[AdPerformance], ad_group_id: int = 0
+    ) -> "AdPerformanceTable":
+        """Builds a table from existing AdPerformance objects."""
+        table = cls()
+        for ad in ads:
+            table.append(
+                int(ad.ad_id),
+                ad_group_id,
+                ad.ad_group_ad_resource_name,
+                ad.ctr,
+                ad.impressions,
+                ad.clicks,
+            )
+        return table
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Returns a zero-copy numpy view of a numeric column.
+
+        The view shares memory with the column, so do not keep it across
+        `append` calls (the column cannot grow while a view exists).
+        """
+        return np.frombuffer(getattr(self, name), dtype=COLUMN_DTYPES[name])
+
+    def take(self, indices: Indices) -> "AdPerformanceTable":
+        """Returns a new table containing only the rows at the given indices."""
+        indices = np.asarray(indices, dtype=np.intp)
+        table = AdPerformanceTable()
+        for name in COLUMN_DTYPES:
+            values = getattr(table, name)
+            values.frombytes(self.column(name)[indices].tobytes())
+        table.resource_names = [self.resource_names[i] for i in indices.tolist()]
+        return table
+
+    def where(self, column: str, predicate: Callable) -> np.ndarray:
+        """
+        Returns the indices of rows whose `column` value satisfies `predicate`.
+
+        Args:
+            column: One of the numeric column names (e.g. "ctr", "impressions").
+            predicate: A vectorized callable that takes the column as a numpy
+                array and returns a boolean mask (e.g. `lambda v: v >= 300`).
+        """
+        return np.flatnonzero(predicate(self.column(column)))
+
+    def below_ctr(self, threshold: float) -> "AdPerformanceTable":
+        """Returns the rows with a CTR strictly below the given threshold."""
+        return self.take(np.flatnonzero(self.column("ctr") < threshold))
+
+    def argsort(self, column: str, descending: bool = False) -> np.ndarray:
+        """Returns row indices ordered by the given column (stable)."""
+        values = self.column(column)
+        if descending:
+            # Reversing the ascending order of the reversed column keeps ties
+            # in their original order.
+            order = np.argsort(values[::-1], kind="stable")
+            return (len(values) - 1 - order)[::-1]
+        return np.argsort(values, kind="stable")
+
+    def sort_by(self, column: str, descending: bool = False) -> "AdPerformanceTable":
+        """Returns a new table sorted by the given column."""
+        return self.take(self.argsort(column, descending))
+
+    def to_ad_performance(self, index: int) -> AdPerformance:
+        """Converts a single row into a validated AdPerformance model."""
+        return AdPerformance(
+            ad_id=str(self.ad_ids[index]),
+            ad_group_ad_resource_name=self.resource_names[index],
+            ctr=self.ctr[index],
+            impressions=self.impressions[index],
+            clicks=self.clicks[index],
+        )
+
+    def to_ad_performances(
+        self, indices: Optional[Indices] = None
+    ) -> List[AdPerformance]:
+        """Converts rows (all rows by default) into AdPerformance models."""
+        if indices is None:
+            indices = range(len(self))
+        return [self.to_ad_performance(int(i)) for i in indices]
@@ -1,29 +1,28 @@
 # src/monitoring/ctr_monitor.py
 
 import logging
-from typing import List
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
 
+import numpy as np
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
-from pydantic import BaseModel, Field
+from src.models.ad_performance import AdPerformance
+from src.monitoring.ad_performance_table import AdPerformanceTable
+from src.monitoring.ctr_scoring import score_ads, select_underperformers
+from src.monitoring.snapshots import SnapshotStore
+from src.mutations.journal import ACTION_PAUSE, ActionJournal
+from src.mutations.operation_factory import OperationFactory
+from src.mutations.plan import MutationPlan
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-
-class AdPerformance(BaseModel):
-    """Data model for ad performance metrics."""
-
-    ad_id: str = Field(..., description="The ID of the ad.")
-    ad_group_ad_resource_name: str = Field(
-        ..., description="The resource name of the ad group ad."
-    )
-    ctr: float = Field(..., description="The click-through rate of the ad.")
-    impressions: int = Field(
-        ..., description="The number of impressions the ad received."
-    )
-    clicks: int = Field(..., description="The number of clicks the ad received.")
+# Ads per mutate_ad_group_ads request in streaming mode.
+DEFAULT_PAUSE_CHUNK_SIZE = 1000
+# SnapshotStore namespace for CTR threshold evaluations.
+SNAPSHOT_NAMESPACE = "ctr"
 
 
 class CTRMonitor:
@@ -38,6 +37,58 @@ class CTRMonitor:
         """
         self.client = client
         self.google_ads_service = self.client.get_service("GoogleAdsService")
+        self.operations = OperationFactory(self.client)
+
+    @staticmethod
+    def _build_query(campaign_id: str) -> str:
+        return f"""
+            SELECT ad_group_ad.ad.id, ad_group_ad.resource_name, ad_group.id, metrics.ctr, metrics.impressions, metrics.clicks
+            FROM ad_group_ad
+            WHERE campaign.id = {campaign_id}
+            AND metrics.impressions > 100
+        """
+
+    @staticmethod
+    def _log_google_ads_exception(ex: GoogleAdsException):
+        logger.error(
+            f'Request with ID "{ex.request_id}" failed with status '
+            f'"{ex.error.code().name}" and includes the following errors:'
+        )
+        for error in ex.failure.errors:
+            logger.error(f'\tError with message "{error.message}".')
+            if error.location:
+                for field_path_element in error.location.field_path_elements:
+                    logger.error(f"\t\tOn field: {field_path_element.field_name}")
+
+    def iter_ad_performance(
+        self, customer_id: str, campaign_id: str
+    ) -> Iterator[AdPerformance]:
+        """
+        Lazily yields ad performance rows for a given campaign.
+
+        Rows are parsed as each `search_stream` batch arrives, so callers can
+        start acting on the first batch before the rest has been downloaded.
+        A GoogleAdsException is raised to the caller while iterating.
+
+        Args:
+            customer_id: The ID of the Google Ads customer.
+            campaign_id: The ID of the campaign to check.
+
+        Yields:
+            AdPerformance objects.
+        """
+        response = self.google_ads_service.search_stream(
+            customer_id=customer_id, query=self._build_query(campaign_id)
+        )
+        for batch in response:
+            for row in batch.results:
+                yield AdPerformance(
+                    ad_id=str(row.ad_group_ad.ad.id),
+                    ad_group_ad_resource_name=row.ad_group_ad.resource_name,
+                    ctr=row.metrics.ctr,
+                    impressions=row.metrics.impressions,
+                    clicks=row.metrics.clicks,
+                )
 
     def check_ad_performance(
         self, customer_id: str, campaign_id: str
@@ -52,43 +103,48 @@ class CTRMonitor:
         Returns:
             A list of AdPerformance objects.
         """
-        query = f"""
-            SELECT ad_group_ad.ad.id, ad_group_ad.resource_name, metrics.ctr, metrics.impressions, metrics.clicks
-            FROM ad_group_ad
-            WHERE campaign.id = {campaign_id}
-            AND metrics.impressions > 100
-        """
         try:
-            response = self.google_ads_service.search_stream(
-                customer_id=customer_id, query=query
-            )
-            ads_performance = []
-            for batch in response:
-                for row in batch.results:
-                    ad_performance = AdPerformance(
-                        ad_id=str(row.ad_group_ad.ad.id),
-                        ad_group_ad_resource_name=row.ad_group_ad.resource_name,
-                        ctr=row.metrics.ctr,
-                        impressions=row.metrics.impressions,
-                        clicks=row.metrics.clicks,
-                    )
-                    ads_performance.append(ad_performance)
+            ads_performance = list(self.iter_ad_performance(customer_id, campaign_id))
             logger.info(f"Found {len(ads_performance)} ads with >100 impressions.")
             return ads_performance
         except GoogleAdsException as ex:
-            logger.error(
-                f'Request with ID "{ex.request_id}" failed with status '
-                f'"{ex.error.code().name}" and includes the following errors:'
-            )
-            for error in ex.failure.errors:
-                logger.error(f'\tError with message "{error.message}".')
-                if error.location:
-                    for field_path_element in error.location.field_path_elements:
-                        logger.error(f"\t\tOn field: {field_path_element.field_name}")
+            self._log_google_ads_exception(ex)
             return []
 
+    def check_ad_performance_table(
+        self, customer_id: str, campaign_id: str
+    ) -> AdPerformanceTable:
+        """
+        Retrieves ad performance data into a compact AdPerformanceTable.
+
+        Skips per-row pydantic validation; use this for bulk paths and convert
+        rows with `AdPerformanceTable.to_ad_performance` only where needed.
+
+        Args:
+            customer_id: The ID of the Google Ads customer.
+            campaign_id: The ID of the campaign to check.
+
+        Returns:
+            An AdPerformanceTable (empty if the request fails).
+        """
+        try:
+            response = self.google_ads_service.search_stream(
+                customer_id=customer_id, query=self._build_query(campaign_id)
+            )
+            table = AdPerformanceTable.from_rows(
+                row for batch in response for row in batch.results
+            )
+            logger.info(f"Found {len(table)} ads with >100 impressions.")
+            return table
+        except GoogleAdsException as ex:
+            self._log_google_ads_exception(ex)
+            return AdPerformanceTable()
+
     def identify_underperformers(
-        self, ads: List[AdPerformance], threshold: float = 0.01
+        self,
+        ads: List[AdPerformance],
+        threshold: float = 0.01,
+        snapshots: Optional[SnapshotStore] = None,
     ) -> List[str]:
         """
         Identifies ads that are performing below a given CTR threshold.
@@ -96,21 +152,113 @@ class CTRMonitor:
         Args:
             ads: A list of AdPerformance objects.
             threshold: The CTR threshold (default is 0.01 for 1%).
+            snapshots: Optional SnapshotStore. When given, only ads whose
+                metrics (or the threshold) changed since the last evaluation
+                are considered. The returned ads are only staged; pass the
+                store to `pause_underperforming_ads` to commit them once the
+                pause succeeds.
+
+        Returns:
+            A list of ad group ad resource names for the underperforming ads.
+        """
+        if snapshots is not None:
+            inputs = {
+                ad.ad_group_ad_resource_name: (
+                    ad.ctr,
+                    ad.impressions,
+                    ad.clicks,
+                    threshold,
+                )
+                for ad in ads
+            }
+            changed = snapshots.diff(SNAPSHOT_NAMESPACE, inputs)
+            logger.info(f"{len(changed)} of {len(ads)} ads changed since last run.")
+            ads = [ad for ad in ads if ad.ad_group_ad_resource_name in changed]
+
+        underperforming_ad_resource_names = list(
+            self.iter_underperformers(ads, threshold)
+        )
+        logger.info(
+            f"Identified {len(underperforming_ad_resource_names)} underperforming ads "
+            f"(CTR < {threshold})."
+        )
+        if snapshots is not None:
+            flagged = set(underperforming_ad_resource_names)
+            snapshots.commit(SNAPSHOT_NAMESPACE, inputs, changed - flagged)
+            snapshots.stage(SNAPSHOT_NAMESPACE, inputs, flagged)
+        return underperforming_ad_resource_names
+
+    def identify_underperformers_scored(
+        self,
+        table: AdPerformanceTable,
+        threshold: float = 0.01,
+        confidence: float = 0.95,
+    ) -> List[str]:
+        """
+        Identifies underperforming ads with statistical CTR scoring.
+
+        Unlike `identify_underperformers`, an ad is only flagged when it is
+        below the threshold with high posterior probability and trails its
+        sibling ads, so low-volume ads are not paused on noise.
+
+        Args:
+            table: An AdPerformanceTable (see `check_ad_performance_table`).
+            threshold: The CTR threshold (default is 0.01 for 1%).
+            confidence: The required probability of being below threshold.
 
         Returns:
             A list of ad group ad resource names for the underperforming ads.
         """
+        if not len(table):
+            return []
+
+        scores = score_ads(
+            table.column("clicks"),
+            table.column("impressions"),
+            table.column("ad_group_ids"),
+            threshold=threshold,
+        )
+        mask = select_underperformers(scores, confidence=confidence)
         underperforming_ad_resource_names = [
-            ad.ad_group_ad_resource_name for ad in ads if ad.ctr < threshold
+            table.resource_names[i] for i in np.flatnonzero(mask)
         ]
         logger.info(
             f"Identified {len(underperforming_ad_resource_names)} underperforming ads "
-            f"(CTR < {threshold})."
+            f"(P(CTR < {threshold}) >= {confidence})."
         )
         return underperforming_ad_resource_names
 
+    @staticmethod
+    def iter_underperformers(
+        ads: Iterable[AdPerformance], threshold: float = 0.01
+    ) -> Iterator[str]:
+        """
+        Lazily yields the resource names of ads below a given CTR threshold.
+
+        Args:
+            ads: An iterable of AdPerformance objects.
+            threshold: The CTR threshold (default is 0.01 for 1%).
+
+        Yields:
+            Ad group ad resource names for the underperforming ads.
+        """
+        for ad in ads:
+            if ad.ctr < threshold:
+                yield ad.ad_group_ad_resource_name
+
+    def _build_pause_operation(self, resource_name: str):
+        operation = self.operations.update("AdGroupAdOperation", ["status"])
+        ad_group_ad = operation.update
+        ad_group_ad.resource_name = resource_name
+        ad_group_ad.status = self.client.enums.AdGroupAdStatusEnum.PAUSED
+        return operation
+
     def pause_underperforming_ads(
-        self, customer_id: str, ad_group_ad_resource_names: List[str]
+        self,
+        customer_id: str,
+        ad_group_ad_resource_names: List[str],
+        journal: Optional[ActionJournal] = None,
+        snapshots: Optional[SnapshotStore] = None,
     ):
         """
         Pauses a list of underperforming ads.
@@ -118,25 +266,28 @@ class CTRMonitor:
         Args:
             customer_id: The ID of the Google Ads customer.
             ad_group_ad_resource_names: A list of ad group ad resource names to pause.
+            journal: Optional ActionJournal. When given, ads already paused
+                today are skipped.
+            snapshots: Optional SnapshotStore the ads were identified with.
+                Their staged snapshots are committed once they are paused
+                (or were already paused today), never after a failed mutate.
         """
+        identified = ad_group_ad_resource_names
+        if journal is not None:
+            ad_group_ad_resource_names = journal.pending(
+                ad_group_ad_resource_names, ACTION_PAUSE
+            )
         if not ad_group_ad_resource_names:
             logger.info("No underperforming ads to pause.")
+            if snapshots is not None:
+                snapshots.commit_staged(SNAPSHOT_NAMESPACE, identified)
             return
 
         ad_group_ad_service = self.client.get_service("AdGroupAdService")
-        operations = []
-        for resource_name in ad_group_ad_resource_names:
-            operation = self.client.get_type("AdGroupAdOperation")
-            ad_group_ad = operation.update
-            ad_group_ad.resource_name = resource_name
-            ad_group_ad.status = self.client.enums.AdGroupAdStatusEnum.PAUSED
-
-            # Create a field mask to specify which fields are being updated.
-            field_mask = self.client.get_type("FieldMask")
-            field_mask.paths.append("status")
-            self.client.copy_from(operation.update_mask, field_mask)
-
-            operations.append(operation)
+        operations = [
+            self._build_pause_operation(resource_name)
+            for resource_name in ad_group_ad_resource_names
+        ]
 
         try:
             response = ad_group_ad_service.mutate_ad_group_ads(
@@ -145,6 +296,10 @@ class CTRMonitor:
             logger.info(f"Paused {len(response.results)} underperforming ads.")
             for result in response.results:
                 logger.info(f"Paused ad: {result.resource_name}")
+            if journal is not None:
+                journal.record(ad_group_ad_resource_names, ACTION_PAUSE)
+            if snapshots is not None:
+                snapshots.commit_staged(SNAPSHOT_NAMESPACE, identified)
         except GoogleAdsException as ex:
             logger.error(
                 f'Request with ID "{ex.request_id}" failed with status '
@@ -152,3 +307,98 @@ class CTRMonitor:
             )
             for error in ex.failure.errors:
                 logger.error(f'\tError with message "{error.message}".')
+
+    def plan_pause_underperforming_ads(
+        self,
+        customer_id: str,
+        ad_group_ad_resource_names: List[str],
+        plan: Optional[MutationPlan] = None,
+    ) -> MutationPlan:
+        """
+        Plans pausing a list of underperforming ads without calling the API.
+
+        Args:
+            customer_id: The ID of the Google Ads customer.
+            ad_group_ad_resource_names: A list of ad group ad resource names to pause.
+            plan: Optional MutationPlan to add the changes to.
+
+        Returns:
+            The MutationPlan; apply it with `apply_plan`.
+        """
+        plan = plan if plan is not None else MutationPlan()
+        for resource_name in ad_group_ad_resource_names:
+            plan.add(
+                customer_id,
+                "ad_group_ad",
+                resource_name,
+                "status",
+                "PAUSED",
+                journal_action=ACTION_PAUSE,
+            )
+        logger.info(f"Planned pausing {len(ad_group_ad_resource_names)} ads.")
+        return plan
+
+    def pause_underperforming_ads_streaming(
+        self,
+        customer_id: str,
+        campaign_id: str,
+        threshold: float = 0.01,
+        chunk_size: int = DEFAULT_PAUSE_CHUNK_SIZE,
+        journal: Optional[ActionJournal] = None,
+    ) -> int:
+        """
+        Streams ads through the CTR filter and pauses them in fixed-size chunks.
+
+        Rows flow lazily from `search_stream` through `iter_underperformers`
+        into the pause sink, so at most `chunk_size` resource names are held in
+        memory and the first chunk is mutated while later batches are still
+        being downloaded. Intended for accounts with 100k+ ads.
+
+        Args:
+            customer_id: The ID of the Google Ads customer.
+            campaign_id: The ID of the campaign to check.
+            threshold: The CTR threshold (default is 0.01 for 1%).
+            chunk_size: The number of ads to pause per mutate request.
+            journal: Optional ActionJournal. When given, ads already paused
+                today are skipped and each paused chunk is recorded.
+
+        Returns:
+            The number of ads paused.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+
+        ad_group_ad_service = self.client.get_service("AdGroupAdService")
+        underperformers = self.iter_underperformers(
+            self.iter_ad_performance(customer_id, campaign_id), threshold
+        )
+        if journal is not None:
+            underperformers = (
+                resource_name
+                for resource_name in underperformers
+                if not journal.has_action(resource_name, ACTION_PAUSE)
+            )
+        paused = 0
+        try:
+            while True:
+                chunk = list(islice(underperformers, chunk_size))
+                if not chunk:
+                    break
+                operations = [self._build_pause_operation(rn) for rn in chunk]
+                response = ad_group_ad_service.mutate_ad_group_ads(
+                    customer_id=customer_id, operations=operations
+                )
+                paused += len(response.results)
+                if journal is not None:
+                    journal.record(chunk, ACTION_PAUSE)
+                logger.info(
+                    f"Paused chunk of {len(response.results)} underperforming ads "
+                    f"({paused} so far)."
+                )
+        except GoogleAdsException as ex:
+            self._log_google_ads_exception(ex)
+
+        logger.info(
+            f"Streaming pass paused {paused} underperforming ads (CTR < {threshold})."
+        )
+        return paused
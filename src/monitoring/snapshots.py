@@ -0,0 +1,198 @@
+# src/monitoring/snapshots.py
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# The snapshot log is compacted once it holds this many fingerprint writes
+# beyond the number of live fingerprints.
+COMPACT_MIN_RECORDS = 1000
+
+
+def fingerprint(values: Tuple) -> str:
+    """Returns a compact, process-stable hash of an entity's rule inputs."""
+    return hashlib.blake2b(repr(values).encode(), digest_size=8).hexdigest()
+
+
+class SnapshotStore:
+    """
+    Stores the last evaluated metrics fingerprint per entity.
+
+    Monitors call `diff` to find the entities whose rule inputs changed since
+    the last evaluation and run their rules on those entities only. Entities
+    that need no action are recorded with `commit` right away; entities that
+    are acted on are `stage`d and only committed with `commit_staged` once
+    their mutate succeeds, so a failed mutate is retried on the next run.
+
+    Fingerprints are grouped by namespace (one per rule and customer) and,
+    when a path is given, persisted to a local JSON lines file: each commit
+    appends only the changed fingerprints, and the file is rewritten
+    atomically (temp file and `os.replace`) once superseded records outweigh
+    the live ones. All methods are thread-safe, so one store can be shared
+    by jobs running concurrently in the scheduler or OptimizerRunner.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._snapshots: Dict[str, Dict[str, str]] = {}
+        self._staged: Dict[str, Dict[str, str]] = {}
+        # Fingerprint records in the file since it was last compacted.
+        self._logged = 0
+        if self.path is not None and self.path.exists():
+            self._load()
+
+    def _load(self):
+        damaged = False
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    self._apply(json.loads(line))
+                except (json.JSONDecodeError, AttributeError, KeyError, TypeError):
+                    logger.warning(
+                        f"Ignoring unreadable snapshot record in {self.path}."
+                    )
+                    damaged = True
+                    continue
+                # A last record without its newline was cut off mid-write.
+                damaged = damaged or not line.endswith("\n")
+        if damaged:
+            self._compact()
+
+    def _apply(self, record: Dict):
+        if "clear" in record:
+            if record["clear"] is None:
+                self._snapshots = {}
+            else:
+                self._snapshots.pop(record["clear"], None)
+            return
+        fingerprints = record.get("fingerprints", {})
+        self._snapshots.setdefault(record["namespace"], {}).update(fingerprints)
+        self._logged += len(fingerprints)
+
+    def diff(self, namespace: str, entities: Dict[str, Tuple]) -> Set[str]:
+        """
+        Returns the keys of entities that are new or whose inputs changed.
+
+        Args:
+            namespace: The rule/customer namespace, e.g. "losing:123".
+            entities: A mapping of entity key to a tuple of rule inputs.
+        """
+        with self._lock:
+            previous = dict(self._snapshots.get(namespace, {}))
+        return {
+            key
+            for key, values in entities.items()
+            if previous.get(key) != fingerprint(values)
+        }
+
+    def commit(
+        self,
+        namespace: str,
+        entities: Dict[str, Tuple],
+        keys: Optional[Iterable[str]] = None,
+    ):
+        """
+        Records the fingerprints of evaluated entities and persists them.
+
+        Args:
+            namespace: The rule/customer namespace.
+            entities: A mapping of entity key to a tuple of rule inputs.
+            keys: The keys to record (default: all of `entities`).
+        """
+        fingerprints = {
+            key: fingerprint(entities[key])
+            for key in (entities if keys is None else keys)
+        }
+        with self._lock:
+            self._write(namespace, fingerprints)
+
+    def stage(
+        self,
+        namespace: str,
+        entities: Dict[str, Tuple],
+        keys: Optional[Iterable[str]] = None,
+    ):
+        """
+        Holds the fingerprints of entities awaiting an action, in memory only.
+
+        Args:
+            namespace: The rule/customer namespace.
+            entities: A mapping of entity key to a tuple of rule inputs.
+            keys: The keys to stage (default: all of `entities`).
+        """
+        with self._lock:
+            staged = self._staged.setdefault(namespace, {})
+            for key in entities if keys is None else keys:
+                staged[key] = fingerprint(entities[key])
+
+    def commit_staged(self, namespace: str, keys: Iterable[str]):
+        """
+        Commits staged fingerprints once the action on their entities succeeded.
+
+        Args:
+            namespace: The rule/customer namespace.
+            keys: The keys whose action succeeded; unknown keys are ignored.
+        """
+        with self._lock:
+            staged = self._staged.get(namespace, {})
+            fingerprints = {key: staged.pop(key) for key in keys if key in staged}
+            self._write(namespace, fingerprints)
+
+    def clear(self, namespace: Optional[str] = None):
+        """Forgets one namespace (or everything), forcing a full re-evaluation."""
+        with self._lock:
+            if namespace is None:
+                self._snapshots = {}
+                self._staged = {}
+            else:
+                self._snapshots.pop(namespace, None)
+                self._staged.pop(namespace, None)
+            self._append({"clear": namespace})
+
+    def save(self):
+        """Rewrites the snapshot file with only the live fingerprints."""
+        with self._lock:
+            self._compact()
+
+    def _write(self, namespace: str, fingerprints: Dict[str, str]):
+        if not fingerprints:
+            return
+        self._snapshots.setdefault(namespace, {}).update(fingerprints)
+        self._append({"namespace": namespace, "fingerprints": fingerprints})
+        self._logged += len(fingerprints)
+        live = sum(len(snapshot) for snapshot in self._snapshots.values())
+        if self._logged - live > max(live, COMPACT_MIN_RECORDS):
+            self._compact()
+
+    def _append(self, record: Dict):
+        if self.path is None:
+            return
+        with open(self.path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def _compact(self):
+        self._logged = sum(len(snapshot) for snapshot in self._snapshots.values())
+        if self.path is None:
+            return
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w") as f:
+                for namespace, fingerprints in self._snapshots.items():
+                    record = {"namespace": namespace, "fingerprints": fingerprints}
+                    f.write(json.dumps(record) + "\n")
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
@@ -0,0 +1,130 @@
+# src/mutations/journal.py
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ACTION_PAUSE = "pause"
+ACTION_INCREASE_BID = "increase_bid"
+# Maximum compounded bid increase per entity per day (0.20 = +20%).
+DEFAULT_MAX_DAILY_BID_INCREASE = 0.20
+# Days of history kept in the journal file.
+DEFAULT_RETENTION_DAYS = 7
+
+
+class ActionJournal:
+    """
+    Records which mutations were applied to which entity on which day.
+
+    Optimizers consult the journal before mutating so that re-running a job
+    on the same day is free: entities already paused today are skipped, and
+    bid increases are capped so their compounded total per entity and day
+    never exceeds `max_daily_bid_increase`. The journal is keyed by
+    (day, action, entity) and persisted to a local JSON file when a path is
+    given; the file is replaced atomically, and an unreadable file raises
+    rather than being silently treated as empty (which would allow repeated
+    pauses and compounding bid increases). Recording is thread-safe, so one
+    journal can be shared by jobs running concurrently in the scheduler.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        max_daily_bid_increase: float = DEFAULT_MAX_DAILY_BID_INCREASE,
+        retention_days: int = DEFAULT_RETENTION_DAYS,
+        clock: Callable[[], date] = date.today,
+    ):
+        self.path = path
+        self.max_daily_bid_increase = max_daily_bid_increase
+        self.retention_days = retention_days
+        self.clock = clock
+        self._lock = threading.Lock()
+        # {day: {action: {entity: cumulative delta}}}
+        self._entries: Dict[str, Dict[str, Dict[str, float]]] = {}
+        if self.path is not None and self.path.exists():
+            try:
+                with open(self.path, "r") as f:
+                    self._entries = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(
+                    f"Action journal {self.path} is corrupt; restore or remove it "
+                    "before mutating again."
+                ) from e
+
+    def _today(self) -> Dict[str, Dict[str, float]]:
+        return self._entries.get(self.clock().isoformat(), {})
+
+    def has_action(self, entity: str, action: str) -> bool:
+        """Returns whether `action` was already applied to `entity` today."""
+        return entity in self._today().get(action, {})
+
+    def pending(self, entities: Iterable[str], action: str) -> list:
+        """Returns the entities (deduplicated, in order) not yet actioned today."""
+        done = self._today().get(action, {})
+        return [entity for entity in dict.fromkeys(entities) if entity not in done]
+
+    def cumulative_delta(self, entity: str, action: str) -> float:
+        """Returns the compounded delta applied to `entity` today (0.0 if none)."""
+        return self._today().get(action, {}).get(entity, 0.0)
+
+    def allowed_increase(self, entity: str, requested: float) -> float:
+        """
+        Caps a requested bid increase by what is left of today's allowance.
+
+        Args:
+            entity: The entity key, e.g. an ad group resource name.
+            requested: The requested increase (0.20 for +20%).
+
+        Returns:
+            The increase to apply, between 0.0 and `requested`.
+        """
+        applied = self.cumulative_delta(entity, ACTION_INCREASE_BID)
+        remaining = (1 + self.max_daily_bid_increase) / (1 + applied) - 1
+        # Ignore float residue so a spent allowance yields exactly 0.0.
+        if remaining < 1e-9:
+            return 0.0
+        return min(requested, remaining)
+
+    def record(self, entities: Iterable[str], action: str, delta: float = 0.0):
+        """
+        Records that `action` was applied to each entity today and persists
+        the journal. Deltas for the same entity compound multiplicatively.
+        """
+        with self._lock:
+            day = self._entries.setdefault(self.clock().isoformat(), {})
+            done = day.setdefault(action, {})
+            for entity in entities:
+                done[entity] = (1 + done.get(entity, 0.0)) * (1 + delta) - 1
+            self._save()
+
+    def save(self):
+        """Drops days past the retention window and writes the journal to disk."""
+        with self._lock:
+            self._save()
+
+    def _save(self):
+        cutoff = (self.clock() - timedelta(days=self.retention_days)).isoformat()
+        self._entries = {
+            day: actions for day, actions in self._entries.items() if day > cutoff
+        }
+        if self.path is None:
+            return
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
@@ -0,0 +1,51 @@
+# src/mutations/operation_factory.py
+
+from typing import Any, Dict, Sequence, Tuple
+
+
+class OperationFactory:
+    """
+    Builds mutate operations by cloning cached templates.
+
+    Looking up a type in the client's registry and filling in an update mask
+    dominates the cost of building thousands of operations. The factory does
+    that once per (operation type, update paths) and stamps out each new
+    operation by copying the prebuilt template into a fresh message.
+    """
+
+    def __init__(self, client):
+        """
+        Args:
+            client: An initialized Google Ads API client.
+        """
+        self.client = client
+        self._templates: Dict[Tuple[str, Tuple[str, ...]], Any] = {}
+
+    def _template(self, operation_type: str, paths: Tuple[str, ...]):
+        key = (operation_type, paths)
+        template = self._templates.get(key)
+        if template is None:
+            template = self.client.get_type(operation_type)
+            if paths:
+                template.update_mask.paths.extend(paths)
+            self._templates[key] = template
+        return template
+
+    def _clone(self, template):
+        operation = type(template)()
+        self.client.copy_from(operation, template)
+        return operation
+
+    def create(self, operation_type: str):
+        """Returns a new, empty operation of the given type."""
+        return self._clone(self._template(operation_type, ()))
+
+    def update(self, operation_type: str, paths: Sequence[str]):
+        """
+        Returns a new update operation with its update mask already set.
+
+        Args:
+            operation_type: The operation type name, e.g. "AdGroupOperation".
+            paths: The field paths being updated, e.g. ["status"].
+        """
+        return self._clone(self._template(operation_type, tuple(paths)))
@@ -0,0 +1,416 @@
+# src/mutations/plan.py
+
+import json
+import logging
+import re
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.mutations.journal import ActionJournal
+from src.mutations.operation_factory import OperationFactory
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ACTION_CREATE = "create"
+ACTION_UPDATE = "update"
+# Operations per GoogleAdsService.Mutate request (the API allows 10,000).
+DEFAULT_APPLY_CHUNK_SIZE = 5000
+# A resource name with a temporary ID, e.g. "customers/1/campaigns/-2".
+TEMP_RESOURCE_NAME = re.compile(r"^customers/(\d+)/\w+/(-\d+)$")
+
+
+def _temp_id(value: Any) -> Optional[Tuple[str, int]]:
+    """Returns (customer_id, temporary ID) if `value` is a temporary resource name."""
+    if not isinstance(value, str) or "/-" not in value:
+        return None
+    match = TEMP_RESOURCE_NAME.match(value)
+    return (match.group(1), int(match.group(2))) if match else None
+
+
+@dataclass
+class Change:
+    """
+    A single field change on one Google Ads entity.
+
+    Enum values are stored by name (e.g. "PAUSED") so plans stay
+    JSON-serializable. `old_value` is None when the synced data used for
+    planning did not include the current value. `journal_key`,
+    `journal_action` and `journal_delta` name the ActionJournal entry to
+    record once the change is applied (e.g. the ad group a keyword bid
+    belongs to); changes without a `journal_action` are not journaled.
+    """
+
+    customer_id: str
+    resource_type: str
+    resource_name: str
+    field: str
+    new_value: Any
+    old_value: Any = None
+    action: str = ACTION_UPDATE
+    journal_key: Optional[str] = None
+    journal_action: Optional[str] = None
+    journal_delta: float = 0.0
+
+
+@dataclass
+class MutationPlan:
+    """
+    An ordered, serializable set of changes computed without mutate calls.
+
+    Plans are built by the `plan_*` methods of the optimizers and monitors,
+    can be saved for review, merged across accounts and pushed to the API
+    in bulk with `apply_plan`. Entities created by a plan get temporary
+    (negative) IDs from `next_temp_id`, which are unique per customer
+    within the plan.
+    """
+
+    changes: List[Change] = field(default_factory=list)
+    # The lowest temporary ID used so far, per customer.
+    _temp_ids: Dict[str, int] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        for change in self.changes:
+            self._track_temp_id(change.resource_name)
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+    def add(
+        self,
+        customer_id: str,
+        resource_type: str,
+        resource_name: str,
+        field: str,
+        new_value: Any,
+        old_value: Any = None,
+        action: str = ACTION_UPDATE,
+        journal_key: Optional[str] = None,
+        journal_action: Optional[str] = None,
+        journal_delta: float = 0.0,
+    ):
+        """Appends one change to the plan."""
+        self._track_temp_id(resource_name)
+        self.changes.append(
+            Change(
+                customer_id=str(customer_id),
+                resource_type=resource_type,
+                resource_name=resource_name,
+                field=field,
+                new_value=new_value,
+                old_value=old_value,
+                action=action,
+                journal_key=journal_key,
+                journal_action=journal_action,
+                journal_delta=journal_delta,
+            )
+        )
+
+    def _track_temp_id(self, resource_name: str):
+        temp_id = _temp_id(resource_name)
+        if temp_id is not None:
+            customer_id, value = temp_id
+            self._temp_ids[customer_id] = min(self._temp_ids.get(customer_id, 0), value)
+
+    def next_temp_id(self, customer_id: str) -> int:
+        """Allocates a temporary ID not yet used in this plan for the customer."""
+        customer_id = str(customer_id)
+        temp_id = self._temp_ids.get(customer_id, 0) - 1
+        self._temp_ids[customer_id] = temp_id
+        return temp_id
+
+    def extend(self, other: "MutationPlan"):
+        """
+        Appends all changes of another plan.
+
+        The other plan's temporary IDs are renumbered from this plan's
+        counter (references to them included), so plans built independently
+        never collide.
+        """
+        renumbered: Dict[Tuple[str, int], int] = {}
+
+        def renumber(value: Any) -> Any:
+            temp_id = _temp_id(value)
+            if temp_id is None:
+                return value
+            if temp_id not in renumbered:
+                renumbered[temp_id] = self.next_temp_id(temp_id[0])
+            return f"{value.rsplit('/', 1)[0]}/{renumbered[temp_id]}"
+
+        for change in other.changes:
+            resource_name = renumber(change.resource_name)
+            new_value = renumber(change.new_value)
+            if (resource_name, new_value) != (change.resource_name, change.new_value):
+                change = replace(
+                    change, resource_name=resource_name, new_value=new_value
+                )
+            self.changes.append(change)
+
+    @classmethod
+    def merge(cls, plans: Iterable["MutationPlan"]) -> "MutationPlan":
+        """Combines plans built independently, e.g. one per account."""
+        merged = cls()
+        for plan in plans:
+            merged.extend(plan)
+        return merged
+
+    def summary(self) -> Dict[str, int]:
+        """Returns the number of changes per "action resource_type.field"."""
+        return dict(
+            Counter(
+                f"{change.action} {change.resource_type}.{change.field}"
+                for change in self.changes
+            )
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"changes": [asdict(change) for change in self.changes]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MutationPlan":
+        return cls(changes=[Change(**change) for change in data.get("changes", [])])
+
+    def save(self, path: Path):
+        """Writes the plan to a JSON file."""
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path: Path) -> "MutationPlan":
+        """Reads a plan written by `save`."""
+        with open(path, "r") as f:
+            return cls.from_dict(json.load(f))
+
+
+def set_field(message, path: str, value: Any):
+    """Sets a dotted field path such as "maximize_clicks.cpc_bid_limit_micros"."""
+    *parents, name = path.split(".")
+    for parent in parents:
+        message = getattr(message, parent)
+    setattr(message, name, value)
+
+
+def _operation_type(resource_type: str) -> str:
+    """Maps "ad_group_criterion" to "AdGroupCriterionOperation"."""
+    return "".join(part.title() for part in resource_type.split("_")) + "Operation"
+
+
+def _group_changes(
+    changes: Iterable[Change],
+) -> Dict[Tuple[str, str, str], Dict[str, Any]]:
+    """Groups field changes per entity, keeping the order entities first appear in."""
+    grouped: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+    for change in changes:
+        key = (change.action, change.resource_type, change.resource_name)
+        grouped.setdefault(key, {})[change.field] = change.new_value
+    return grouped
+
+
+def _dependency_units(
+    grouped: Dict[Tuple[str, str, str], Dict[str, Any]]
+) -> List[List[Tuple[str, str, str]]]:
+    """
+    Splits entity keys into units that must be sent in the same request.
+
+    Operations creating or referencing the same temporary resource name are
+    joined into one unit, in plan order; every other operation is a unit of
+    its own. Units are returned in the order they first appear.
+    """
+    units: List[List[Tuple[str, str, str]]] = []
+    unit_names: List[Set[str]] = []
+    unit_of_name: Dict[str, int] = {}
+    for key, fields in grouped.items():
+        names = {
+            value for value in (key[2], *fields.values()) if _temp_id(value) is not None
+        }
+        linked = sorted({unit_of_name[name] for name in names if name in unit_of_name})
+        if linked:
+            index = linked[0]
+            for other in linked[1:]:
+                units[index].extend(units[other])
+                for name in unit_names[other]:
+                    unit_of_name[name] = index
+                unit_names[index] |= unit_names[other]
+                units[other], unit_names[other] = [], set()
+        else:
+            index = len(units)
+            units.append([])
+            unit_names.append(set())
+        units[index].append(key)
+        unit_names[index] |= names
+        for name in names:
+            unit_of_name[name] = index
+    return [unit for unit in units if unit]
+
+
+def _chunk_units(
+    units: List[List[Tuple[str, str, str]]], chunk_size: int
+) -> List[List[Tuple[str, str, str]]]:
+    """
+    Packs units into chunks of up to `chunk_size` keys without splitting a
+    unit; a unit larger than `chunk_size` is sent as a chunk of its own.
+    """
+    chunks: List[List[Tuple[str, str, str]]] = []
+    current: List[Tuple[str, str, str]] = []
+    for unit in units:
+        if current and len(current) + len(unit) > chunk_size:
+            chunks.append(current)
+            current = []
+        current.extend(unit)
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _build_mutate_operation(
+    client, factory: OperationFactory, key: Tuple[str, str, str], fields: Dict
+):
+    action, resource_type, resource_name = key
+    operation_type = _operation_type(resource_type)
+    if action == ACTION_UPDATE:
+        operation = factory.update(operation_type, list(fields))
+    else:
+        operation = factory.create(operation_type)
+
+    message = getattr(operation, action)
+    message.resource_name = resource_name
+    for path, value in fields.items():
+        set_field(message, path, value)
+
+    mutate_operation = factory.create("MutateOperation")
+    client.copy_from(getattr(mutate_operation, f"{resource_type}_operation"), operation)
+    return mutate_operation
+
+
+def _journal_entries(
+    changes: Iterable[Change],
+) -> Dict[Tuple[str, str, str], List[Tuple[str, str, float]]]:
+    """Maps each entity key to the (journal key, action, delta) entries of its changes."""
+    entries: Dict[Tuple[str, str, str], List[Tuple[str, str, float]]] = {}
+    for change in changes:
+        if change.journal_action is None:
+            continue
+        key = (change.action, change.resource_type, change.resource_name)
+        entry = (
+            change.journal_key or change.resource_name,
+            change.journal_action,
+            change.journal_delta,
+        )
+        if entry not in entries.setdefault(key, []):
+            entries[key].append(entry)
+    return entries
+
+
+def _record_journal(
+    journal: ActionJournal,
+    entries: Iterable[Tuple[str, str, float]],
+    journaled: Set[Tuple[str, str]],
+):
+    """
+    Records journal entries not yet recorded by this apply, batched per
+    action and delta. Each (journal key, action) is recorded once, so an
+    ad group whose keyword bids span several requests is raised only once.
+    """
+    batches: Dict[Tuple[str, float], List[str]] = {}
+    for journal_key, action, delta in entries:
+        if (journal_key, action) in journaled:
+            continue
+        journaled.add((journal_key, action))
+        batches.setdefault((action, delta), []).append(journal_key)
+    for (action, delta), keys in batches.items():
+        journal.record(keys, action, delta)
+
+
+def _result_resource_name(response) -> str:
+    result = type(response).pb(response).WhichOneof("response")
+    return getattr(response, result).resource_name if result else ""
+
+
+def apply_plan(
+    client,
+    plan: MutationPlan,
+    chunk_size: int = DEFAULT_APPLY_CHUNK_SIZE,
+    throttle_seconds: float = 0.0,
+    validate_only: bool = False,
+    operations: Optional[OperationFactory] = None,
+    journal: Optional[ActionJournal] = None,
+) -> List[str]:
+    """
+    Pushes a plan to the API with GoogleAdsService.Mutate.
+
+    Changes to the same entity are merged into one operation, and all
+    operations for a customer are sent in requests of up to `chunk_size`,
+    in plan order. Operations creating or referencing the same temporary
+    (negative) ID are never split across requests, so the API can resolve
+    them; such a group larger than `chunk_size` is sent in one request.
+
+    With an ActionJournal, the journal entries of each request's changes are
+    recorded as soon as that request succeeds, so a failure part-way through
+    leaves every earlier request journaled.
+
+    Args:
+        client: An initialized Google Ads API client.
+        plan: The MutationPlan to apply.
+        chunk_size: The number of operations per mutate request.
+        throttle_seconds: Delay between consecutive mutate requests.
+        validate_only: Validate the operations without applying them.
+        operations: Optional OperationFactory to reuse cached templates.
+        journal: Optional ActionJournal to record applied changes in. Nothing
+            is recorded when `validate_only` is set.
+
+    Returns:
+        The resource names returned by the API, in the order sent.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+    if not plan.changes:
+        logger.info("Mutation plan is empty; nothing to apply.")
+        return []
+
+    factory = operations or OperationFactory(client)
+    google_ads_service = client.get_service("GoogleAdsService")
+
+    changes_by_customer: Dict[str, List[Change]] = {}
+    for change in plan.changes:
+        changes_by_customer.setdefault(change.customer_id, []).append(change)
+
+    resource_names: List[str] = []
+    requests_sent = 0
+    journaled: Set[Tuple[str, str]] = set()
+    for customer_id, changes in changes_by_customer.items():
+        grouped = _group_changes(changes)
+        journal_entries = _journal_entries(changes)
+        for chunk in _chunk_units(_dependency_units(grouped), chunk_size):
+            if requests_sent and throttle_seconds > 0:
+                time.sleep(throttle_seconds)
+            request = client.get_type("MutateGoogleAdsRequest")
+            request.customer_id = customer_id
+            request.mutate_operations.extend(
+                _build_mutate_operation(client, factory, key, grouped[key])
+                for key in chunk
+            )
+            request.validate_only = validate_only
+            response = google_ads_service.mutate(request=request)
+            requests_sent += 1
+            resource_names.extend(
+                _result_resource_name(result)
+                for result in response.mutate_operation_responses
+            )
+            if journal is not None and not validate_only:
+                _record_journal(
+                    journal,
+                    (entry for key in chunk for entry in journal_entries.get(key, [])),
+                    journaled,
+                )
+        logger.info(
+            f"Applied {len(grouped)} operations for customer {customer_id}"
+            f"{' (validate only)' if validate_only else ''}."
+        )
+
+    return resource_names
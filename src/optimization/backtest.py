@@ -0,0 +1,255 @@
+# src/optimization/backtest.py
+
+"""
+Historical backtesting for the budget scaler and persona rules.
+
+Replays stored daily metrics day by day and applies the GoldenRatioScaler
+budget logic, the PersonaOptimizer pause rules and bid increases in
+simulation. Every rule variant in a parameter grid is simulated at once:
+state arrays have shape (variants, campaigns) or (variants, ad_groups), so
+only the loop over days runs in Python.
+
+Simulation model: spend scales linearly with the simulated budget (or bid
+multiplier) relative to what was observed, capped by the budget, and
+conversions scale with spend at the observed cost per conversion.
+"""
+
+import itertools
+from dataclasses import dataclass, fields
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from src.budget.golden_ratio_scaler import (
+    AGGRESSIVE_SCALE_UP,
+    GOLDEN_RATIO_SCALE_UP,
+    MAINTAIN_FACTOR,
+    MAX_DAILY_BUDGET_MICROS,
+    MAX_DAILY_CHANGE_PERCENTAGE,
+    PAUSE_FACTOR,
+)
+
+# PersonaOptimizer thresholds
+ZERO_CONVERSION_CUTOFF_MICROS = 2000 * 1_000_000
+MIN_WINNING_CONVERSIONS = 5
+BID_INCREASE_PERCENTAGE = 0.20
+
+
+@dataclass(frozen=True)
+class ScalerVariant:
+    """One set of budget scaling parameters; defaults match GoldenRatioScaler."""
+
+    pause_below: float = 1.0
+    maintain_below: float = 3.0
+    golden_below: float = 4.0
+    golden_factor: float = GOLDEN_RATIO_SCALE_UP
+    aggressive_factor: float = AGGRESSIVE_SCALE_UP
+    max_daily_change: float = MAX_DAILY_CHANGE_PERCENTAGE
+    max_daily_budget_micros: float = MAX_DAILY_BUDGET_MICROS
+
+
+@dataclass(frozen=True)
+class PersonaRuleVariant:
+    """One set of persona rule parameters; defaults match PersonaOptimizer."""
+
+    zero_conversion_cutoff_micros: float = ZERO_CONVERSION_CUTOFF_MICROS
+    min_winning_conversions: float = MIN_WINNING_CONVERSIONS
+    bid_increase_percentage: float = BID_INCREASE_PERCENTAGE
+    max_bid_multiplier: float = 2.0
+
+
+@dataclass
+class BacktestResult:
+    """Per-variant outcomes of a backtest, one element per variant."""
+
+    total_spend_micros: np.ndarray
+    total_conversions: np.ndarray
+    cost_per_conversion_micros: np.ndarray
+    paused_count: np.ndarray
+    final_state: np.ndarray
+
+    def best(self, by: str = "cost_per_conversion_micros") -> int:
+        """Returns the index of the best variant (lowest value of `by`)."""
+        return int(np.nanargmin(getattr(self, by)))
+
+
+def make_grid(variant_cls, **param_values: Sequence[float]) -> List:
+    """
+    Builds every combination of the given parameter values.
+
+    Example:
+        make_grid(ScalerVariant, max_daily_change=[0.1, 0.2], golden_below=[4, 5])
+    """
+    names = list(param_values)
+    return [
+        variant_cls(**dict(zip(names, combo)))
+        for combo in itertools.product(*(param_values[name] for name in names))
+    ]
+
+
+def _stack(variants: Sequence, cls) -> Dict[str, np.ndarray]:
+    """Turns a list of variants into (V, 1) parameter columns."""
+    return {
+        f.name: np.array([getattr(v, f.name) for v in variants], dtype=np.float64)[
+            :, None
+        ]
+        for f in fields(cls)
+    }
+
+
+def _summarise(spend, conversions, paused, state) -> BacktestResult:
+    total_spend = spend.sum(axis=1)
+    total_conversions = conversions.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cpa = np.where(total_conversions > 0, total_spend / total_conversions, np.nan)
+    return BacktestResult(
+        total_spend_micros=total_spend,
+        total_conversions=total_conversions,
+        cost_per_conversion_micros=cpa,
+        paused_count=paused.sum(axis=1),
+        final_state=state,
+    )
+
+
+def backtest_budget_scaling(
+    observed_budgets_micros,
+    observed_spend_micros,
+    observed_conversions,
+    avg_ltv,
+    variants: Sequence[ScalerVariant] = (ScalerVariant(),),
+    warmup_days: int = 7,
+) -> BacktestResult:
+    """
+    Replays daily campaign metrics under each budget scaling variant.
+
+    From day `warmup_days` on, each campaign's budget for the next day is
+    decided from its cumulative simulated spend and conversions with the
+    `GoldenRatioScaler.calculate_new_budget` logic, using that variant's
+    thresholds, factors and limits.
+
+    Args:
+        observed_budgets_micros: (days, campaigns) daily budgets actually set.
+        observed_spend_micros: (days, campaigns) daily spend.
+        observed_conversions: (days, campaigns) daily conversions.
+        avg_ltv: Average customer LTV (scalar or per campaign).
+        variants: The scaler variants to simulate.
+        warmup_days: Days of data collected before the first decision.
+
+    Returns:
+        A BacktestResult; `final_state` holds the (variants, campaigns) budgets.
+    """
+    budgets_obs = np.asarray(observed_budgets_micros, dtype=np.float64)
+    spend_obs = np.asarray(observed_spend_micros, dtype=np.float64)
+    conv_obs = np.asarray(observed_conversions, dtype=np.float64)
+    avg_ltv = np.asarray(avg_ltv, dtype=np.float64)
+    days, campaigns = budgets_obs.shape
+    p = _stack(variants, ScalerVariant)
+
+    budgets = np.broadcast_to(budgets_obs[0], (len(variants), campaigns)).copy()
+    cum_spend = np.zeros_like(budgets)
+    cum_conv = np.zeros_like(budgets)
+
+    for day in range(days):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = np.where(budgets_obs[day] > 0, budgets / budgets_obs[day], 0.0)
+            cpa = np.where(conv_obs[day] > 0, spend_obs[day] / conv_obs[day], np.inf)
+        spend = np.minimum(spend_obs[day] * scale, budgets)
+        cum_spend += spend
+        cum_conv += np.where(np.isfinite(cpa), spend / cpa, 0.0)
+
+        if day + 1 < warmup_days:
+            continue
+
+        # Same edge cases as calculate_ltv_cac_ratio: 0 without conversions,
+        # inf without spend.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cac = (cum_spend / 1_000_000) / cum_conv
+            ltv_cac = np.select(
+                [cum_conv == 0, cac == 0], [0.0, np.inf], default=avg_ltv / cac
+            )
+        factor = np.select(
+            [
+                ltv_cac < p["pause_below"],
+                ltv_cac < p["maintain_below"],
+                ltv_cac < p["golden_below"],
+            ],
+            [
+                np.full_like(budgets, PAUSE_FACTOR),
+                np.full_like(budgets, MAINTAIN_FACTOR),
+                np.broadcast_to(p["golden_factor"], budgets.shape),
+            ],
+            default=np.broadcast_to(p["aggressive_factor"], budgets.shape),
+        )
+        max_change = budgets * p["max_daily_change"]
+        new_budgets = np.clip(
+            budgets * factor, budgets - max_change, budgets + max_change
+        )
+        new_budgets = np.minimum(new_budgets, p["max_daily_budget_micros"])
+        budgets = np.where(factor == PAUSE_FACTOR, 0.0, np.ceil(new_budgets))
+
+    return _summarise(cum_spend, cum_conv, budgets == 0, budgets)
+
+
+def backtest_persona_rules(
+    observed_cost_micros,
+    observed_conversions,
+    target_cpa_micros,
+    variants: Sequence[PersonaRuleVariant] = (PersonaRuleVariant(),),
+) -> BacktestResult:
+    """
+    Replays daily ad group metrics under each persona rule variant.
+
+    At the end of each day, ad groups that `identify_losing_personas` would
+    flag (CPA above target, or no conversions after the spend cutoff) are
+    paused for the rest of the period, and those `identify_winning_personas`
+    would flag (CPA below target with enough conversions) get their bid
+    multiplier raised, up to `max_bid_multiplier`.
+
+    Args:
+        observed_cost_micros: (days, ad_groups) daily cost.
+        observed_conversions: (days, ad_groups) daily conversions.
+        target_cpa_micros: The campaign target CPA (scalar or per ad group).
+        variants: The persona rule variants to simulate.
+
+    Returns:
+        A BacktestResult; `final_state` holds the (variants, ad_groups) bid
+        multipliers, with 0 for paused ad groups.
+    """
+    cost_obs = np.asarray(observed_cost_micros, dtype=np.float64)
+    conv_obs = np.asarray(observed_conversions, dtype=np.float64)
+    target_cpa = np.asarray(target_cpa_micros, dtype=np.float64)
+    days, ad_groups = cost_obs.shape
+    p = _stack(variants, PersonaRuleVariant)
+
+    shape = (len(variants), ad_groups)
+    multiplier = np.ones(shape)
+    active = np.ones(shape, dtype=bool)
+    cum_cost = np.zeros(shape)
+    cum_conv = np.zeros(shape)
+
+    for day in range(days):
+        day_cost = np.where(active, cost_obs[day] * multiplier, 0.0)
+        cum_cost += day_cost
+        cum_conv += np.where(active, conv_obs[day] * multiplier, 0.0)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cpa = np.where(cum_conv > 0, cum_cost / cum_conv, 0.0)
+        losing = ((target_cpa > 0) & (cpa > target_cpa)) | (
+            (cum_conv == 0) & (cum_cost > p["zero_conversion_cutoff_micros"])
+        )
+        winning = (
+            (target_cpa > 0)
+            & (cpa < target_cpa)
+            & (cum_conv >= p["min_winning_conversions"])
+        )
+        active &= ~losing
+        multiplier = np.where(
+            active & winning,
+            np.minimum(
+                multiplier * (1 + p["bid_increase_percentage"]),
+                p["max_bid_multiplier"],
+            ),
+            multiplier,
+        )
+
+    return _summarise(cum_cost, cum_conv, ~active, np.where(active, multiplier, 0.0))
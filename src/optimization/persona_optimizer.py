@@ -1,7 +1,12 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional
 import logging
+from functools import partial
 
 from src.config.google_ads_client import get_google_ads_client
+from src.monitoring.snapshots import SnapshotStore
+from src.mutations.journal import ACTION_INCREASE_BID, ACTION_PAUSE, ActionJournal
+from src.mutations.operation_factory import OperationFactory
+from src.mutations.plan import MutationPlan
 from src.reporting.query_builder import QueryBuilder, ReportType
 
 # Configure logging
@@ -15,10 +20,11 @@ class PersonaOptimizer:
     A class to handle persona (ad group) optimization logic.
     """
 
-    def __init__(self):
-        self.client = get_google_ads_client()
+    def __init__(self, client=None):
+        self.client = client if client is not None else get_google_ads_client()
         self.google_ads_service = self.client.get_service("GoogleAdsService")
         self.query_builder = QueryBuilder()
+        self.operations = OperationFactory(self.client)
 
     def _get_campaign_details(
         self, customer_id: str, campaign_id: str
@@ -74,15 +80,71 @@ class PersonaOptimizer:
                 )
         return ad_group_performance
 
-    def identify_losing_personas(self, customer_id: str, campaign_id: str) -> List[str]:
+    @staticmethod
+    def _filter_changed(
+        snapshots: SnapshotStore,
+        namespace: str,
+        ad_groups: List[Dict[str, Any]],
+        target_cpa: int,
+    ):
+        """Keeps only ad groups whose rule inputs changed since the last run."""
+        inputs = {
+            str(ad_group["ad_group_id"]): (
+                ad_group["cost_micros"],
+                ad_group["conversions"],
+                ad_group["cost_per_conversion"],
+                target_cpa,
+            )
+            for ad_group in ad_groups
+        }
+        changed = snapshots.diff(namespace, inputs)
+        logging.info(
+            f"{len(changed)} of {len(ad_groups)} ad groups changed since last run ({namespace})."
+        )
+        filtered = [ag for ag in ad_groups if str(ag["ad_group_id"]) in changed]
+        return filtered, inputs, changed
+
+    @staticmethod
+    def _commit_evaluated(
+        snapshots: SnapshotStore,
+        namespace: str,
+        inputs: Dict[str, tuple],
+        changed: set,
+        flagged: List[str],
+    ):
+        """
+        Commits the changed ad groups that need no action and stages the
+        flagged ones until their mutate succeeds.
+        """
+        flagged_keys = {str(ad_group_id) for ad_group_id in flagged}
+        snapshots.commit(namespace, inputs, changed - flagged_keys)
+        snapshots.stage(namespace, inputs, flagged_keys)
+
+    def identify_losing_personas(
+        self,
+        customer_id: str,
+        campaign_id: str,
+        snapshots: Optional[SnapshotStore] = None,
+    ) -> List[str]:
         """
         Identifies ad groups that are performing poorly based on specific criteria.
+
+        When a SnapshotStore is given, only ad groups whose metrics or the
+        campaign's target CPA changed since the last evaluation are considered.
+        The returned ad groups are only staged in the store; pass it to
+        `pause_ad_groups` to commit them once they are paused.
         """
         campaign_details = self._get_campaign_details(customer_id, campaign_id)
         target_cpa = campaign_details.get("target_cpa_micros", 0)
         ad_groups = self._get_ad_group_performance(customer_id, campaign_id)
         losing_ad_groups = []
 
+        if snapshots is not None:
+            namespace = f"losing:{customer_id}"
+            ad_groups, inputs, changed = self._filter_changed(
+                snapshots, namespace, ad_groups, target_cpa
+            )
+
         for ad_group in ad_groups:
             is_losing = False
             # Criteria 1: cost_per_conversion > target_cpa
@@ -101,13 +163,26 @@ class PersonaOptimizer:
                     f"Identified losing ad group {ad_group['ad_group_id']} (Cost: {ad_group['cost_micros']}, Conversions: {ad_group['conversions']}, CPA: {ad_group['cost_per_conversion']})"
                 )
 
+        if snapshots is not None:
+            self._commit_evaluated(
+                snapshots, namespace, inputs, changed, losing_ad_groups
+            )
         return losing_ad_groups
 
     def identify_winning_personas(
-        self, customer_id: str, campaign_id: str
+        self,
+        customer_id: str,
+        campaign_id: str,
+        snapshots: Optional[SnapshotStore] = None,
     ) -> List[str]:
         """
         Identifies ad groups that are performing well based on specific criteria.
+
+        When a SnapshotStore is given, only ad groups whose metrics or the
+        campaign's target CPA changed since the last evaluation are considered,
+        so unchanged winners do not receive repeated bid increases. The
+        returned ad groups are only staged in the store; pass it to
+        `increase_bids_bulk` to commit them once their bids are raised.
         """
         campaign_details = self._get_campaign_details(customer_id, campaign_id)
         target_cpa = campaign_details.get("target_cpa_micros", 0)
@@ -120,6 +195,12 @@ class PersonaOptimizer:
             )
             return []
 
+        if snapshots is not None:
+            namespace = f"winning:{customer_id}"
+            ad_groups, inputs, changed = self._filter_changed(
+                snapshots, namespace, ad_groups, target_cpa
+            )
+
         for ad_group in ad_groups:
             # Criteria: cost_per_conversion < target_cpa AND conversions >= 5
             if (
@@ -131,37 +212,158 @@ class PersonaOptimizer:
                     f"Identified winning ad group {ad_group['ad_group_id']} (Cost: {ad_group['cost_micros']}, Conversions: {ad_group['conversions']}, CPA: {ad_group['cost_per_conversion']})"
                 )
 
+        if snapshots is not None:
+            self._commit_evaluated(
+                snapshots, namespace, inputs, changed, winning_ad_groups
+            )
         return winning_ad_groups
 
-    def pause_ad_group(self, customer_id: str, ad_group_id: str):
-        """
-        Pauses a given ad group.
-        """
-        ad_group_service = self.client.get_service("AdGroupService")
-        ad_group_resource_name = ad_group_service.ad_group_path(
+    def _build_pause_ad_group_operation(
+        self, ad_group_service, customer_id: str, ad_group_id: str
+    ):
+        ad_group_operation = self.operations.update("AdGroupOperation", ["status"])
+
+        ad_group = ad_group_operation.update
+        ad_group.resource_name = ad_group_service.ad_group_path(
             customer_id, ad_group_id
         )
+        ad_group.status = self.client.get_type("AdGroupStatusEnum").AdGroupStatus.PAUSED
+        return ad_group_operation
 
-        ad_group_operation = self.client.get_type("AdGroupOperation")
+    @staticmethod
+    def _ad_group_key(customer_id: str, ad_group_id) -> str:
+        return f"customers/{customer_id}/adGroups/{ad_group_id}"
 
-        ad_group = ad_group_operation.update
-        ad_group.resource_name = ad_group_resource_name
-        ad_group.status = self.client.get_type("AdGroupStatusEnum").AdGroupStatus.PAUSED
+    @staticmethod
+    def _campaign_key(customer_id: str, campaign_id) -> str:
+        return f"customers/{customer_id}/campaigns/{campaign_id}"
 
-        self.client.copy_from(
-            ad_group_operation.update_mask,
-            self.client.get_type("FieldMask", paths=["status"]),
+    def pause_ad_group(
+        self,
+        customer_id: str,
+        ad_group_id: str,
+        journal: Optional[ActionJournal] = None,
+    ):
+        """
+        Pauses a given ad group.
+
+        With an ActionJournal, an ad group already paused today is skipped.
+        """
+        key = self._ad_group_key(customer_id, ad_group_id)
+        if journal is not None and journal.has_action(key, ACTION_PAUSE):
+            logging.info(f"Ad group {ad_group_id} already paused today; skipping.")
+            return
+
+        ad_group_service = self.client.get_service("AdGroupService")
+        ad_group_operation = self._build_pause_ad_group_operation(
+            ad_group_service, customer_id, ad_group_id
         )
+        ad_group_resource_name = ad_group_operation.update.resource_name
 
         try:
             ad_group_service.mutate_ad_groups(
                 customer_id=customer_id, operations=[ad_group_operation]
             )
             logging.info(f"Ad group {ad_group_resource_name} paused successfully.")
+            if journal is not None:
+                journal.record([key], ACTION_PAUSE)
         except Exception as e:
             logging.error(f"Failed to pause ad group {ad_group_resource_name}: {e}")
             raise
 
+    def pause_ad_groups(
+        self,
+        customer_id: str,
+        ad_group_ids: List[str],
+        journal: Optional[ActionJournal] = None,
+        snapshots: Optional[SnapshotStore] = None,
+    ):
+        """
+        Pauses several ad groups with a single mutate_ad_groups request.
+
+        With an ActionJournal, ad groups already paused today are skipped.
+        With the SnapshotStore they were identified with, their staged
+        snapshots are committed once the pause succeeds.
+        """
+        ad_group_ids = [str(ad_group_id) for ad_group_id in dict.fromkeys(ad_group_ids)]
+        identified = list(ad_group_ids)
+        if journal is not None:
+            pending = set(
+                journal.pending(
+                    (self._ad_group_key(customer_id, i) for i in ad_group_ids),
+                    ACTION_PAUSE,
+                )
+            )
+            ad_group_ids = [
+                i for i in ad_group_ids if self._ad_group_key(customer_id, i) in pending
+            ]
+        if not ad_group_ids:
+            logging.info("No ad groups to pause.")
+            if snapshots is not None:
+                snapshots.commit_staged(f"losing:{customer_id}", identified)
+            return
+
+        ad_group_service = self.client.get_service("AdGroupService")
+        operations = [
+            self._build_pause_ad_group_operation(
+                ad_group_service, customer_id, ad_group_id
+            )
+            for ad_group_id in ad_group_ids
+        ]
+
+        try:
+            ad_group_service.mutate_ad_groups(
+                customer_id=customer_id, operations=operations
+            )
+            logging.info(f"Paused {len(operations)} ad groups successfully.")
+            if journal is not None:
+                journal.record(
+                    (self._ad_group_key(customer_id, i) for i in ad_group_ids),
+                    ACTION_PAUSE,
+                )
+        except Exception as e:
+            logging.error(f"Failed to pause ad groups {list(ad_group_ids)}: {e}")
+            raise
+        if snapshots is not None:
+            snapshots.commit_staged(f"losing:{customer_id}", identified)
+
+    def plan_pause_ad_groups(
+        self,
+        customer_id: str,
+        ad_group_ids: List[str],
+        plan: Optional[MutationPlan] = None,
+        journal: Optional[ActionJournal] = None,
+    ) -> MutationPlan:
+        """
+        Plans pausing several ad groups without calling the API.
+
+        Args:
+            customer_id: The ID of the Google Ads customer.
+            ad_group_ids: The ad groups to pause.
+            plan: Optional MutationPlan to add the changes to.
+            journal: Optional ActionJournal. When given, ad groups already
+                paused today are left out of the plan.
+
+        Returns:
+            The MutationPlan; apply it with `apply_plan`.
+        """
+        plan = plan if plan is not None else MutationPlan()
+        ad_group_service = self.client.get_service("AdGroupService")
+        for ad_group_id in dict.fromkeys(ad_group_ids):
+            key = self._ad_group_key(customer_id, ad_group_id)
+            if journal is not None and journal.has_action(key, ACTION_PAUSE):
+                continue
+            plan.add(
+                customer_id,
+                "ad_group",
+                ad_group_service.ad_group_path(customer_id, str(ad_group_id)),
+                "status",
+                "PAUSED",
+                journal_key=key,
+                journal_action=ACTION_PAUSE,
+            )
+        return plan
+
     def _get_ad_group_details(
         self, customer_id: str, ad_group_id: str
     ) -> Dict[str, Any]:
@@ -190,8 +392,13 @@ class PersonaOptimizer:
 
     def _update_keyword_bids(
         self, customer_id: str, ad_group_id: str, percentage: float
-    ):
-        """Increases CPC bid for all keywords in an ad group by a percentage."""
+    ) -> int:
+        """
+        Increases CPC bid for all keywords in an ad group by a percentage.
+
+        Returns:
+            The number of keywords updated (0 if no mutate was sent).
+        """
         ad_group_criterion_service = self.client.get_service("AdGroupCriterionService")
 
         query = f"""
@@ -214,22 +421,19 @@ class PersonaOptimizer:
                 if criterion.cpc_bid_micros:
                     new_bid = int(criterion.cpc_bid_micros * (1 + percentage))
 
-                    operation = self.client.get_type("AdGroupCriterionOperation")
+                    operation = self.operations.update(
+                        "AdGroupCriterionOperation", ["cpc_bid_micros"]
+                    )
                     update_criterion = operation.update
                     update_criterion.resource_name = criterion.resource_name
                     update_criterion.cpc_bid_micros = new_bid
-
-                    self.client.copy_from(
-                        operation.update_mask,
-                        self.client.get_type("FieldMask", paths=["cpc_bid_micros"]),
-                    )
                     operations.append(operation)
 
         if not operations:
             logging.warning(
                 f"No keywords with existing bids found to update for ad group {ad_group_id}."
             )
-            return
+            return 0
 
         try:
             ad_group_criterion_service.mutate_ad_group_criteria(
@@ -238,17 +442,39 @@ class PersonaOptimizer:
             logging.info(
                 f"Successfully increased bids by {percentage:.2%} for {len(operations)} keywords in ad group {ad_group_id}."
             )
+            return len(operations)
         except Exception as e:
             logging.error(
                 f"Failed to update keyword bids for ad group {ad_group_id}: {e}"
             )
             raise
 
+    @staticmethod
+    def _allowed_increase(
+        journal: Optional[ActionJournal], key: str, percentage: float
+    ) -> float:
+        """Caps `percentage` by the journal's remaining daily allowance for `key`."""
+        if journal is None:
+            return percentage
+        allowed = journal.allowed_increase(key, percentage)
+        if allowed < percentage:
+            logging.info(
+                f"Capping bid increase for {key} at {allowed:.2%} (already raised today)."
+            )
+        return allowed
+
     def increase_bids(
-        self, customer_id: str, ad_group_id: str, percentage: float = 0.20
+        self,
+        customer_id: str,
+        ad_group_id: str,
+        percentage: float = 0.20,
+        journal: Optional[ActionJournal] = None,
     ):
         """
         Increases bids for a given ad group, depending on the campaign's bidding strategy.
+
+        With an ActionJournal, increases are capped so that repeated runs on
+        the same day do not compound beyond the journal's daily maximum.
         """
         ad_group_details = self._get_ad_group_details(customer_id, ad_group_id)
         if not ad_group_details:
@@ -264,7 +490,13 @@ class PersonaOptimizer:
             logging.info(
                 f"Bidding strategy is Manual CPC. Increasing keyword bids for ad group {ad_group_id}."
             )
-            self._update_keyword_bids(customer_id, ad_group_id, percentage)
+            key = self._ad_group_key(customer_id, ad_group_id)
+            percentage = self._allowed_increase(journal, key, percentage)
+            if percentage <= 0:
+                return
+            updated = self._update_keyword_bids(customer_id, ad_group_id, percentage)
+            if updated and journal is not None:
+                journal.record([key], ACTION_INCREASE_BID, percentage)
         elif bidding_strategy == bidding_strategy_enum.MAXIMIZE_CLICKS:
             campaign_id = ad_group_details["campaign_id"]
             current_limit = ad_group_details["cpc_bid_limit_micros"]
@@ -275,10 +507,16 @@ class PersonaOptimizer:
                 )
                 return
 
+            key = self._campaign_key(customer_id, campaign_id)
+            percentage = self._allowed_increase(journal, key, percentage)
+            if percentage <= 0:
+                return
             new_limit = int(current_limit * (1 + percentage))
 
             campaign_service = self.client.get_service("CampaignService")
-            campaign_operation = self.client.get_type("CampaignOperation")
+            campaign_operation = self.operations.update(
+                "CampaignOperation", ["maximize_clicks.cpc_bid_limit_micros"]
+            )
 
             campaign = campaign_operation.update
             campaign.resource_name = campaign_service.campaign_path(
@@ -286,13 +524,6 @@ class PersonaOptimizer:
             )
             campaign.maximize_clicks.cpc_bid_limit_micros = new_limit
 
-            self.client.copy_from(
-                campaign_operation.update_mask,
-                self.client.get_type(
-                    "FieldMask", paths=["maximize_clicks.cpc_bid_limit_micros"]
-                ),
-            )
-
             try:
                 campaign_service.mutate_campaigns(
                     customer_id=customer_id, operations=[campaign_operation]
@@ -300,6 +531,8 @@ class PersonaOptimizer:
                 logging.info(
                     f"Successfully increased Maximize Clicks bid cap to {new_limit} for campaign {campaign_id}."
                 )
+                if journal is not None:
+                    journal.record([key], ACTION_INCREASE_BID, percentage)
             except Exception as e:
                 logging.error(
                     f"Failed to increase bid cap for campaign {campaign_id}: {e}"
@@ -314,3 +547,361 @@ class PersonaOptimizer:
             )
         else:
             logging.warning(f"Unhandled bidding strategy: {bidding_strategy.name}")
+
+    def _get_ad_group_details_bulk(
+        self, customer_id: str, ad_group_ids: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetches details for several ad groups with one `IN` query, keyed by ad group ID."""
+        id_list = ", ".join(str(ad_group_id) for ad_group_id in ad_group_ids)
+        query = f"""
+            SELECT
+                ad_group.id,
+                ad_group.name,
+                campaign.id,
+                campaign.bidding_strategy_type,
+                campaign.maximize_clicks.cpc_bid_limit_micros
+            FROM ad_group
+            WHERE ad_group.id IN ({id_list})
+        """
+        response = self.google_ads_service.search_stream(
+            customer_id=customer_id, query=query
+        )
+        details = {}
+        for batch in response:
+            for row in batch.results:
+                details[str(row.ad_group.id)] = {
+                    "campaign_id": row.campaign.id,
+                    "bidding_strategy_type": row.campaign.bidding_strategy_type,
+                    "cpc_bid_limit_micros": row.campaign.maximize_clicks.cpc_bid_limit_micros,
+                }
+        return details
+
+    def _iter_keyword_bids_bulk(self, customer_id: str, ad_group_ids: List[str]):
+        """Yields enabled keyword rows (with campaign ID and CPC bid) for several ad groups."""
+        id_list = ", ".join(str(ad_group_id) for ad_group_id in ad_group_ids)
+        query = f"""
+            SELECT
+                campaign.id,
+                ad_group.id,
+                ad_group_criterion.resource_name,
+                ad_group_criterion.cpc_bid_micros
+            FROM ad_group_criterion
+            WHERE ad_group.id IN ({id_list})
+            AND ad_group_criterion.type = 'KEYWORD'
+            AND ad_group_criterion.status = 'ENABLED'
+        """
+        response = self.google_ads_service.search_stream(
+            customer_id=customer_id, query=query
+        )
+        for batch in response:
+            for row in batch.results:
+                if row.ad_group_criterion.cpc_bid_micros:
+                    yield row
+
+    def _update_keyword_bids_bulk(
+        self,
+        customer_id: str,
+        ad_group_ids: List[str],
+        percentage: float,
+        on_updated: Optional[Callable[[List[str]], None]] = None,
+    ) -> List[str]:
+        """
+        Increases keyword CPC bids for several ad groups, one mutate per campaign.
+
+        Args:
+            on_updated: Optional callback receiving the IDs of the ad groups of
+                each campaign right after its mutate succeeds, so they can be
+                journaled even if a later campaign fails.
+
+        Returns:
+            The IDs of the ad groups whose keyword bids were updated.
+        """
+        ad_group_criterion_service = self.client.get_service("AdGroupCriterionService")
+
+        operations_by_campaign: Dict[Any, List[Any]] = {}
+        ad_groups_by_campaign: Dict[Any, List[str]] = {}
+        for row in self._iter_keyword_bids_bulk(customer_id, ad_group_ids):
+            criterion = row.ad_group_criterion
+            operation = self.operations.update(
+                "AdGroupCriterionOperation", ["cpc_bid_micros"]
+            )
+            update_criterion = operation.update
+            update_criterion.resource_name = criterion.resource_name
+            update_criterion.cpc_bid_micros = int(
+                criterion.cpc_bid_micros * (1 + percentage)
+            )
+            operations_by_campaign.setdefault(row.campaign.id, []).append(operation)
+            ad_groups_by_campaign.setdefault(row.campaign.id, []).append(
+                str(row.ad_group.id)
+            )
+
+        if not operations_by_campaign:
+            logging.warning(
+                f"No keywords with existing bids found to update for ad groups {list(ad_group_ids)}."
+            )
+            return []
+
+        updated: List[str] = []
+        for campaign_id, operations in operations_by_campaign.items():
+            try:
+                ad_group_criterion_service.mutate_ad_group_criteria(
+                    customer_id=customer_id, operations=operations
+                )
+                logging.info(
+                    f"Successfully increased bids by {percentage:.2%} for {len(operations)} keywords in campaign {campaign_id}."
+                )
+            except Exception as e:
+                logging.error(
+                    f"Failed to update keyword bids for campaign {campaign_id}: {e}"
+                )
+                raise
+            campaign_ad_groups = list(dict.fromkeys(ad_groups_by_campaign[campaign_id]))
+            if on_updated is not None:
+                on_updated(campaign_ad_groups)
+            updated.extend(campaign_ad_groups)
+        return updated
+
+    def _split_by_bidding_strategy(self, customer_id: str, ad_group_ids: List[str]):
+        """
+        Sorts ad groups into Manual CPC ad groups and Maximize Clicks campaigns.
+
+        Returns:
+            A (manual_cpc_ad_groups, maximize_clicks_campaigns) tuple, where the
+            latter maps campaign ID to its current CPC bid limit.
+        """
+        details = self._get_ad_group_details_bulk(customer_id, ad_group_ids)
+        bidding_strategy_enum = self.client.get_type(
+            "BiddingStrategyTypeEnum"
+        ).BiddingStrategyType
+
+        manual_cpc_ad_groups = []
+        maximize_clicks_campaigns: Dict[Any, int] = {}
+        for ad_group_id in ad_group_ids:
+            ad_group_details = details.get(ad_group_id)
+            if not ad_group_details:
+                logging.error(f"Could not retrieve details for ad group {ad_group_id}.")
+                continue
+
+            bidding_strategy = ad_group_details["bidding_strategy_type"]
+            if bidding_strategy == bidding_strategy_enum.MANUAL_CPC:
+                manual_cpc_ad_groups.append(ad_group_id)
+            elif bidding_strategy == bidding_strategy_enum.MAXIMIZE_CLICKS:
+                campaign_id = ad_group_details["campaign_id"]
+                if not ad_group_details["cpc_bid_limit_micros"]:
+                    logging.warning(
+                        f"Campaign {campaign_id} has no CPC bid limit. Cannot increase."
+                    )
+                    continue
+                maximize_clicks_campaigns[campaign_id] = ad_group_details[
+                    "cpc_bid_limit_micros"
+                ]
+            elif bidding_strategy in [
+                bidding_strategy_enum.TARGET_CPA,
+                bidding_strategy_enum.TARGET_ROAS,
+            ]:
+                logging.info(
+                    f"Bidding strategy is {bidding_strategy.name}. No action taken for ad group {ad_group_id} as it is an automated strategy."
+                )
+            else:
+                logging.warning(f"Unhandled bidding strategy: {bidding_strategy.name}")
+
+        return manual_cpc_ad_groups, maximize_clicks_campaigns
+
+    def increase_bids_bulk(
+        self,
+        customer_id: str,
+        ad_group_ids: List[str],
+        percentage: float = 0.20,
+        journal: Optional[ActionJournal] = None,
+        snapshots: Optional[SnapshotStore] = None,
+    ):
+        """
+        Increases bids for several ad groups at once.
+
+        Details for all ad groups are fetched with one query. Keyword bid
+        updates are submitted as one mutate per campaign, and Maximize Clicks
+        bid caps as a single mutate_campaigns request with each campaign
+        raised once, however many of its ad groups are targeted. With an
+        ActionJournal, each ad group (or Maximize Clicks campaign) is raised
+        by at most what is left of its daily allowance. With the SnapshotStore
+        the ad groups were identified with, their staged snapshots are
+        committed once every mutate succeeded.
+        """
+        ad_group_ids = [str(ad_group_id) for ad_group_id in dict.fromkeys(ad_group_ids)]
+        if not ad_group_ids:
+            logging.info("No ad groups to increase bids for.")
+            return
+        self._increase_bids_bulk(customer_id, ad_group_ids, percentage, journal)
+        if snapshots is not None:
+            snapshots.commit_staged(f"winning:{customer_id}", ad_group_ids)
+
+    def _record_bid_increase(
+        self,
+        journal: ActionJournal,
+        customer_id: str,
+        percentage: float,
+        ad_group_ids: List[str],
+    ):
+        journal.record(
+            (self._ad_group_key(customer_id, i) for i in ad_group_ids),
+            ACTION_INCREASE_BID,
+            percentage,
+        )
+
+    def _increase_bids_bulk(
+        self,
+        customer_id: str,
+        ad_group_ids: List[str],
+        percentage: float,
+        journal: Optional[ActionJournal],
+    ):
+        (
+            manual_cpc_ad_groups,
+            maximize_clicks_campaigns,
+        ) = self._split_by_bidding_strategy(customer_id, ad_group_ids)
+
+        # Ad groups sharing the same allowed increase are updated together.
+        manual_cpc_by_percentage: Dict[float, List[str]] = {}
+        for ad_group_id in manual_cpc_ad_groups:
+            allowed = self._allowed_increase(
+                journal, self._ad_group_key(customer_id, ad_group_id), percentage
+            )
+            if allowed > 0:
+                manual_cpc_by_percentage.setdefault(allowed, []).append(ad_group_id)
+
+        for allowed, ids in manual_cpc_by_percentage.items():
+            on_updated = (
+                partial(self._record_bid_increase, journal, customer_id, allowed)
+                if journal is not None
+                else None
+            )
+            self._update_keyword_bids_bulk(customer_id, ids, allowed, on_updated)
+
+        if maximize_clicks_campaigns:
+            campaign_service = self.client.get_service("CampaignService")
+            operations = []
+            raised_by_percentage: Dict[float, List[str]] = {}
+            for campaign_id, current_limit in maximize_clicks_campaigns.items():
+                key = self._campaign_key(customer_id, campaign_id)
+                allowed = self._allowed_increase(journal, key, percentage)
+                if allowed <= 0:
+                    continue
+                raised_by_percentage.setdefault(allowed, []).append(key)
+                campaign_operation = self.operations.update(
+                    "CampaignOperation", ["maximize_clicks.cpc_bid_limit_micros"]
+                )
+                campaign = campaign_operation.update
+                campaign.resource_name = campaign_service.campaign_path(
+                    customer_id, campaign_id
+                )
+                campaign.maximize_clicks.cpc_bid_limit_micros = int(
+                    current_limit * (1 + allowed)
+                )
+                operations.append(campaign_operation)
+
+            if not operations:
+                logging.info("Maximize Clicks bid caps already raised today.")
+                return
+
+            try:
+                campaign_service.mutate_campaigns(
+                    customer_id=customer_id, operations=operations
+                )
+                logging.info(
+                    f"Successfully increased Maximize Clicks bid caps for {len(operations)} campaigns."
+                )
+            except Exception as e:
+                logging.error(f"Failed to increase bid caps for campaigns: {e}")
+                raise
+            if journal is not None:
+                for allowed, keys in raised_by_percentage.items():
+                    journal.record(keys, ACTION_INCREASE_BID, allowed)
+
+    def plan_increase_bids(
+        self,
+        customer_id: str,
+        ad_group_ids: List[str],
+        percentage: float = 0.20,
+        plan: Optional[MutationPlan] = None,
+        journal: Optional[ActionJournal] = None,
+    ) -> MutationPlan:
+        """
+        Plans the bid increases of `increase_bids_bulk` without mutating.
+
+        Only read queries are issued: keyword bids for Manual CPC ad groups
+        and bid caps for Maximize Clicks campaigns are recorded with their
+        current and new values.
+
+        Args:
+            customer_id: The ID of the Google Ads customer.
+            ad_group_ids: The ad groups to increase bids for.
+            percentage: The bid increase (default is 0.20 for 20%).
+            plan: Optional MutationPlan to add the changes to.
+            journal: Optional ActionJournal. When given, each ad group (or
+                Maximize Clicks campaign) is planned to rise by at most what
+                is left of its daily allowance, as in `increase_bids_bulk`.
+
+        Returns:
+            The MutationPlan; apply it with `apply_plan`.
+        """
+        plan = plan if plan is not None else MutationPlan()
+        planned_before = len(plan)
+        ad_group_ids = [str(ad_group_id) for ad_group_id in dict.fromkeys(ad_group_ids)]
+        if not ad_group_ids:
+            return plan
+
+        (
+            manual_cpc_ad_groups,
+            maximize_clicks_campaigns,
+        ) = self._split_by_bidding_strategy(customer_id, ad_group_ids)
+        allowed_by_ad_group = {
+            ad_group_id: self._allowed_increase(
+                journal, self._ad_group_key(customer_id, ad_group_id), percentage
+            )
+            for ad_group_id in manual_cpc_ad_groups
+        }
+        manual_cpc_ad_groups = [
+            ad_group_id
+            for ad_group_id, allowed in allowed_by_ad_group.items()
+            if allowed > 0
+        ]
+        if manual_cpc_ad_groups:
+            for row in self._iter_keyword_bids_bulk(customer_id, manual_cpc_ad_groups):
+                criterion = row.ad_group_criterion
+                allowed = allowed_by_ad_group[str(row.ad_group.id)]
+                plan.add(
+                    customer_id,
+                    "ad_group_criterion",
+                    criterion.resource_name,
+                    "cpc_bid_micros",
+                    int(criterion.cpc_bid_micros * (1 + allowed)),
+                    old_value=criterion.cpc_bid_micros,
+                    journal_key=self._ad_group_key(customer_id, row.ad_group.id),
+                    journal_action=ACTION_INCREASE_BID,
+                    journal_delta=allowed,
+                )
+
+        if maximize_clicks_campaigns:
+            campaign_service = self.client.get_service("CampaignService")
+            for campaign_id, current_limit in maximize_clicks_campaigns.items():
+                key = self._campaign_key(customer_id, campaign_id)
+                allowed = self._allowed_increase(journal, key, percentage)
+                if allowed <= 0:
+                    continue
+                plan.add(
+                    customer_id,
+                    "campaign",
+                    campaign_service.campaign_path(customer_id, campaign_id),
+                    "maximize_clicks.cpc_bid_limit_micros",
+                    int(current_limit * (1 + allowed)),
+                    old_value=current_limit,
+                    journal_key=key,
+                    journal_action=ACTION_INCREASE_BID,
+                    journal_delta=allowed,
+                )
+
+        logging.info(
+            f"Planned {len(plan) - planned_before} bid changes for "
+            f"{len(ad_group_ids)} ad groups."
+        )
+        return plan
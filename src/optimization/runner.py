@@ -0,0 +1,231 @@
+# src/optimization/runner.py
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.monitoring.snapshots import SnapshotStore
+from src.mutations.journal import ActionJournal
+from src.mutations.plan import MutationPlan, apply_plan
+from src.optimization.persona_optimizer import PersonaOptimizer
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 16
+
+
+@dataclass
+class TargetResult:
+    """The outcome and timings of optimizing one (customer, campaign) pair."""
+
+    customer_id: str
+    campaign_id: str
+    losing_ad_groups: List[str] = field(default_factory=list)
+    winning_ad_groups: List[str] = field(default_factory=list)
+    read_seconds: float = 0.0
+    wait_seconds: float = 0.0
+    mutate_seconds: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class RunReport:
+    """Per-target results and overall throughput of an optimizer run."""
+
+    results: List[TargetResult]
+    wall_seconds: float
+    plan: Optional[MutationPlan] = None
+
+    @property
+    def failures(self) -> List[TargetResult]:
+        return [result for result in self.results if result.error is not None]
+
+    @property
+    def targets_per_second(self) -> float:
+        return len(self.results) / self.wall_seconds if self.wall_seconds else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """Returns aggregate counts and timings as a JSON-serializable dict."""
+        return {
+            "targets": len(self.results),
+            "failures": len(self.failures),
+            "losing_ad_groups": sum(len(r.losing_ad_groups) for r in self.results),
+            "winning_ad_groups": sum(len(r.winning_ad_groups) for r in self.results),
+            "wall_seconds": self.wall_seconds,
+            "targets_per_second": self.targets_per_second,
+            "total_read_seconds": sum(r.read_seconds for r in self.results),
+            "total_mutate_seconds": sum(r.mutate_seconds for r in self.results),
+        }
+
+
+class OptimizerRunner:
+    """
+    Runs persona optimization over many (customer, campaign) targets in parallel.
+
+    Each target's read phase (identifying losing and winning ad groups) runs
+    in a thread pool, concurrently across customers. The mutate phase takes a
+    per-customer lock, so mutates for one customer never overlap and cannot
+    fail with CONCURRENT_MODIFICATION, while other customers proceed.
+    Threads rather than processes are used because the work is I/O bound
+    and the Google Ads client (with its gRPC channels) is shared.
+    """
+
+    def __init__(
+        self,
+        optimizer: PersonaOptimizer,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        snapshots: Optional[SnapshotStore] = None,
+        journal: Optional[ActionJournal] = None,
+        bid_increase_percentage: float = 0.20,
+    ):
+        """
+        Args:
+            optimizer: The PersonaOptimizer (and its shared client) to run.
+            max_workers: The number of targets processed concurrently.
+            snapshots: Optional SnapshotStore to skip unchanged ad groups.
+            journal: Optional ActionJournal to make same-day reruns idempotent.
+            bid_increase_percentage: The bid increase for winning ad groups.
+        """
+        self.optimizer = optimizer
+        self.max_workers = max_workers
+        self.snapshots = snapshots
+        self.journal = journal
+        self.bid_increase_percentage = bid_increase_percentage
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _customer_lock(self, customer_id: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(customer_id, threading.Lock())
+
+    def _run_target(
+        self, customer_id: str, campaign_id: str, plan: Optional[MutationPlan]
+    ) -> TargetResult:
+        result = TargetResult(customer_id=customer_id, campaign_id=campaign_id)
+        try:
+            started = time.perf_counter()
+            result.losing_ad_groups = self.optimizer.identify_losing_personas(
+                customer_id, campaign_id, snapshots=self.snapshots
+            )
+            result.winning_ad_groups = self.optimizer.identify_winning_personas(
+                customer_id, campaign_id, snapshots=self.snapshots
+            )
+            result.read_seconds = time.perf_counter() - started
+
+            if plan is not None:
+                # Planning only reads, so it needs no per-customer ordering.
+                # Snapshots stay staged: the plan may never be applied.
+                started = time.perf_counter()
+                target_plan = self.optimizer.plan_pause_ad_groups(
+                    customer_id, result.losing_ad_groups, journal=self.journal
+                )
+                self.optimizer.plan_increase_bids(
+                    customer_id,
+                    result.winning_ad_groups,
+                    self.bid_increase_percentage,
+                    plan=target_plan,
+                    journal=self.journal,
+                )
+                with self._locks_guard:
+                    plan.extend(target_plan)
+                result.mutate_seconds = time.perf_counter() - started
+            else:
+                started = time.perf_counter()
+                with self._customer_lock(customer_id):
+                    locked = time.perf_counter()
+                    result.wait_seconds = locked - started
+                    self.optimizer.pause_ad_groups(
+                        customer_id,
+                        result.losing_ad_groups,
+                        journal=self.journal,
+                        snapshots=self.snapshots,
+                    )
+                    self.optimizer.increase_bids_bulk(
+                        customer_id,
+                        result.winning_ad_groups,
+                        self.bid_increase_percentage,
+                        journal=self.journal,
+                        snapshots=self.snapshots,
+                    )
+                    result.mutate_seconds = time.perf_counter() - locked
+        except Exception as e:
+            result.error = str(e)
+            logger.error(
+                f"Optimization failed for customer {customer_id}, campaign {campaign_id}: {e}"
+            )
+        logger.info(
+            f"Optimized {customer_id}/{campaign_id}: read {result.read_seconds:.2f}s, "
+            f"waited {result.wait_seconds:.2f}s, mutated {result.mutate_seconds:.2f}s."
+        )
+        return result
+
+    def run(
+        self, targets: Iterable[Tuple[str, str]], plan_only: bool = False
+    ) -> RunReport:
+        """
+        Optimizes every (customer_id, campaign_id) target.
+
+        Args:
+            targets: The (customer_id, campaign_id) pairs to optimize.
+            plan_only: Build a MutationPlan (returned in the report) instead
+                of mutating; apply it later with `apply`.
+
+        Returns:
+            A RunReport with per-target timings, in target order.
+        """
+        targets = [(str(c), str(k)) for c, k in targets]
+        plan = MutationPlan() if plan_only else None
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self._run_target, customer_id, campaign_id, plan)
+                for customer_id, campaign_id in targets
+            ]
+            results = [future.result() for future in futures]
+        report = RunReport(
+            results=results, wall_seconds=time.perf_counter() - started, plan=plan
+        )
+        logger.info(
+            f"Optimized {len(results)} targets in {report.wall_seconds:.1f}s "
+            f"({report.targets_per_second:.2f} targets/s, "
+            f"{len(report.failures)} failures)."
+        )
+        return report
+
+    def apply(self, plan: MutationPlan, **kwargs) -> List[str]:
+        """
+        Applies a plan built with `run(plan_only=True)` using `apply_plan`.
+
+        Applied changes are recorded in the runner's ActionJournal, so a
+        later run on the same day neither re-pauses nor re-raises them.
+
+        Args:
+            plan: The MutationPlan to apply.
+            **kwargs: Further arguments for `apply_plan`, e.g. `chunk_size`.
+
+        Returns:
+            The resource names returned by the API, in the order sent.
+        """
+        return apply_plan(self.optimizer.client, plan, journal=self.journal, **kwargs)
+
+
+def expand_targets(targets: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+    """
+    Expands account targets (the `serve` targets file format) into pairs.
+
+    Args:
+        targets: Dicts with `customer_id` and a list of `campaign_ids`.
+
+    Returns:
+        A list of (customer_id, campaign_id) tuples.
+    """
+    return [
+        (str(target["customer_id"]), str(campaign_id))
+        for target in targets
+        for campaign_id in target.get("campaign_ids", [])
+    ]
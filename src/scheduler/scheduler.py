@@ -0,0 +1,325 @@
+# src/scheduler/scheduler.py
+
+import asyncio
+import json
+import logging
+import random
+import signal
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from src.monitoring.snapshots import SnapshotStore
+from src.mutations.journal import ActionJournal
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_JITTER = 0.1  # +/-10% of the interval
+DEFAULT_SPEND_INTERVAL_SECONDS = 15 * 60
+DEFAULT_CTR_INTERVAL_SECONDS = 60 * 60
+DEFAULT_PERSONA_INTERVAL_SECONDS = 6 * 60 * 60
+
+
+class JobPriority(IntEnum):
+    """Job priorities; lower values run first when several jobs are due."""
+
+    SPEND_GUARDRAIL = 0
+    CTR_HYGIENE = 10
+    PERSONA_OPTIMIZATION = 20
+
+
+@dataclass
+class ScheduledJob:
+    """A periodic job and its runtime statistics."""
+
+    name: str
+    func: Callable[[], Any]
+    interval_seconds: float
+    priority: int = JobPriority.CTR_HYGIENE
+    jitter: float = DEFAULT_JITTER
+
+    next_run: float = 0.0
+    running: bool = False
+    runs: int = 0
+    failures: int = 0
+    skipped_overlaps: int = 0
+    last_runtime_seconds: Optional[float] = None
+    total_runtime_seconds: float = 0.0
+    last_lag_seconds: Optional[float] = None
+    max_lag_seconds: float = 0.0
+    last_error: Optional[str] = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the job's runtime statistics as a JSON-serializable dict."""
+        return {
+            "name": self.name,
+            "priority": int(self.priority),
+            "interval_seconds": self.interval_seconds,
+            "running": self.running,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped_overlaps": self.skipped_overlaps,
+            "last_runtime_seconds": self.last_runtime_seconds,
+            "avg_runtime_seconds": (
+                self.total_runtime_seconds / self.runs if self.runs else None
+            ),
+            "last_lag_seconds": self.last_lag_seconds,
+            "max_lag_seconds": self.max_lag_seconds,
+            "last_error": self.last_error,
+        }
+
+
+@dataclass(order=True)
+class _QueuedRun:
+    priority: int
+    due: float
+    job: ScheduledJob = field(compare=False)
+
+
+class MonitorScheduler:
+    """
+    A resident asyncio scheduler for periodic monitor and optimizer jobs.
+
+    Due jobs are queued by priority and executed by a fixed pool of workers
+    in threads (the Google Ads client is synchronous). A job is never queued
+    again while a previous run is still in flight. Each reschedule adds
+    random jitter so hundreds of accounts do not hit the API in lockstep.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        tick_seconds: float = 1.0,
+        status_path: Optional[Path] = None,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.tick_seconds = tick_seconds
+        self.status_path = status_path
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.jobs: List[ScheduledJob] = []
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._shutdown: Optional[asyncio.Event] = None
+
+    def add_job(self, job: ScheduledJob, run_immediately: bool = True):
+        """
+        Registers a job. The first run is spread over one jittered interval
+        unless `run_immediately` is set.
+        """
+        now = self.clock()
+        job.next_run = now if run_immediately else now + self._jittered_interval(job)
+        self.jobs.append(job)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Returns runtime statistics for every registered job."""
+        return [job.stats() for job in self.jobs]
+
+    def request_shutdown(self):
+        """Stops scheduling new runs; in-flight runs are allowed to finish."""
+        if self._shutdown is not None:
+            self._shutdown.set()
+
+    def _jittered_interval(self, job: ScheduledJob) -> float:
+        spread = job.interval_seconds * job.jitter
+        return job.interval_seconds + self.rng.uniform(-spread, spread)
+
+    def _enqueue_due_jobs(self):
+        now = self.clock()
+        for job in self.jobs:
+            if job.next_run > now:
+                continue
+            if job.running:
+                job.skipped_overlaps += 1
+                job.next_run = now + self._jittered_interval(job)
+                logger.warning(f"Job {job.name} still running; skipping this run.")
+                continue
+            # Move the next due time past this run now, so a run that is merely
+            # waiting in the queue (or finishing within its interval) is not
+            # mistaken for an overlap on the next tick.
+            due = job.next_run
+            job.next_run = now + self._jittered_interval(job)
+            job.running = True
+            self._queue.put_nowait(_QueuedRun(job.priority, due, job))
+
+    async def _run_job(self, queued: _QueuedRun):
+        job = queued.job
+        started = self.clock()
+        job.last_lag_seconds = max(0.0, started - queued.due)
+        job.max_lag_seconds = max(job.max_lag_seconds, job.last_lag_seconds)
+        try:
+            await asyncio.to_thread(job.func)
+            job.last_error = None
+        except Exception as e:
+            job.failures += 1
+            job.last_error = str(e)
+            logger.error(f"Job {job.name} failed: {e}")
+        finally:
+            finished = self.clock()
+            job.runs += 1
+            job.last_runtime_seconds = finished - started
+            job.total_runtime_seconds += job.last_runtime_seconds
+            job.next_run = finished + self._jittered_interval(job)
+            job.running = False
+
+    async def _worker(self):
+        while True:
+            queued = await self._queue.get()
+            try:
+                await self._run_job(queued)
+            finally:
+                self._queue.task_done()
+
+    def _write_status(self):
+        if self.status_path is None:
+            return
+        self.status_path.write_text(json.dumps(self.stats(), indent=2))
+
+    async def run(self, install_signal_handlers: bool = True):
+        """
+        Runs the scheduler until `request_shutdown` is called (or SIGINT/SIGTERM
+        is received), then waits for in-flight jobs to finish.
+        """
+        self._queue = asyncio.PriorityQueue()
+        self._shutdown = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        if install_signal_handlers:
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, self.request_shutdown)
+
+        workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.max_concurrency)
+        ]
+        logger.info(
+            f"Scheduler started with {len(self.jobs)} jobs and "
+            f"{self.max_concurrency} workers."
+        )
+        try:
+            while not self._shutdown.is_set():
+                self._enqueue_due_jobs()
+                self._write_status()
+                try:
+                    await asyncio.wait_for(
+                        self._shutdown.wait(), timeout=self.tick_seconds
+                    )
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            logger.info("Scheduler shutting down; dropping queued runs.")
+            while not self._queue.empty():
+                self._queue.get_nowait().job.running = False
+                self._queue.task_done()
+            while any(job.running for job in self.jobs):
+                await asyncio.sleep(0.05)
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            if install_signal_handlers:
+                for sig in (signal.SIGINT, signal.SIGTERM):
+                    loop.remove_signal_handler(sig)
+            self._write_status()
+            logger.info("Scheduler stopped.")
+
+
+def build_account_jobs(
+    client,
+    targets: List[Dict[str, Any]],
+    spend_interval_seconds: float = DEFAULT_SPEND_INTERVAL_SECONDS,
+    ctr_interval_seconds: float = DEFAULT_CTR_INTERVAL_SECONDS,
+    persona_interval_seconds: float = DEFAULT_PERSONA_INTERVAL_SECONDS,
+    snapshots: Optional[SnapshotStore] = None,
+    journal: Optional[ActionJournal] = None,
+) -> List[ScheduledJob]:
+    """
+    Builds spend, CTR and persona jobs for a list of account targets.
+
+    All jobs share the same (warm) Google Ads client.
+
+    Args:
+        client: An initialized Google Ads API client.
+        targets: Dicts with `customer_id`, `start_date` (YYYY-MM-DD) and
+            an optional list of `campaign_ids`.
+        snapshots: Optional SnapshotStore so persona jobs only re-evaluate
+            ad groups whose metrics changed since the previous run.
+        journal: Optional ActionJournal so re-runs on the same day neither
+            re-send pauses nor compound bid increases.
+
+    Returns:
+        A list of ScheduledJob objects.
+    """
+    from src.monitoring.ctr_monitor import CTRMonitor
+    from src.monitoring.spend_monitor import SpendMonitor
+    from src.optimization.persona_optimizer import PersonaOptimizer
+
+    ctr_monitor = CTRMonitor(client)
+    persona_optimizer = PersonaOptimizer(client=client)
+    jobs = []
+
+    for target in targets:
+        customer_id = str(target["customer_id"])
+        spend_monitor = SpendMonitor(client, customer_id)
+        start_date = target["start_date"]
+
+        def check_spend(monitor=spend_monitor, start_date=start_date):
+            current_spend = monitor.get_account_spend(start_date)
+            monitor.check_milestones(current_spend)
+
+        jobs.append(
+            ScheduledJob(
+                name=f"spend:{customer_id}",
+                func=check_spend,
+                interval_seconds=spend_interval_seconds,
+                priority=JobPriority.SPEND_GUARDRAIL,
+            )
+        )
+
+        for campaign_id in target.get("campaign_ids", []):
+            campaign_id = str(campaign_id)
+
+            def check_ctr(customer_id=customer_id, campaign_id=campaign_id):
+                ctr_monitor.pause_underperforming_ads_streaming(
+                    customer_id, campaign_id, journal=journal
+                )
+
+            def optimize_personas(customer_id=customer_id, campaign_id=campaign_id):
+                persona_optimizer.pause_ad_groups(
+                    customer_id,
+                    persona_optimizer.identify_losing_personas(
+                        customer_id, campaign_id, snapshots=snapshots
+                    ),
+                    journal=journal,
+                    snapshots=snapshots,
+                )
+                persona_optimizer.increase_bids_bulk(
+                    customer_id,
+                    persona_optimizer.identify_winning_personas(
+                        customer_id, campaign_id, snapshots=snapshots
+                    ),
+                    journal=journal,
+                    snapshots=snapshots,
+                )
+
+            jobs.append(
+                ScheduledJob(
+                    name=f"ctr:{customer_id}:{campaign_id}",
+                    func=check_ctr,
+                    interval_seconds=ctr_interval_seconds,
+                    priority=JobPriority.CTR_HYGIENE,
+                )
+            )
+            jobs.append(
+                ScheduledJob(
+                    name=f"persona:{customer_id}:{campaign_id}",
+                    func=optimize_personas,
+                    interval_seconds=persona_interval_seconds,
+                    priority=JobPriority.PERSONA_OPTIMIZATION,
+                )
+            )
+
+    return jobs
@@ -0,0 +1,395 @@
+# src/telemetry/llm.py
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# USD per million tokens: input, output, cache write, cache read.
+MODEL_PRICES = {
+    "claude-3-haiku-20240307": (0.25, 1.25, 0.30, 0.03),
+    "claude-3-5-sonnet-20241022": (3.00, 15.00, 3.75, 0.30),
+}
+# Message Batches are billed at half the real-time price.
+BATCH_DISCOUNT = 0.5
+TOKEN_FIELDS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens",
+)
+# The LLMCall attributes that totals are kept per, in label order.
+LABELS = ("command", "config", "operation", "model")
+# Individual calls kept for reports; totals always cover every call.
+DEFAULT_MAX_CALLS = 10_000
+
+_command: ContextVar[str] = ContextVar("llm_command", default="")
+_config: ContextVar[str] = ContextVar("llm_config", default="")
+
+
+def compute_cost(
+    model: str,
+    input_tokens: int = 0,
+    output_tokens: int = 0,
+    cache_creation_input_tokens: int = 0,
+    cache_read_input_tokens: int = 0,
+    batch: bool = False,
+) -> Optional[float]:
+    """Returns the USD cost of a call, or None for a model without prices."""
+    prices = MODEL_PRICES.get(model)
+    if prices is None:
+        return None
+    tokens = (
+        input_tokens,
+        output_tokens,
+        cache_creation_input_tokens,
+        cache_read_input_tokens,
+    )
+    cost = sum(count * price for count, price in zip(tokens, prices)) / 1_000_000
+    return cost * BATCH_DISCOUNT if batch else cost
+
+
+@dataclass
+class LLMCall:
+    """One Anthropic or agent SDK call."""
+
+    operation: str
+    model: str
+    command: str = ""
+    config: str = ""
+    attempt: int = 0
+    success: bool = True
+    error: Optional[str] = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    time_to_first_token_seconds: Optional[float] = None
+    latency_seconds: Optional[float] = None
+    cost_usd: Optional[float] = None
+    batch: bool = False
+
+
+class CallTracker:
+    """Times one call and collects its usage; returned by `LLMTelemetry.track`."""
+
+    def __init__(self, call: LLMCall):
+        self.call = call
+        self._started = time.perf_counter()
+
+    def fail(self, error: str):
+        """Marks the call failed without raising (e.g. an errored batch entry)."""
+        self.call.success = False
+        self.call.error = error
+
+    def first_token(self):
+        """Marks the arrival of the first streamed token (only the first counts)."""
+        if self.call.time_to_first_token_seconds is None:
+            self.call.time_to_first_token_seconds = time.perf_counter() - self._started
+
+    def record_response(self, response: Any):
+        """
+        Records the token usage of a response.
+
+        Accepts an Anthropic Message, a model returned by instructor (which
+        keeps the raw Message in `_raw_response`), or an agent SDK
+        ResultMessage (whose usage is a dict and which reports its own cost).
+        """
+        raw = getattr(response, "_raw_response", response)
+        usage = getattr(raw, "usage", None)
+        if usage is None:
+            return
+        for name in TOKEN_FIELDS:
+            value = (
+                usage.get(name) if isinstance(usage, dict) else getattr(usage, name, 0)
+            )
+            if isinstance(value, int):
+                setattr(self.call, name, value)
+        if getattr(raw, "total_cost_usd", None) is not None:
+            self.call.cost_usd = raw.total_cost_usd
+
+    def _finish(self):
+        if self.call.latency_seconds is None:
+            self.call.latency_seconds = time.perf_counter() - self._started
+        if self.call.time_to_first_token_seconds is None:
+            # Non-streamed calls deliver the first token with the response
+            self.call.time_to_first_token_seconds = self.call.latency_seconds
+        if self.call.cost_usd is None:
+            self.call.cost_usd = compute_cost(
+                self.call.model,
+                *(getattr(self.call, name) for name in TOKEN_FIELDS),
+                batch=self.call.batch,
+            )
+
+
+def _new_totals() -> Dict[str, float]:
+    return {
+        "calls": 0,
+        "failures": 0,
+        "retries": 0,
+        **{name: 0 for name in TOKEN_FIELDS},
+        "cost_usd": 0.0,
+        "latency_seconds": 0.0,
+        "time_to_first_token_seconds": 0.0,
+        "max_time_to_first_token_seconds": 0.0,
+    }
+
+
+def _add_totals(totals: Dict[str, float], other: Dict[str, float]):
+    for name, value in other.items():
+        if name.startswith("max_"):
+            totals[name] = max(totals[name], value)
+        else:
+            totals[name] += value
+
+
+def cache_hit_rate(totals: Dict[str, float]) -> float:
+    """Returns the share of prompt tokens in `totals` read from the prompt cache."""
+    prompt_tokens = (
+        totals["input_tokens"]
+        + totals["cache_creation_input_tokens"]
+        + totals["cache_read_input_tokens"]
+    )
+    return totals["cache_read_input_tokens"] / prompt_tokens if prompt_tokens else 0.0
+
+
+class LLMTelemetry:
+    """
+    Records every LLM call with its tokens, latency, retries and cost.
+
+    Calls are tagged with the CLI command and the campaign config active in
+    the current context, so totals can be reported per command and config.
+    Totals are kept incrementally per command, config, operation and model,
+    so memory stays bounded in long runs: only the last `max_calls`
+    individual calls are kept for per-call reports.
+
+    Usage:
+        with telemetry.context(command="generate-ads", config="Offer"):
+            with telemetry.track("ad_copy", MODEL, attempt=attempt) as call:
+                response = client.messages.create(...)
+                call.record_response(response)
+    """
+
+    def __init__(self, max_calls: int = DEFAULT_MAX_CALLS):
+        self.calls: Deque[LLMCall] = deque(maxlen=max_calls)
+        # Calls recorded since the last reset, e.g. to count a run's calls.
+        self.total_calls = 0
+        self._totals: Dict[Tuple[str, ...], Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def context(self, command: Optional[str] = None, config: Optional[str] = None):
+        """Tags the calls made inside the block with a command and/or config."""
+        tokens = []
+        if command is not None:
+            tokens.append((_command, _command.set(command)))
+        if config is not None:
+            tokens.append((_config, _config.set(config)))
+        try:
+            yield
+        finally:
+            for var, token in reversed(tokens):
+                var.reset(token)
+
+    @contextmanager
+    def track(
+        self,
+        operation: str,
+        model: str,
+        attempt: int = 0,
+        batch: bool = False,
+        latency_seconds: Optional[float] = None,
+    ) -> Iterator[CallTracker]:
+        """
+        Times the call made inside the block and records it, even on errors.
+
+        Args:
+            operation: What the call does, e.g. "personas" or "ad_copy".
+            model: The model name, used for pricing.
+            attempt: The retry number (0 for the first attempt).
+            batch: Whether the call ran in a Message Batch (discounted).
+            latency_seconds: The latency, for calls timed elsewhere.
+        """
+        tracker = CallTracker(
+            LLMCall(
+                operation=operation,
+                model=model,
+                command=_command.get(),
+                config=_config.get(),
+                attempt=attempt,
+                batch=batch,
+                latency_seconds=latency_seconds,
+            )
+        )
+        try:
+            yield tracker
+        except BaseException as e:
+            tracker.call.success = False
+            tracker.call.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            tracker._finish()
+            self._record(tracker.call)
+
+    def _record(self, call: LLMCall):
+        key = tuple(getattr(call, label) for label in LABELS)
+        with self._lock:
+            self.calls.append(call)
+            self.total_calls += 1
+            _add_totals(
+                self._totals.setdefault(key, _new_totals()),
+                {
+                    "calls": 1,
+                    "failures": not call.success,
+                    "retries": call.attempt > 0,
+                    **{name: getattr(call, name) for name in TOKEN_FIELDS},
+                    "cost_usd": call.cost_usd or 0.0,
+                    "latency_seconds": call.latency_seconds or 0.0,
+                    "time_to_first_token_seconds": (
+                        call.time_to_first_token_seconds or 0.0
+                    ),
+                    "max_time_to_first_token_seconds": (
+                        call.time_to_first_token_seconds or 0.0
+                    ),
+                },
+            )
+
+    def reset(self):
+        with self._lock:
+            self.calls.clear()
+            self.total_calls = 0
+            self._totals = {}
+
+    def snapshot(self) -> List[LLMCall]:
+        """Returns a copy of the recorded calls (at most `max_calls`)."""
+        with self._lock:
+            return list(self.calls)
+
+    def totals(self) -> Dict[Tuple[str, ...], Dict[str, float]]:
+        """Returns a copy of the totals per (command, config, operation, model)."""
+        with self._lock:
+            return {key: dict(totals) for key, totals in self._totals.items()}
+
+    def aggregate(self, by: str) -> Dict[str, dict]:
+        """
+        Returns totals grouped by an LLMCall attribute, over every call.
+
+        Args:
+            by: "config", "command", "operation" or "model".
+        """
+        index = LABELS.index(by)
+        groups: Dict[str, dict] = {}
+        for key, totals in self.totals().items():
+            _add_totals(
+                groups.setdefault(key[index] or "(none)", _new_totals()), totals
+            )
+        for totals in groups.values():
+            totals["cache_hit_rate"] = cache_hit_rate(totals)
+        return groups
+
+    def summary(self) -> dict:
+        """Returns the calls and per-config/command totals as a JSON-ready dict."""
+        calls = [asdict(call) for call in self.snapshot()]
+        return {
+            "calls": calls,
+            "by_config": self.aggregate("config"),
+            "by_command": self.aggregate("command"),
+            "by_operation": self.aggregate("operation"),
+        }
+
+
+class JsonSink:
+    """Writes the telemetry summary to a JSON file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def write(self, telemetry: LLMTelemetry):
+        with open(self.path, "w") as f:
+            json.dump(telemetry.summary(), f, indent=2)
+        logger.info(
+            f"Wrote telemetry for {telemetry.total_calls} LLM calls to {self.path}."
+        )
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    pairs = (f'{name}="{_escape(value)}"' for name, value in labels.items())
+    return "{" + ",".join(pairs) + "}"
+
+
+class PrometheusSink:
+    """
+    Writes counters in the Prometheus text format.
+
+    The file can be collected by node_exporter's textfile collector or
+    served as-is; it needs no Prometheus client library.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def render(self, telemetry: LLMTelemetry) -> str:
+        series: Dict[str, Dict[str, float]] = {}
+
+        def add(metric: str, labels: str, value: float):
+            metric_series = series.setdefault(metric, {})
+            metric_series[labels] = metric_series.get(labels, 0.0) + value
+
+        for key, totals in telemetry.totals().items():
+            base = dict(zip(LABELS, key))
+            labels = _labels(**base)
+            add("llm_calls_total", labels, totals["calls"])
+            add("llm_call_failures_total", labels, totals["failures"])
+            add("llm_retries_total", labels, totals["retries"])
+            add("llm_cost_usd_total", labels, totals["cost_usd"])
+            add("llm_latency_seconds_sum", labels, totals["latency_seconds"])
+            add(
+                "llm_time_to_first_token_seconds_sum",
+                labels,
+                totals["time_to_first_token_seconds"],
+            )
+            for name in TOKEN_FIELDS:
+                add(
+                    "llm_tokens_total",
+                    _labels(**base, type=name.replace("_tokens", "")),
+                    totals[name],
+                )
+
+        lines = []
+        for metric, values in series.items():
+            kind = "counter" if metric.endswith("_total") else "untyped"
+            lines.append(f"# TYPE {metric} {kind}")
+            lines.extend(
+                f"{metric}{labels} {value:g}" for labels, value in values.items()
+            )
+        return "\n".join(lines) + "\n"
+
+    def write(self, telemetry: LLMTelemetry):
+        self.path.write_text(self.render(telemetry))
+        logger.info(f"Wrote LLM metrics to {self.path}.")
+
+
+def make_sink(path: Path, format: str = "json"):
+    """Returns the sink for a format name ("json" or "prometheus")."""
+    sinks = {"json": JsonSink, "prometheus": PrometheusSink}
+    if format not in sinks:
+        raise ValueError(f"Unknown telemetry format: {format}")
+    return sinks[format](path)
+
+
+# Process-wide telemetry shared by the generators and workflows.
+telemetry = LLMTelemetry()
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from google.ads.googleads.errors import GoogleAdsException
 
@@ -6,6 +6,7 @@ from google.ads.googleads.errors import GoogleAdsException
 
 from src.config.google_ads_client import get_google_ads_client
 from src.models.persona import Persona
+from src.mutations.plan import ACTION_CREATE, MutationPlan, set_field
 
 
 def _create_ad_group(
@@ -28,6 +29,31 @@ def _create_ad_group(
         raise ex
 
 
+def _bidding_settings(
+    monetization_model: str,
+    target_cpa_micros: Optional[int] = None,
+    target_roas: Optional[float] = None,
+    cpc_bid_cap_micros: Optional[int] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    """Maps a monetization model to a bidding strategy name and its campaign fields."""
+    fields: Dict[str, Any]
+    if monetization_model == "TRIPWIRE_UPSELL":
+        fields = {"maximize_conversions.target_cpa_micros": target_cpa_micros}
+        strategy = "MAXIMIZE_CONVERSIONS"
+    elif monetization_model == "DIRECT_SALE":
+        fields = {"target_roas.target_roas": target_roas}
+        strategy = "TARGET_ROAS"
+    elif monetization_model == "LEAD_GEN":
+        fields = {"maximize_clicks.cpc_bid_limit_micros": cpc_bid_cap_micros}
+        strategy = "MAXIMIZE_CLICKS"
+    elif monetization_model == "BOOK_CALL":
+        fields = {}
+        strategy = "MAXIMIZE_CONVERSIONS"
+    else:
+        raise ValueError(f"Invalid monetization_model: {monetization_model}")
+    return strategy, {path: value for path, value in fields.items() if value}
+
+
 # @tool
 def create_growth_tier_campaign(
     customer_id: str,
@@ -80,30 +106,14 @@ def create_growth_tier_campaign(
     campaign.status = client.get_type("CampaignStatusEnum").CampaignStatus.PAUSED
 
     # Bidding strategy mapping
-    if monetization_model == "TRIPWIRE_UPSELL":
-        campaign.bidding_strategy_type = client.get_type(
-            "BiddingStrategyTypeEnum"
-        ).BiddingStrategyType.MAXIMIZE_CONVERSIONS
-        if target_cpa_micros:
-            campaign.maximize_conversions.target_cpa_micros = target_cpa_micros
-    elif monetization_model == "DIRECT_SALE":
-        campaign.bidding_strategy_type = client.get_type(
-            "BiddingStrategyTypeEnum"
-        ).BiddingStrategyType.TARGET_ROAS
-        if target_roas:
-            campaign.target_roas.target_roas = target_roas
-    elif monetization_model == "LEAD_GEN":
-        campaign.bidding_strategy_type = client.get_type(
-            "BiddingStrategyTypeEnum"
-        ).BiddingStrategyType.MAXIMIZE_CLICKS
-        if cpc_bid_cap_micros:
-            campaign.maximize_clicks.cpc_bid_limit_micros = cpc_bid_cap_micros
-    elif monetization_model == "BOOK_CALL":
-        campaign.bidding_strategy_type = client.get_type(
-            "BiddingStrategyTypeEnum"
-        ).BiddingStrategyType.MAXIMIZE_CONVERSIONS
-    else:
-        raise ValueError(f"Invalid monetization_model: {monetization_model}")
+    strategy, bidding_fields = _bidding_settings(
+        monetization_model, target_cpa_micros, target_roas, cpc_bid_cap_micros
+    )
+    campaign.bidding_strategy_type = getattr(
+        client.get_type("BiddingStrategyTypeEnum").BiddingStrategyType, strategy
+    )
+    for path, value in bidding_fields.items():
+        set_field(campaign, path, value)
 
     campaign.network_settings.target_google_search = True
     campaign.network_settings.target_search_network = True
@@ -122,3 +132,94 @@ def create_growth_tier_campaign(
         _create_ad_group(client, customer_id, campaign_resource_name, ad_group_name)
 
     return campaign_resource_name
+
+
+def plan_growth_tier_campaign(
+    customer_id: str,
+    campaign_name: str,
+    budget_micros: int,
+    monetization_model: str,
+    personas: List[Persona],
+    target_cpa_micros: Optional[int] = None,
+    target_roas: Optional[float] = None,
+    cpc_bid_cap_micros: Optional[int] = None,
+    plan: Optional[MutationPlan] = None,
+) -> MutationPlan:
+    """
+    Plans the budget, campaign and persona ad groups of
+    `create_growth_tier_campaign` without calling the API.
+
+    The new entities reference each other through temporary (negative) IDs,
+    which `apply_plan` resolves in a single GoogleAdsService.Mutate request.
+    The campaign is the second resource name returned by `apply_plan` for
+    this plan's changes.
+
+    Returns:
+        The MutationPlan; apply it with `apply_plan`.
+    """
+    plan = plan if plan is not None else MutationPlan()
+    strategy, bidding_fields = _bidding_settings(
+        monetization_model, target_cpa_micros, target_roas, cpc_bid_cap_micros
+    )
+    budget_resource_name = (
+        f"customers/{customer_id}/campaignBudgets/{plan.next_temp_id(customer_id)}"
+    )
+    budget_fields = {
+        "name": f"Budget for {campaign_name}",
+        "delivery_method": "STANDARD",
+        "amount_micros": budget_micros,
+    }
+    for path, value in budget_fields.items():
+        plan.add(
+            customer_id,
+            "campaign_budget",
+            budget_resource_name,
+            path,
+            value,
+            action=ACTION_CREATE,
+        )
+
+    campaign_resource_name = (
+        f"customers/{customer_id}/campaigns/{plan.next_temp_id(customer_id)}"
+    )
+    campaign_fields = {
+        "name": campaign_name,
+        "campaign_budget": budget_resource_name,
+        "advertising_channel_type": "SEARCH",
+        "status": "PAUSED",
+        "bidding_strategy_type": strategy,
+        **bidding_fields,
+        "network_settings.target_google_search": True,
+        "network_settings.target_search_network": True,
+    }
+    for path, value in campaign_fields.items():
+        plan.add(
+            customer_id,
+            "campaign",
+            campaign_resource_name,
+            path,
+            value,
+            action=ACTION_CREATE,
+        )
+
+    for persona in personas:
+        ad_group_resource_name = (
+            f"customers/{customer_id}/adGroups/{plan.next_temp_id(customer_id)}"
+        )
+        ad_group_fields = {
+            "name": f"{campaign_name} - {persona.name}",
+            "campaign": campaign_resource_name,
+            "status": "ENABLED",
+            "type_": "SEARCH_STANDARD",
+        }
+        for path, value in ad_group_fields.items():
+            plan.add(
+                customer_id,
+                "ad_group",
+                ad_group_resource_name,
+                path,
+                value,
+                action=ACTION_CREATE,
+            )
+
+    return plan
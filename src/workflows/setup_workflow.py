@@ -15,8 +15,10 @@ from claude_agent_sdk.types import (
     ToolResultBlock,
     TextBlock,
     AssistantMessage,
+    ResultMessage,
 )
 from src.models.configuration import CampaignConfiguration
+from src.telemetry.llm import telemetry
 from pydantic import BaseModel
 
 
@@ -53,12 +55,20 @@ class CampaignSetupWorkflow:
         )
 
         final_message: Optional[Message] = None
-        async for message in await client.query(prompt, permission_mode="cli"):
-            final_message = message
-            if isinstance(message, AssistantMessage):
-                for content in message.content:
-                    if isinstance(content, TextBlock):
-                        typer.echo(content.text, nl=False)
+        # The agent's model is only known once it answers
+        with telemetry.context(config=config.offer_name), telemetry.track(
+            "setup_workflow", "unknown"
+        ) as call:
+            async for message in await client.query(prompt, permission_mode="cli"):
+                call.first_token()
+                final_message = message
+                if isinstance(message, AssistantMessage):
+                    call.call.model = message.model
+                    for content in message.content:
+                        if isinstance(content, TextBlock):
+                            typer.echo(content.text, nl=False)
+                elif isinstance(message, ResultMessage):
+                    call.record_response(message)
 
         # After the stream ends, inspect the final message for a tool result
         if isinstance(final_message, AssistantMessage):
@@ -15,6 +15,11 @@ from src.models.configuration import CampaignConfiguration
 from src.models.enums import VerticalType, MonetizationModel
 
 
+def _prompt_text(kwargs) -> str:
+    """Joins the text blocks of the user message passed to the client."""
+    return "".join(block["text"] for block in kwargs["messages"][0]["content"])
+
+
 @pytest.fixture
 def mock_persona():
     """Provides a mock PersonaSchema object for tests."""
@@ -76,13 +81,13 @@ def test_generate_polarity_ads_success(mock_client, mock_persona, mock_config):
     call_args = mock_client.messages.create.call_args_list
 
     # Check Pull Prompt
-    pull_prompt = call_args[0].kwargs["messages"][0]["content"]
+    pull_prompt = _prompt_text(call_args[0].kwargs)
     assert 'ad copy using the "Pull" (Desire/Gain) angle' in pull_prompt
     assert "Name: Test Persona" in pull_prompt
     assert "Offer Name: Test Offer" in pull_prompt
 
     # Check Push Prompt
-    push_prompt = call_args[1].kwargs["messages"][0]["content"]
+    push_prompt = _prompt_text(call_args[1].kwargs)
     assert 'ad copy using the "Push" (Fear/FOMO) angle' in push_prompt
     assert "Name: Test Persona" in push_prompt
     assert "Offer Name: Test Offer" in push_prompt
@@ -133,3 +138,204 @@ def test_ad_copy_schema_validation():
             headlines=["Valid Headline"] * 3,
             descriptions=["This is a risk-free offer.", "Another description."],
         )
+
+
+@pytest.mark.asyncio
+@patch("src.generators.ad_copy_generator.async_client")
+async def test_agenerate_polarity_ads_runs_angles_concurrently(
+    mock_async_client, mock_persona, mock_config
+):
+    """
+    Tests that both angles are in flight at once and retry independently.
+    """
+    import asyncio
+
+    from src.generators.ad_copy_generator import agenerate_polarity_ads
+
+    pull_copy = AdCopySchema(
+        headlines=["Unlock Potential", "Achieve Goals", "Success Awaits"],
+        descriptions=["Our tool helps you succeed.", "Join thousands of happy users."],
+    )
+    push_copy = AdCopySchema(
+        headlines=["Don't Miss Out", "Limited Time Offer", "Act Now!"],
+        descriptions=["Spots are filling up fast.", "Avoid the regret of waiting."],
+    )
+    both_started = asyncio.Event()
+    in_flight = set()
+    attempts = {"PULL": 0, "PUSH": 0}
+
+    async def create(**kwargs):
+        angle = "PULL" if '"Pull"' in _prompt_text(kwargs) else "PUSH"
+        attempts[angle] += 1
+        in_flight.add(angle)
+        if len(in_flight) == 2:
+            both_started.set()
+        await asyncio.wait_for(both_started.wait(), timeout=1)
+        if angle == "PUSH" and attempts[angle] == 1:
+            raise ValueError("invalid copy")
+        return pull_copy if angle == "PULL" else push_copy
+
+    mock_async_client.messages.create.side_effect = create
+
+    ad_variations = await agenerate_polarity_ads(mock_persona, mock_config)
+
+    assert [v.angle for v in ad_variations] == ["PULL", "PUSH"]
+    assert ad_variations[0].copy == pull_copy
+    assert ad_variations[1].copy == push_copy
+    assert attempts == {"PULL": 1, "PUSH": 2}
+
+
+def test_static_prefix_is_split_from_persona_context(mock_persona, mock_config):
+    """
+    Tests that the angle rules are a static prefix and the persona is a suffix.
+    """
+    from src.generators.ad_copy_generator import _render_message
+
+    pull = _render_message("PULL", mock_persona, mock_config)
+    other = _render_message(
+        "PULL", mock_persona.model_copy(update={"name": "Other"}), mock_config
+    )
+    prefix, suffix = pull["content"]
+
+    # The angle prompt is below Haiku's minimum cacheable length.
+    assert "cache_control" not in prefix
+    assert "cache_control" not in suffix
+    assert "STRICT RULES" in prefix["text"]
+    assert "Test Persona" not in prefix["text"]
+    assert "Name: Test Persona" in suffix["text"]
+    # The prefix must be byte-identical across personas to hit any cache
+    assert other["content"][0] == prefix
+
+
+def test_find_invalid_items_reports_each_failure():
+    """
+    Tests that per-item validation reports every offending item.
+    """
+    from src.generators.ad_copy_generator import AdCopyDraft, find_invalid_items
+
+    draft = AdCopyDraft(
+        headlines=["Valid Headline", "A" * 31, "Totally free trial"],
+        descriptions=["Valid description.", "D" * 91],
+    )
+
+    invalid = find_invalid_items(draft)
+
+    assert [(item.field, item.index) for item in invalid] == [
+        ("headlines", 1),
+        ("headlines", 2),
+        ("descriptions", 1),
+    ]
+    assert invalid[0].reason == "Headline must be 30 characters or less."
+
+
+@patch("src.generators.ad_copy_generator.client")
+def test_invalid_items_are_repaired_not_regenerated(
+    mock_client, mock_persona, mock_config
+):
+    """
+    Tests that one bad headline triggers a small repair request only.
+    """
+    from src.generators.ad_copy_generator import AdCopyDraft, AdCopyRepair
+
+    long_headline = "This Headline Is Far Too Long To Use"
+    draft = AdCopyDraft(
+        headlines=["Grow Your Business", long_headline, "Start Today"],
+        descriptions=["Boost productivity today.", "See why teams switched."],
+    )
+    mock_client.messages.create.side_effect = [
+        draft,
+        AdCopyRepair(headlines=["Save Time Daily"]),
+        draft,
+        AdCopyRepair(headlines=["Act Now"]),
+    ]
+
+    ad_variations = generate_polarity_ads(mock_persona, mock_config)
+
+    assert ad_variations[0].copy.headlines == [
+        "Grow Your Business",
+        "Save Time Daily",
+        "Start Today",
+    ]
+    assert ad_variations[1].copy.headlines[1] == "Act Now"
+    assert ad_variations[0].copy.descriptions == draft.descriptions
+    calls = mock_client.messages.create.call_args_list
+    assert len(calls) == 4
+    repair_call = calls[1].kwargs
+    assert repair_call["response_model"] is AdCopyRepair
+    repair_prompt = repair_call["messages"][0]["content"]
+    assert long_headline in repair_prompt
+    assert "Grow Your Business" not in repair_prompt
+
+
+def test_unrepaired_items_are_dropped_when_enough_remain():
+    """
+    Tests that items still invalid after repairs are dropped if possible.
+    """
+    from src.generators.ad_copy_generator import AdCopyDraft, finalize_copy
+
+    copy = finalize_copy(
+        AdCopyDraft(
+            headlines=["One", "Two", "Three", "Risk-free"],
+            descriptions=["Desc one.", "Desc two."],
+        )
+    )
+    assert copy.headlines == ["One", "Two", "Three"]
+
+    with pytest.raises(ValidationError):
+        finalize_copy(
+            AdCopyDraft(
+                headlines=["One", "Two", "Free stuff"],
+                descriptions=["Desc one.", "Desc two."],
+            )
+        )
+
+
+@patch("src.generators.ad_copy_generator.client")
+def test_overgenerate_selects_locally_in_one_call_per_angle(
+    mock_client, mock_persona, mock_config
+):
+    """
+    Tests that over-generation needs no retries when some candidates are bad.
+    """
+    from src.generators.ad_copy_generator import AdCopyCandidates
+    from src.generators.selection import ad_copy_stats
+
+    ad_copy_stats.reset()
+    mock_client.messages.create.return_value = AdCopyCandidates(
+        headlines=["A" * 31, "Grow Your Business", "Start Today", "Save Time Daily"],
+        descriptions=["Boost productivity today.", "Risk-free trial.", "Join us."],
+    )
+
+    ad_variations = generate_polarity_ads(mock_persona, mock_config, overgenerate=True)
+
+    assert ad_variations[0].copy.headlines == [
+        "Grow Your Business",
+        "Start Today",
+        "Save Time Daily",
+    ]
+    assert mock_client.messages.create.call_count == 2
+    call = mock_client.messages.create.call_args.kwargs
+    assert call["response_model"] is AdCopyCandidates
+    assert "candidate headlines" in _prompt_text(call)
+    assert ad_copy_stats.calls_per_ad == 1.0
+    assert ad_copy_stats.retry_rate == 0.0
+    ad_copy_stats.reset()
+
+
+@pytest.mark.asyncio
+@patch("src.generators.ad_copy_generator.async_client")
+@patch("src.generators.ad_copy_generator.client")
+async def test_zero_retries_raise_instead_of_returning_none(
+    mock_client, mock_async_client, mock_persona, mock_config
+):
+    """
+    Tests that max_retries=0 is reported rather than yielding no ad.
+    """
+    from src.generators.ad_copy_generator import agenerate_ad_variation
+
+    with pytest.raises(ValueError, match="max_retries"):
+        generate_polarity_ads(mock_persona, mock_config, max_retries=0)
+    with pytest.raises(ValueError, match="max_retries"):
+        await agenerate_ad_variation(mock_persona, mock_config, "PULL", max_retries=0)
+    mock_client.messages.create.assert_not_called()
+    mock_async_client.messages.create.assert_not_called()
@@ -0,0 +1,129 @@
+# tests/test_ad_performance_table.py
+
+import unittest.mock as mock
+
+import numpy as np
+import pytest
+from google.ads.googleads.errors import GoogleAdsException
+from src.monitoring.ad_performance_table import AdPerformanceTable
+from src.models.ad_performance import AdPerformance
+from src.monitoring.ctr_monitor import CTRMonitor
+
+
+@pytest.fixture
+def table():
+    """Provides a small AdPerformanceTable for tests."""
+    table = AdPerformanceTable()
+    table.append(1, 10, "customers/1/adGroupAds/10~1", 0.02, 150, 3)
+    table.append(2, 10, "customers/1/adGroupAds/10~2", 0.009, 200, 2)
+    table.append(3, 20, "customers/1/adGroupAds/20~3", 0.005, 400, 2)
+    table.append(4, 20, "customers/1/adGroupAds/20~4", 0.01, 300, 3)
+    return table
+
+
+def test_append_and_len(table):
+    assert len(table) == 4
+    assert list(table.ad_ids) == [1, 2, 3, 4]
+    assert list(table.ad_group_ids) == [10, 10, 20, 20]
+    assert table.ctr[1] == 0.009
+
+
+def test_resource_names_are_interned():
+    table = AdPerformanceTable()
+    name = "".join(["customers/1/", "adGroupAds/10~1"])
+    table.append(1, 10, name, 0.02, 150, 3)
+    other = AdPerformanceTable()
+    other.append(1, 10, "".join(["customers/1/adGroupAds/", "10~1"]), 0.02, 150, 3)
+    assert table.resource_names[0] is other.resource_names[0]
+
+
+def test_below_ctr_matches_identify_underperformers(table):
+    monitor = CTRMonitor(client=mock.MagicMock())
+    expected = monitor.identify_underperformers(
+        table.to_ad_performances(), threshold=0.01
+    )
+
+    result = table.below_ctr(0.01)
+
+    assert result.resource_names == expected
+    assert list(result.ad_ids) == [2, 3]
+
+
+def test_where_and_take(table):
+    indices = table.where("impressions", lambda value: value >= 300)
+    assert indices.tolist() == [2, 3]
+    assert list(table.take(indices).clicks) == [2, 3]
+
+
+def test_sort_by(table):
+    result = table.sort_by("ctr")
+    assert list(result.ad_ids) == [3, 2, 4, 1]
+    assert table.argsort("impressions", descending=True).tolist() == [2, 3, 1, 0]
+
+
+def test_column_is_numpy_view(table):
+    ctr = table.column("ctr")
+    assert ctr.dtype == np.float64
+    assert ctr.tolist() == list(table.ctr)
+    assert (table.column("impressions") >= 300).sum() == 2
+
+
+def test_argsort_descending_keeps_ties_in_order():
+    table = AdPerformanceTable()
+    for ad_id, impressions in ((1, 150), (2, 300), (3, 150)):
+        table.append(ad_id, 10, f"resource{ad_id}", 0.01, impressions, 1)
+    assert table.argsort("impressions", descending=True).tolist() == [1, 0, 2]
+
+
+def test_to_ad_performance(table):
+    ad = table.to_ad_performance(0)
+    assert isinstance(ad, AdPerformance)
+    assert ad.ad_id == "1"
+    assert ad.ad_group_ad_resource_name == "customers/1/adGroupAds/10~1"
+    assert ad.impressions == 150
+
+
+def test_from_ads_round_trip():
+    ads = [
+        AdPerformance(
+            ad_id="7",
+            ad_group_ad_resource_name="resource7",
+            ctr=0.03,
+            impressions=120,
+            clicks=4,
+        )
+    ]
+    assert AdPerformanceTable.from_ads(ads).to_ad_performances() == ads
+
+
+def test_check_ad_performance_table():
+    client = mock.MagicMock()
+    service = client.get_service.return_value
+    row = mock.MagicMock()
+    row.ad_group_ad.ad.id = 123
+    row.ad_group.id = 45
+    row.ad_group_ad.resource_name = "customers/1/adGroupAds/45~123"
+    row.metrics.ctr = 0.05
+    row.metrics.impressions = 200
+    row.metrics.clicks = 10
+    service.search_stream.return_value = [mock.MagicMock(results=[row])]
+
+    table = CTRMonitor(client=client).check_ad_performance_table("1", "2")
+
+    assert len(table) == 1
+    assert table.ad_group_ids[0] == 45
+    assert table.resource_names == ["customers/1/adGroupAds/45~123"]
+
+
+def test_check_ad_performance_table_exception():
+    client = mock.MagicMock()
+    client.get_service.return_value.search_stream.side_effect = GoogleAdsException(
+        error=mock.MagicMock(),
+        failure=mock.MagicMock(),
+        request_id="test_request_id",
+        call=mock.MagicMock(),
+    )
+
+    table = CTRMonitor(client=client).check_ad_performance_table("1", "2")
+
+    assert len(table) == 0
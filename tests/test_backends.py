@@ -0,0 +1,133 @@
+"""
+Unit tests for the generator backends.
+"""
+
+import asyncio
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.generators.ad_copy_generator import (
+    DESCRIPTION_MAX_LENGTH,
+    HEADLINE_MAX_LENGTH,
+    KEYWORD_BLOCKLIST,
+)
+from src.generators.backends import LLMBackend, TemplateBackend, make_backend
+from src.generators.pipeline import GenerationPipeline
+from src.models.configuration import CampaignConfiguration
+from src.models.enums import MonetizationModel, VerticalType
+
+EXAMPLES = sorted((Path(__file__).parent.parent / "examples").glob("*.json"))
+
+
+def make_config(offer_name, **overrides):
+    data = dict(
+        vertical_type=VerticalType.SAAS,
+        offer_name=offer_name,
+        target_audience_broad="Developers and engineering managers",
+        value_proposition_primary="Write better code. Ship faster.",
+        monetization_model=MonetizationModel.DIRECT_SALE,
+    )
+    data.update(overrides)
+    return CampaignConfiguration(**data)
+
+
+def assert_valid_copy(ad):
+    for headline in ad.copy.headlines:
+        assert len(headline) <= HEADLINE_MAX_LENGTH
+    for description in ad.copy.descriptions:
+        assert len(description) <= DESCRIPTION_MAX_LENGTH
+    for text in ad.copy.headlines + ad.copy.descriptions:
+        assert not any(blocked in text.lower() for blocked in KEYWORD_BLOCKLIST)
+
+
+@pytest.mark.parametrize("path", EXAMPLES, ids=lambda path: path.stem)
+def test_template_backend_output_is_valid_for_example_configs(path):
+    config = CampaignConfiguration(**json.loads(path.read_text()))
+    backend = TemplateBackend()
+
+    personas = backend.generate_personas(config)
+    assert len(personas.personas) == 3
+    assert len({p.ad_group_name for p in personas.personas}) == 3
+    for persona in personas.personas:
+        ads = backend.generate_polarity_ads(persona, config)
+        assert [ad.angle for ad in ads] == ["PULL", "PUSH"]
+        for ad in ads:
+            assert_valid_copy(ad)
+
+
+def test_template_backend_is_deterministic():
+    config = make_config("CodePilot")
+
+    first = TemplateBackend().generate_personas(config)
+    second = TemplateBackend().generate_personas(config)
+    ads = TemplateBackend().generate_polarity_ads(first.personas[0], config)
+
+    assert first == second
+    assert ads == TemplateBackend().generate_polarity_ads(second.personas[0], config)
+    assert first.personas[0].name == "Busy Developers"
+    assert first.personas[0].ad_group_name == "persona_busy_developers"
+
+
+def test_template_backend_skips_blocked_and_overlong_fields():
+    config = make_config(
+        "Free Code Review Platform For Teams",
+        target_audience_broad="X" * 200,
+        value_proposition_primary="100% guaranteed results",
+    )
+    backend = TemplateBackend()
+
+    persona = backend.generate_personas(config).personas[0]
+    for ad in backend.generate_polarity_ads(persona, config):
+        assert_valid_copy(ad)
+        assert len(ad.copy.headlines) >= 3
+        assert len(ad.copy.descriptions) >= 2
+
+
+@pytest.mark.asyncio
+async def test_pipeline_runs_many_configs_through_template_backend():
+    configs = [make_config(f"Offer {number}") for number in range(200)]
+    pipeline = GenerationPipeline(max_concurrency=64, backend=TemplateBackend())
+
+    results = await pipeline.run(configs)
+
+    assert len(results) == 200 * (1 + 3 * 2)
+    assert not [result for result in results if result.error]
+
+
+@pytest.mark.asyncio
+async def test_llm_backend_delegates_to_generator_modules():
+    config = make_config("CodePilot")
+    persona = TemplateBackend().generate_personas(config).personas[0]
+    with patch(
+        "src.generators.ad_copy_generator.agenerate_ad_variation",
+        new_callable=AsyncMock,
+    ) as generate, patch(
+        "src.generators.streaming.astream_ad_variation", new_callable=AsyncMock
+    ) as stream:
+        await LLMBackend(overgenerate=True).agenerate_polarity_ads(persona, config)
+        await LLMBackend(stream=True).agenerate_ad_variation(persona, config, "PULL")
+
+    assert generate.await_count == 2
+    assert generate.await_args.kwargs["overgenerate"] is True
+    stream.assert_awaited_once_with(persona, config, "PULL", 3, cache=None)
+
+
+def test_make_backend():
+    assert isinstance(make_backend("template"), TemplateBackend)
+    assert make_backend("llm", stream=True).stream
+    with pytest.raises(ValueError):
+        make_backend("unknown")
+
+
+def test_template_backend_async_matches_sync():
+    config = make_config("CodePilot")
+    backend = TemplateBackend()
+
+    personas = asyncio.run(backend.agenerate_personas(config))
+    ads = asyncio.run(backend.agenerate_polarity_ads(personas.personas[0], config))
+
+    assert personas == backend.generate_personas(config)
+    assert ads == backend.generate_polarity_ads(personas.personas[0], config)
@@ -0,0 +1,96 @@
+# tests/test_backtest.py
+
+import numpy as np
+import pytest
+
+from src.budget.golden_ratio_scaler import MAX_DAILY_BUDGET_MICROS
+from src.optimization.backtest import (
+    PersonaRuleVariant,
+    ScalerVariant,
+    backtest_budget_scaling,
+    backtest_persona_rules,
+    make_grid,
+)
+
+MICROS_IN_RUPEE = 1_000_000
+
+
+def test_make_grid_builds_every_combination():
+    grid = make_grid(
+        ScalerVariant, max_daily_change=[0.1, 0.2, 0.3], golden_below=[4.0, 5.0]
+    )
+
+    assert len(grid) == 6
+    assert grid[0] == ScalerVariant(max_daily_change=0.1, golden_below=4.0)
+    assert grid[-1].pause_below == ScalerVariant().pause_below
+
+
+def test_budget_backtest_scales_winner_and_pauses_loser():
+    days = 10
+    budget = 1000 * MICROS_IN_RUPEE
+    budgets = np.full((days, 2), budget)
+    spend = np.full((days, 2), budget)
+    # Campaign 0: CAC 50 -> LTV:CAC 4 (aggressive). Campaign 1: no conversions.
+    conversions = np.tile([20, 0], (days, 1))
+
+    result = backtest_budget_scaling(
+        budgets, spend, conversions, avg_ltv=200, warmup_days=3
+    )
+
+    final = result.final_state[0]
+    # 8 decisions at +20% per day, capped at the daily maximum.
+    assert final[0] == MAX_DAILY_BUDGET_MICROS
+    assert final[1] == 0
+    assert result.paused_count.tolist() == [1]
+    # The paused campaign only spent during warmup.
+    assert result.total_spend_micros[0] > 3 * budget * 2
+
+
+def test_budget_backtest_vectorizes_over_variants():
+    days = 5
+    budget = 1000 * MICROS_IN_RUPEE
+    budgets = np.full((days, 1), budget)
+    spend = np.full((days, 1), budget)
+    conversions = np.full((days, 1), 20)
+    variants = make_grid(ScalerVariant, max_daily_change=[0.1, 0.2])
+
+    result = backtest_budget_scaling(
+        budgets, spend, conversions, avg_ltv=200, variants=variants, warmup_days=1
+    )
+
+    assert result.final_state.shape == (2, 1)
+    assert result.final_state[0, 0] == pytest.approx(budget * 1.1**5, rel=1e-6)
+    assert result.final_state[1, 0] == MAX_DAILY_BUDGET_MICROS
+
+
+def test_persona_backtest_pause_cutoff_variants():
+    days = 10
+    # Ad group 0 never converts and spends 300/day; ad group 1 converts cheaply.
+    cost = np.tile([300 * MICROS_IN_RUPEE, 100 * MICROS_IN_RUPEE], (days, 1))
+    conversions = np.tile([0, 2], (days, 1))
+    variants = make_grid(
+        PersonaRuleVariant,
+        zero_conversion_cutoff_micros=[2000 * MICROS_IN_RUPEE, 5000 * MICROS_IN_RUPEE],
+    )
+
+    result = backtest_persona_rules(
+        cost, conversions, target_cpa_micros=100 * MICROS_IN_RUPEE, variants=variants
+    )
+
+    # Default cutoff pauses after day 7 (2100 > 2000); the higher one never does.
+    assert result.paused_count.tolist() == [1, 0]
+    assert result.total_spend_micros[0] < result.total_spend_micros[1]
+    assert result.best("total_spend_micros") == 0
+
+
+def test_persona_backtest_bid_increase_is_capped():
+    days = 20
+    cost = np.full((days, 1), 100 * MICROS_IN_RUPEE)
+    conversions = np.full((days, 1), 5)
+
+    result = backtest_persona_rules(
+        cost, conversions, target_cpa_micros=50 * MICROS_IN_RUPEE
+    )
+
+    assert result.final_state[0, 0] == pytest.approx(2.0)
+    assert result.paused_count.tolist() == [0]
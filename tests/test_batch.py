@@ -0,0 +1,204 @@
+"""
+Unit tests for Message Batches generation with the local batch backend.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.generators.batch import (
+    AnthropicBatchBackend,
+    BatchGenerator,
+    LocalBatchBackend,
+)
+from src.generators.cache import ResponseCache
+from src.generators.persona_generator import PersonaListSchema
+from src.generators.structured import build_params, parse_message
+from src.models.configuration import CampaignConfiguration
+from src.models.enums import MonetizationModel, VerticalType
+
+PERSONAS = {
+    "personas": [
+        {
+            "name": name,
+            "pain_point": "Pain",
+            "purchase_driver": "Driver",
+            "ad_group_name": f"persona_{name.lower()}",
+        }
+        for name in ("Ann", "Bob", "Cat")
+    ]
+}
+AD_COPY = {
+    "headlines": ["Grow Your Business", "Start Today", "Save Time Daily"],
+    "descriptions": ["Boost productivity today.", "See why teams switched."],
+}
+
+
+def tool_message(payload):
+    return SimpleNamespace(
+        content=[SimpleNamespace(type="tool_use", input=payload)], usage=None
+    )
+
+
+def respond(params):
+    tool = params["tool_choice"]["name"]
+    return tool_message(PERSONAS if tool == "PersonaListSchema" else AD_COPY)
+
+
+@pytest.fixture
+def configs():
+    return [
+        CampaignConfiguration(
+            vertical_type=VerticalType.SERVICE,
+            offer_name=offer,
+            target_audience_broad="Small business owners",
+            value_proposition_primary="Protect your business",
+            monetization_model=MonetizationModel.LEAD_GEN,
+        )
+        for offer in ("Audit", "Training")
+    ]
+
+
+def test_build_and_parse_structured_response():
+    params = build_params({"role": "user", "content": "hi"}, PersonaListSchema)
+
+    assert params["tool_choice"] == {"type": "tool", "name": "PersonaListSchema"}
+    assert params["tools"][0]["input_schema"]["title"] == "PersonaListSchema"
+    assert len(parse_message(tool_message(PERSONAS), PersonaListSchema).personas) == 3
+    with pytest.raises(ValueError):
+        parse_message(SimpleNamespace(content=[]), PersonaListSchema)
+
+
+def test_run_generates_everything_in_two_batches(configs):
+    backend = LocalBatchBackend(respond, polls_until_done=3)
+    sleep = MagicMock()
+    generator = BatchGenerator(backend, poll_seconds=5, sleep=sleep)
+
+    results = generator.run(configs)
+
+    personas = [r for r in results if r.kind == "personas"]
+    ads = [r for r in results if r.kind == "ad"]
+    assert [r.error for r in results] == [None] * 14
+    assert len(personas) == 2 and len(ads) == 12
+    assert {(r.config_index, r.angle) for r in ads} == {
+        (i, angle) for i in (0, 1) for angle in ("PULL", "PUSH")
+    }
+    assert ads[0].value.angle == ads[0].angle
+    assert [len(batch) for batch in backend.submitted] == [2, 12]
+    assert sleep.call_count == 4  # Two extra polls per batch
+    sleep.assert_called_with(5)
+
+
+def test_invalid_responses_are_resubmitted(configs):
+    attempts = {}
+
+    def flaky(params):
+        text = params["messages"][0]["content"]
+        key = str(text)
+        attempts[key] = attempts.get(key, 0) + 1
+        if params["tool_choice"]["name"] == "PersonaListSchema" and attempts[key] == 1:
+            return tool_message({"personas": []})  # Fails validation
+        return respond(params)
+
+    backend = LocalBatchBackend(flaky)
+    results = BatchGenerator(backend, sleep=lambda _: None).run(configs)
+
+    assert all(r.error is None for r in results)
+    assert [len(batch) for batch in backend.submitted] == [2, 2, 12]
+
+
+def test_requests_failing_every_round_report_errors(configs):
+    def failing(params):
+        if "Training" in params["messages"][0]["content"]:
+            raise RuntimeError("overloaded")
+        return respond(params)
+
+    backend = LocalBatchBackend(failing)
+    results = BatchGenerator(backend, max_rounds=2, sleep=lambda _: None).run(configs)
+
+    failed = [r for r in results if r.error]
+    assert [(r.config_index, r.kind, r.error) for r in failed] == [
+        (1, "personas", "overloaded")
+    ]
+    assert len([r for r in results if r.kind == "ad"]) == 6
+    assert [len(batch) for batch in backend.submitted] == [2, 1, 6]
+
+
+def test_invalid_ad_items_are_repaired_in_the_next_round(configs):
+    long_headline = "A Headline Far Too Long For Google Ads"
+
+    def drafts_with_long_headline(params):
+        tool = params["tool_choice"]["name"]
+        if tool == "AdCopyDraft":
+            headlines = AD_COPY["headlines"] + [long_headline]
+            return tool_message({**AD_COPY, "headlines": headlines})
+        if tool == "AdCopyRepair":
+            return tool_message({"headlines": ["Short Headline"]})
+        return respond(params)
+
+    backend = LocalBatchBackend(drafts_with_long_headline)
+    results = BatchGenerator(backend, sleep=lambda _: None).run(configs)
+
+    ads = [r for r in results if r.kind == "ad"]
+    assert all(r.error is None for r in results)
+    assert all(ad.value.copy.headlines[-1] == "Short Headline" for ad in ads)
+    # Only the repairs are sent in the third batch, not whole ad requests
+    assert [len(batch) for batch in backend.submitted] == [2, 12, 12]
+    repair = backend.submitted[2][0]["params"]
+    assert repair["tool_choice"]["name"] == "AdCopyRepair"
+    assert long_headline in repair["messages"][0]["content"]
+
+
+def test_unrepaired_ad_items_are_dropped_after_the_last_round(configs):
+    def never_repaired(params):
+        tool = params["tool_choice"]["name"]
+        if tool == "AdCopyDraft":
+            headlines = AD_COPY["headlines"] + ["Get Started for Free"]
+            return tool_message({**AD_COPY, "headlines": headlines})
+        if tool == "AdCopyRepair":
+            return tool_message({"headlines": ["Still Free Today"]})
+        return respond(params)
+
+    backend = LocalBatchBackend(never_repaired)
+    results = BatchGenerator(backend, max_rounds=3, sleep=lambda _: None).run(configs)
+
+    ads = [r for r in results if r.kind == "ad"]
+    assert all(r.error is None for r in results)
+    assert all(ad.value.copy.headlines == AD_COPY["headlines"] for ad in ads)
+    assert [len(batch) for batch in backend.submitted] == [2, 12, 12, 12]
+
+
+def test_cached_responses_skip_submission(configs, tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite")
+    BatchGenerator(LocalBatchBackend(respond), cache=cache, sleep=lambda _: None).run(
+        configs
+    )
+
+    backend = LocalBatchBackend(respond)
+    results = BatchGenerator(backend, cache=cache, sleep=lambda _: None).run(configs)
+
+    assert backend.submitted == []
+    assert all(r.error is None for r in results)
+
+
+def test_anthropic_backend_maps_batch_results():
+    client = MagicMock()
+    client.messages.batches.create.return_value = SimpleNamespace(id="msgbatch_1")
+    client.messages.batches.retrieve.return_value = SimpleNamespace(
+        processing_status="ended"
+    )
+    message = tool_message(AD_COPY)
+    client.messages.batches.results.return_value = [
+        SimpleNamespace(
+            custom_id="a", result=SimpleNamespace(type="succeeded", message=message)
+        ),
+        SimpleNamespace(custom_id="b", result=SimpleNamespace(type="expired")),
+    ]
+    backend = AnthropicBatchBackend(client)
+
+    assert backend.submit([{"custom_id": "a", "params": {}}]) == "msgbatch_1"
+    assert backend.is_done("msgbatch_1")
+    outcomes = list(backend.results("msgbatch_1"))
+    assert outcomes[0].message is message
+    assert outcomes[1].error == "expired"
@@ -0,0 +1,150 @@
+"""
+Unit tests for the on-disk LLM response cache.
+"""
+
+from typing import List
+from unittest.mock import patch
+
+import pytest
+from pydantic import BaseModel
+
+from src.generators.cache import ResponseCache, make_key
+from src.generators.persona_generator import (
+    MODEL,
+    PersonaListSchema,
+    generate_personas,
+)
+from src.models.configuration import CampaignConfiguration
+from src.models.enums import MonetizationModel, VerticalType
+
+
+class Answer(BaseModel):
+    text: str
+
+
+class OtherAnswer(BaseModel):
+    text: str
+    score: int = 0
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return ResponseCache(tmp_path / "cache.sqlite", clock=clock)
+
+
+def test_key_depends_on_model_prompt_and_schema():
+    key = make_key("model-a", "prompt", Answer)
+
+    assert key == make_key("model-a", "prompt", Answer)
+    assert key != make_key("model-b", "prompt", Answer)
+    assert key != make_key("model-a", "other prompt", Answer)
+    assert key != make_key("model-a", "prompt", OtherAnswer)
+
+
+def test_round_trip_and_hit_counts(cache):
+    key = make_key("m", "p", Answer)
+    assert cache.get(key, Answer) is None
+
+    cache.set(key, Answer(text="hello"))
+
+    assert cache.get(key, Answer) == Answer(text="hello")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_is_shared_between_instances(tmp_path):
+    key = make_key("m", "p", Answer)
+    ResponseCache(tmp_path / "cache.sqlite").set(key, Answer(text="shared"))
+
+    assert ResponseCache(tmp_path / "cache.sqlite").get(key, Answer).text == "shared"
+
+
+def test_ttl_expires_entries(tmp_path, clock):
+    cache = ResponseCache(tmp_path / "cache.sqlite", ttl_seconds=60, clock=clock)
+    cache.set("k", Answer(text="fresh"))
+
+    clock.now += 30
+    assert cache.get("k", Answer) is not None
+    clock.now += 31
+    assert cache.get("k", Answer) is None
+    assert len(cache) == 0
+
+
+def test_bypass_skips_lookups_but_stores(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite", bypass=True)
+    cache.set("k", Answer(text="stored"))
+
+    assert cache.get("k", Answer) is None
+    assert ResponseCache(tmp_path / "cache.sqlite").get("k", Answer).text == "stored"
+
+
+def test_evicts_least_recently_used_over_size_limit(tmp_path, clock):
+    payload_size = len(Answer(text="x" * 10).model_dump_json())
+    cache = ResponseCache(
+        tmp_path / "cache.sqlite", max_bytes=payload_size * 2, clock=clock
+    )
+    for key in ("a", "b"):
+        clock.now += 1
+        cache.set(key, Answer(text="x" * 10))
+    clock.now += 1
+    cache.get("a", Answer)  # "b" is now least recently used
+
+    clock.now += 1
+    cache.set("c", Answer(text="x" * 10))
+
+    assert cache.get("b", Answer) is None
+    assert cache.get("a", Answer) is not None
+    assert cache.get("c", Answer) is not None
+    assert cache.total_bytes() <= payload_size * 2
+
+
+def test_entries_that_no_longer_validate_are_discarded(cache):
+    cache.set("k", Answer(text="old"))
+
+    class Strict(BaseModel):
+        items: List[str]
+
+    assert cache.get("k", Strict) is None
+    assert len(cache) == 0
+
+
+def test_generate_personas_uses_cache(cache):
+    config = CampaignConfiguration(
+        vertical_type=VerticalType.SERVICE,
+        offer_name="Cybersecurity Audit",
+        target_audience_broad="Small business owners",
+        value_proposition_primary="Protect your business from cyber threats",
+        monetization_model=MonetizationModel.LEAD_GEN,
+    )
+    response = PersonaListSchema(
+        personas=[
+            {
+                "name": name,
+                "pain_point": "Pain",
+                "purchase_driver": "Driver",
+                "ad_group_name": f"persona_{name.lower()}",
+            }
+            for name in ("Ann", "Bob", "Cat")
+        ]
+    )
+
+    with patch("src.generators.persona_generator.client") as mock_client:
+        mock_client.messages.create.return_value = response
+        first = generate_personas(config, cache=cache)
+        second = generate_personas(config, cache=cache)
+
+    assert first == second == response
+    mock_client.messages.create.assert_called_once()
+    assert mock_client.messages.create.call_args.kwargs["model"] == MODEL
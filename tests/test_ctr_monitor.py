@@ -185,3 +185,156 @@ def test_pause_underperforming_ads_no_ads(mock_google_ads_client):
 
     # Assert
     mock_ad_group_ad_service.mutate_ad_group_ads.assert_not_called()
+
+
+def _mock_row(ad_id, resource_name, ctr):
+    row = mock.MagicMock()
+    row.ad_group_ad.ad.id = ad_id
+    row.ad_group_ad.resource_name = resource_name
+    row.metrics.ctr = ctr
+    row.metrics.impressions = 200
+    row.metrics.clicks = int(ctr * 200)
+    return row
+
+
+def test_iter_ad_performance_is_lazy(mock_google_ads_client):
+    """Test iter_ad_performance only pulls batches as rows are consumed."""
+    # Arrange
+    mock_service = mock.MagicMock()
+    mock_google_ads_client.get_service.return_value = mock_service
+    pulled = []
+
+    def stream(**kwargs):
+        for i in range(3):
+            pulled.append(i)
+            batch = mock.MagicMock()
+            batch.results = [_mock_row(i, f"resource{i}", 0.02)]
+            yield batch
+
+    mock_service.search_stream.side_effect = stream
+    monitor = CTRMonitor(client=mock_google_ads_client)
+
+    # Act
+    rows = monitor.iter_ad_performance("test_customer", "test_campaign")
+    first = next(rows)
+
+    # Assert
+    assert first.ad_id == "0"
+    assert pulled == [0]
+
+
+def test_pause_underperforming_ads_streaming_chunks(mock_google_ads_client):
+    """Test the streaming pipeline pauses underperformers in fixed-size chunks."""
+    # Arrange
+    mock_service = mock.MagicMock()
+    mock_google_ads_client.get_service.return_value = mock_service
+    mock_google_ads_client.enums.AdGroupAdStatusEnum.PAUSED = "PAUSED"
+    mock_google_ads_client.get_type.side_effect = (
+        lambda name, **kwargs: mock.MagicMock()
+    )
+    events = []
+
+    def stream(**kwargs):
+        for b in range(3):
+            events.append(f"batch{b}")
+            batch = mock.MagicMock()
+            batch.results = [
+                _mock_row(b * 10 + i, f"resource{b}_{i}", 0.005 if i < 2 else 0.05)
+                for i in range(3)
+            ]
+            yield batch
+
+    def mutate(customer_id, operations):
+        events.append(f"mutate{len(operations)}")
+        return mock.MagicMock(results=operations)
+
+    mock_service.search_stream.side_effect = stream
+    mock_service.mutate_ad_group_ads.side_effect = mutate
+    monitor = CTRMonitor(client=mock_google_ads_client)
+
+    # Act
+    paused = monitor.pause_underperforming_ads_streaming(
+        "test_customer", "test_campaign", threshold=0.01, chunk_size=2
+    )
+
+    # Assert
+    assert paused == 6
+    # The first chunk is mutated before later batches are downloaded.
+    assert events == [
+        "batch0",
+        "mutate2",
+        "batch1",
+        "mutate2",
+        "batch2",
+        "mutate2",
+    ]
+    first_ops = mock_service.mutate_ad_group_ads.call_args_list[0][1]["operations"]
+    assert [op.update.resource_name for op in first_ops] == [
+        "resource0_0",
+        "resource0_1",
+    ]
+    assert first_ops[0].update.status == "PAUSED"
+
+
+def test_pause_underperforming_ads_streaming_exception(mock_google_ads_client):
+    """Test the streaming pipeline stops cleanly on GoogleAdsException."""
+    # Arrange
+    mock_service = mock.MagicMock()
+    mock_google_ads_client.get_service.return_value = mock_service
+    mock_service.search_stream.side_effect = GoogleAdsException(
+        error=mock.MagicMock(),
+        failure=mock.MagicMock(),
+        request_id="test_request_id",
+        call=mock.MagicMock(),
+    )
+    monitor = CTRMonitor(client=mock_google_ads_client)
+
+    # Act
+    paused = monitor.pause_underperforming_ads_streaming(
+        "test_customer", "test_campaign"
+    )
+
+    # Assert
+    assert paused == 0
+    mock_service.mutate_ad_group_ads.assert_not_called()
+
+
+def test_plan_pause_underperforming_ads(mock_google_ads_client):
+    """Test planning pauses records changes without any mutate call."""
+    monitor = CTRMonitor(client=mock_google_ads_client)
+
+    plan = monitor.plan_pause_underperforming_ads(
+        "test_customer", ["resource1", "resource2"]
+    )
+
+    mock_google_ads_client.get_service.return_value.mutate_ad_group_ads.assert_not_called()
+    assert [(c.resource_type, c.resource_name, c.new_value) for c in plan.changes] == [
+        ("ad_group_ad", "resource1", "PAUSED"),
+        ("ad_group_ad", "resource2", "PAUSED"),
+    ]
+
+
+def test_pause_underperforming_ads_streaming_with_journal(mock_google_ads_client):
+    """Test a same-day streaming rerun skips ads paused by the first run."""
+    from src.mutations.journal import ActionJournal
+
+    journal = ActionJournal()
+    rows = [
+        mock.MagicMock(
+            ad_group_ad=mock.MagicMock(
+                ad=mock.MagicMock(id=i), resource_name=f"customers/1/adGroupAds/1~{i}"
+            ),
+            metrics=mock.MagicMock(ctr=0.001, impressions=1000, clicks=1),
+        )
+        for i in range(3)
+    ]
+    service = mock_google_ads_client.get_service.return_value
+    service.search_stream.side_effect = lambda **kwargs: [mock.MagicMock(results=rows)]
+    service.mutate_ad_group_ads.side_effect = lambda customer_id, operations: (
+        mock.MagicMock(results=operations)
+    )
+    monitor = CTRMonitor(client=mock_google_ads_client)
+
+    assert monitor.pause_underperforming_ads_streaming("1", "2", journal=journal) == 3
+    assert monitor.pause_underperforming_ads_streaming("1", "2", journal=journal) == 0
+    service.mutate_ad_group_ads.assert_called_once()
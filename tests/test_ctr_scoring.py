@@ -0,0 +1,81 @@
+# tests/test_ctr_scoring.py
+
+import math
+import unittest.mock as mock
+
+import numpy as np
+import pytest
+from src.monitoring.ad_performance_table import AdPerformanceTable
+from src.monitoring.ctr_monitor import CTRMonitor
+from src.monitoring.ctr_scoring import (
+    _normal_cdf,
+    score_ads,
+    select_underperformers,
+    wilson_bounds,
+)
+
+
+def test_normal_cdf_matches_erf():
+    x = np.linspace(-5, 5, 101)
+    expected = np.array([0.5 * (1 + math.erf(v / math.sqrt(2))) for v in x])
+    assert np.allclose(_normal_cdf(x), expected, atol=1e-6)
+
+
+def test_wilson_bounds_known_values():
+    lower, upper = wilson_bounds([10], [100])
+    assert lower[0] == pytest.approx(0.0552, abs=1e-4)
+    assert upper[0] == pytest.approx(0.1744, abs=1e-4)
+
+
+def test_wilson_bounds_zero_impressions():
+    lower, upper = wilson_bounds([0], [0])
+    assert lower[0] == 0.0
+    assert upper[0] == 1.0
+
+
+def test_low_volume_zero_click_ad_is_not_paused():
+    """An ad with 101 impressions and 0 clicks is not yet a proven loser."""
+    scores = score_ads([0], [101], [1], threshold=0.01)
+    assert scores.prob_below_threshold[0] < 0.95
+    assert not select_underperformers(scores)[0]
+
+
+def test_proven_loser_is_paused():
+    """A high-volume ad well below threshold is paused."""
+    clicks = [20, 600]
+    impressions = [10_000, 20_000]
+    scores = score_ads(clicks, impressions, [1, 1], threshold=0.01)
+    mask = select_underperformers(scores)
+    assert mask.tolist() == [True, False]
+
+
+def test_uniformly_weak_ad_group_is_not_emptied():
+    """Siblings with identical weak CTR are not paused relative to each other."""
+    scores = score_ads([20, 20], [10_000, 10_000], [1, 1], threshold=0.01)
+    assert (scores.prob_below_threshold > 0.95).all()
+    assert not select_underperformers(scores).any()
+    assert select_underperformers(scores, relative_to_siblings=False).all()
+
+
+def test_siblings_are_pooled_per_ad_group():
+    scores = score_ads([10, 30, 100], [1000, 1000, 1000], [1, 1, 2])
+    assert scores.sibling_ctr[:2].tolist() == pytest.approx([0.03, 0.01])
+    assert np.isnan(scores.sibling_ctr[2])
+    assert scores.group_size.tolist() == [2, 2, 1]
+
+
+def test_identify_underperformers_scored():
+    table = AdPerformanceTable()
+    table.append(1, 10, "low_volume", 0.0, 101, 0)
+    table.append(2, 10, "proven_loser", 0.002, 10_000, 20)
+    table.append(3, 10, "winner", 0.03, 20_000, 600)
+    monitor = CTRMonitor(client=mock.MagicMock())
+
+    result = monitor.identify_underperformers_scored(table, threshold=0.01)
+
+    assert result == ["proven_loser"]
+
+
+def test_identify_underperformers_scored_empty_table():
+    monitor = CTRMonitor(client=mock.MagicMock())
+    assert monitor.identify_underperformers_scored(AdPerformanceTable()) == []
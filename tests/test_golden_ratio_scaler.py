@@ -1,5 +1,6 @@
 # tests/test_golden_ratio_scaler.py
 
+import numpy as np
 import pytest
 from src.budget.golden_ratio_scaler import GoldenRatioScaler
 
@@ -121,3 +122,52 @@ def test_decrease_logic_is_not_triggered(scaler):
 
     # There's no LTV:CAC that results in a scaling factor between 0 and 1,
     # so the gradual decrease path is never taken.
+
+
+# Equivalence tests for the batch (array) API
+BOUNDARY_RATIOS = [0.0, 0.999, 1.0, 2.999, 3.0, 3.999, 4.0, 10.0, float("inf")]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_calculate_ltv_cac_ratio_batch_matches_scalar(scaler, seed):
+    rng = np.random.default_rng(seed)
+    n = 2000
+    conversions = rng.integers(0, 50, size=n)
+    conversions[:100] = 0
+    spend = rng.integers(0, 50_000, size=n) * rng.integers(1, 1_000_000, size=n)
+    spend[100:200] = 0
+    avg_ltv = rng.uniform(0, 1000, size=n)
+
+    batch = scaler.calculate_ltv_cac_ratio_batch(conversions, spend, avg_ltv)
+
+    expected = [
+        scaler.calculate_ltv_cac_ratio(int(c), int(s), float(ltv))
+        for c, s, ltv in zip(conversions, spend, avg_ltv)
+    ]
+    assert batch.tolist() == expected
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_get_scaling_factor_batch_matches_scalar(scaler, seed):
+    rng = np.random.default_rng(seed)
+    ratios = np.concatenate([rng.uniform(0, 6, size=2000), BOUNDARY_RATIOS])
+
+    batch = scaler.get_scaling_factor_batch(ratios)
+
+    assert batch.tolist() == [scaler.get_scaling_factor(float(r)) for r in ratios]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_calculate_new_budget_batch_matches_scalar(scaler, seed):
+    rng = np.random.default_rng(seed)
+    n = 2000
+    budgets = rng.integers(0, 5000 * MICROS_IN_RUPEE, size=n + len(BOUNDARY_RATIOS))
+    budgets[:10] = MAX_BUDGET
+    ratios = np.concatenate([rng.uniform(0, 6, size=n), BOUNDARY_RATIOS])
+
+    batch = scaler.calculate_new_budget_batch(budgets, ratios)
+
+    assert batch.dtype == np.int64
+    assert batch.tolist() == [
+        scaler.calculate_new_budget(int(b), float(r)) for b, r in zip(budgets, ratios)
+    ]
@@ -0,0 +1,72 @@
+# tests/test_journal.py
+
+from datetime import date
+
+import pytest
+
+from src.mutations.journal import ACTION_INCREASE_BID, ACTION_PAUSE, ActionJournal
+
+
+class FakeClock:
+    def __init__(self, today):
+        self.today = today
+
+    def __call__(self):
+        return self.today
+
+
+def test_pause_is_recorded_per_day():
+    clock = FakeClock(date(2024, 1, 1))
+    journal = ActionJournal(clock=clock)
+
+    journal.record(["ad1"], ACTION_PAUSE)
+
+    assert journal.has_action("ad1", ACTION_PAUSE)
+    assert journal.pending(["ad1", "ad2", "ad2"], ACTION_PAUSE) == ["ad2"]
+    clock.today = date(2024, 1, 2)
+    assert not journal.has_action("ad1", ACTION_PAUSE)
+
+
+def test_bid_increases_are_capped_per_day():
+    journal = ActionJournal(
+        max_daily_bid_increase=0.20, clock=FakeClock(date(2024, 1, 1))
+    )
+
+    assert journal.allowed_increase("ag1", 0.20) == pytest.approx(0.20)
+    journal.record(["ag1"], ACTION_INCREASE_BID, 0.10)
+    # 1.1 * (1 + x) = 1.2
+    assert journal.allowed_increase("ag1", 0.20) == pytest.approx(1.2 / 1.1 - 1)
+    journal.record(["ag1"], ACTION_INCREASE_BID, journal.allowed_increase("ag1", 0.2))
+    assert journal.cumulative_delta("ag1", ACTION_INCREASE_BID) == pytest.approx(0.2)
+    assert journal.allowed_increase("ag1", 0.20) == 0.0
+
+
+def test_journal_persists_and_prunes_old_days(tmp_path):
+    path = tmp_path / "journal.json"
+    clock = FakeClock(date(2024, 1, 1))
+    journal = ActionJournal(path, retention_days=7, clock=clock)
+    journal.record(["ad1"], ACTION_PAUSE)
+
+    reloaded = ActionJournal(path, clock=clock)
+    assert reloaded.has_action("ad1", ACTION_PAUSE)
+
+    clock.today = date(2024, 1, 10)
+    reloaded.record(["ad2"], ACTION_PAUSE)
+    assert "2024-01-01" not in ActionJournal(path, clock=clock)._entries
+
+
+def test_journal_is_written_atomically(tmp_path):
+    path = tmp_path / "journal.json"
+    journal = ActionJournal(path, clock=FakeClock(date(2024, 1, 1)))
+
+    journal.record(["ad1"], ACTION_PAUSE)
+
+    assert [p.name for p in tmp_path.iterdir()] == ["journal.json"]
+
+
+def test_corrupt_journal_raises(tmp_path):
+    path = tmp_path / "journal.json"
+    path.write_text('{"2024-01-01": {"pause"')
+
+    with pytest.raises(ValueError, match="corrupt"):
+        ActionJournal(path)
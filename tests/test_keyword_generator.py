@@ -118,6 +118,37 @@ class TestKeywordGeneration:
         for keyword in keywords:
             assert keyword.text.strip(), "Keyword text should not be empty"
 
+    def test_keywords_ranked_by_adjacency_and_offer_overlap(self, saas_config):
+        """Offer name first, then verbatim phrases above looser pairs."""
+        keyword_texts = [k.text for k in generate_keywords(saas_config)]
+
+        assert keyword_texts[0] == "crm tool"
+        assert keyword_texts.index("close more deals") < keyword_texts.index(
+            "close deals"
+        )
+        # Phrases never span the offer name and value proposition
+        assert "crm tool close" not in keyword_texts
+
+    def test_long_value_proposition_is_bounded(self, saas_config):
+        """A long seed text still yields at most 30 keywords, quickly."""
+        long_config = saas_config.model_copy(
+            update={
+                "value_proposition_primary": " ".join(
+                    f"benefit{i}" for i in range(5000)
+                )
+            }
+        )
+        keywords = generate_keywords(long_config)
+
+        assert len(keywords) == 30
+        assert len({k.text for k in keywords}) == 30
+
+    def test_max_keywords_limit(self, saas_config):
+        """The max_keywords argument caps the result."""
+        keywords = generate_keywords(saas_config, max_keywords=12)
+        assert len(keywords) == 12
+        assert keywords[0].text == "crm tool"
+
 
 class TestKeywordModel:
     """Test the Keyword dataclass/model."""
@@ -0,0 +1,60 @@
+# tests/test_operation_factory.py
+
+from unittest.mock import MagicMock
+
+import pytest
+from google.ads.googleads.client import GoogleAdsClient
+
+from src.mutations.operation_factory import OperationFactory
+
+
+@pytest.fixture
+def client():
+    """A real (offline) client, so operations are genuine proto messages."""
+    return GoogleAdsClient(
+        credentials=None, developer_token="test", use_proto_plus=True
+    )
+
+
+def test_update_sets_mask_and_returns_independent_copies(client):
+    factory = OperationFactory(client)
+
+    first = factory.update("AdGroupCriterionOperation", ["cpc_bid_micros"])
+    second = factory.update("AdGroupCriterionOperation", ["cpc_bid_micros"])
+    first.update.cpc_bid_micros = 100
+
+    assert list(first.update_mask.paths) == ["cpc_bid_micros"]
+    assert list(second.update_mask.paths) == ["cpc_bid_micros"]
+    assert second.update.cpc_bid_micros == 0
+    assert first is not second
+
+
+def test_update_matches_hand_built_operation(client):
+    factory = OperationFactory(client)
+    expected = client.get_type("AdGroupAdOperation")
+    expected.update.resource_name = "customers/1/adGroupAds/2~3"
+    expected.update.status = client.enums.AdGroupAdStatusEnum.PAUSED
+    expected.update_mask.paths.append("status")
+
+    operation = factory.update("AdGroupAdOperation", ["status"])
+    operation.update.resource_name = "customers/1/adGroupAds/2~3"
+    operation.update.status = client.enums.AdGroupAdStatusEnum.PAUSED
+
+    assert operation == expected
+
+
+def test_templates_are_cached_per_type_and_paths():
+    client = MagicMock()
+    factory = OperationFactory(client)
+
+    factory.update("CampaignOperation", ["status"])
+    factory.update("CampaignOperation", ["status"])
+    factory.update("CampaignOperation", ["name"])
+    factory.create("CampaignOperation")
+
+    assert client.get_type.call_count == 3
+
+
+def test_create_has_no_update_mask(client):
+    operation = OperationFactory(client).create("AdGroupOperation")
+    assert list(operation.update_mask.paths) == []
@@ -1,6 +1,8 @@
 import unittest
 from unittest.mock import MagicMock, patch
 
+from src.monitoring.snapshots import SnapshotStore
+from src.mutations.journal import ACTION_INCREASE_BID, ActionJournal
 from src.optimization.persona_optimizer import PersonaOptimizer
 
 
@@ -190,6 +192,370 @@ class TestPersonaOptimizer(unittest.TestCase):
         updated_campaign = sent_operations[0].update
         self.assertEqual(updated_campaign.maximize_clicks.cpc_bid_limit_micros, 1200000)
 
+    def test_identify_personas_with_snapshots_skips_unchanged(self):
+        """Test that snapshots limit evaluation to ad groups whose metrics changed."""
+        store = SnapshotStore()
+        self.optimizer._get_campaign_details = MagicMock(
+            return_value={"target_cpa_micros": 10000000}
+        )
+        performance = [
+            {
+                "ad_group_id": "1",
+                "cost_per_conversion": 15000000,
+                "conversions": 2,
+                "cost_micros": 30000000,
+            },
+            {
+                "ad_group_id": "2",
+                "cost_per_conversion": 8000000,
+                "conversions": 5,
+                "cost_micros": 40000000,
+            },
+        ]
+        self.optimizer._get_ad_group_performance = MagicMock(return_value=performance)
+
+        args = (self.customer_id, self.campaign_id)
+        self.assertEqual(
+            self.optimizer.identify_losing_personas(*args, snapshots=store), ["1"]
+        )
+        self.assertEqual(
+            self.optimizer.identify_winning_personas(*args, snapshots=store), ["2"]
+        )
+        # Flagged ad groups stay staged until their mutate succeeds.
+        self.assertEqual(
+            self.optimizer.identify_losing_personas(*args, snapshots=store), ["1"]
+        )
+        self.optimizer.pause_ad_groups(self.customer_id, ["1"], snapshots=store)
+        store.commit_staged(f"winning:{self.customer_id}", ["2"])
+        self.assertEqual(
+            self.optimizer.identify_losing_personas(*args, snapshots=store), []
+        )
+        self.assertEqual(
+            self.optimizer.identify_winning_personas(*args, snapshots=store), []
+        )
+
+        performance[1] = dict(performance[1], conversions=6, cost_micros=48000000)
+        self.assertEqual(
+            self.optimizer.identify_winning_personas(*args, snapshots=store), ["2"]
+        )
+
+    def test_pause_ad_groups_single_mutate(self):
+        """Test pausing several ad groups sends one mutate request."""
+        mock_ad_group_service = self.mock_client.get_service.return_value
+        mock_ad_group_service.ad_group_path.side_effect = (
+            lambda customer_id, ad_group_id: f"customers/{customer_id}/adGroups/{ad_group_id}"
+        )
+        self.mock_client.get_type.side_effect = lambda name, **kwargs: MagicMock()
+
+        self.optimizer.pause_ad_groups(self.customer_id, ["1", "2", "2", "3"])
+
+        mock_ad_group_service.mutate_ad_groups.assert_called_once()
+        operations = mock_ad_group_service.mutate_ad_groups.call_args.kwargs[
+            "operations"
+        ]
+        self.assertEqual(
+            [op.update.resource_name for op in operations],
+            [f"customers/{self.customer_id}/adGroups/{i}" for i in ("1", "2", "3")],
+        )
+
+    def test_pause_ad_groups_empty(self):
+        """Test pausing an empty list makes no API call."""
+        self.optimizer.pause_ad_groups(self.customer_id, [])
+        self.mock_client.get_service.return_value.mutate_ad_groups.assert_not_called()
+
+    def test_increase_bids_bulk(self):
+        """Test bulk bid increases use one details query and grouped mutates."""
+        bidding_strategy_enum = (
+            self.mock_client.get_type.return_value.BiddingStrategyType
+        )
+        service = self.mock_client.get_service.return_value
+
+        def detail_row(ad_group_id, campaign_id, strategy, limit=0):
+            return MagicMock(
+                ad_group=MagicMock(id=ad_group_id),
+                campaign=MagicMock(
+                    id=campaign_id,
+                    bidding_strategy_type=strategy,
+                    maximize_clicks=MagicMock(cpc_bid_limit_micros=limit),
+                ),
+            )
+
+        def criterion_row(campaign_id, resource_name, bid):
+            return MagicMock(
+                campaign=MagicMock(id=campaign_id),
+                ad_group_criterion=MagicMock(
+                    resource_name=resource_name, cpc_bid_micros=bid
+                ),
+            )
+
+        details_batch = MagicMock(
+            results=[
+                detail_row(1, 100, bidding_strategy_enum.MANUAL_CPC),
+                detail_row(2, 200, bidding_strategy_enum.MANUAL_CPC),
+                detail_row(3, 300, bidding_strategy_enum.MAXIMIZE_CLICKS, 1000000),
+                detail_row(4, 300, bidding_strategy_enum.MAXIMIZE_CLICKS, 1000000),
+            ]
+        )
+        criteria_batch = MagicMock(
+            results=[
+                criterion_row(100, "kw1", 100000),
+                criterion_row(100, "kw2", 200000),
+                criterion_row(200, "kw3", 300000),
+            ]
+        )
+        service.search_stream.side_effect = [[details_batch], [criteria_batch]]
+
+        self.optimizer.increase_bids_bulk(self.customer_id, ["1", "2", "3", "4"])
+
+        self.assertEqual(service.search_stream.call_count, 2)
+        details_query = service.search_stream.call_args_list[0].kwargs["query"]
+        self.assertIn("ad_group.id IN (1, 2, 3, 4)", details_query)
+        # One criteria mutate per campaign.
+        self.assertEqual(service.mutate_ad_group_criteria.call_count, 2)
+        # Both Maximize Clicks ad groups share one campaign: raised once.
+        service.mutate_campaigns.assert_called_once()
+        campaign_ops = service.mutate_campaigns.call_args.kwargs["operations"]
+        self.assertEqual(len(campaign_ops), 1)
+        self.assertEqual(
+            campaign_ops[0].update.maximize_clicks.cpc_bid_limit_micros, 1200000
+        )
+
+    def test_plan_increase_bids_records_old_and_new_values(self):
+        """Test planning bid increases issues reads only and records changes."""
+        bidding_strategy_enum = (
+            self.mock_client.get_type.return_value.BiddingStrategyType
+        )
+        service = self.mock_client.get_service.return_value
+        service.campaign_path.side_effect = lambda c, i: f"customers/{c}/campaigns/{i}"
+        details_batch = MagicMock(
+            results=[
+                MagicMock(
+                    ad_group=MagicMock(id=1),
+                    campaign=MagicMock(
+                        id=100, bidding_strategy_type=bidding_strategy_enum.MANUAL_CPC
+                    ),
+                ),
+                MagicMock(
+                    ad_group=MagicMock(id=2),
+                    campaign=MagicMock(
+                        id=200,
+                        bidding_strategy_type=bidding_strategy_enum.MAXIMIZE_CLICKS,
+                        maximize_clicks=MagicMock(cpc_bid_limit_micros=1000000),
+                    ),
+                ),
+            ]
+        )
+        criteria_batch = MagicMock(
+            results=[
+                MagicMock(
+                    campaign=MagicMock(id=100),
+                    ad_group=MagicMock(id=1),
+                    ad_group_criterion=MagicMock(
+                        resource_name="kw1", cpc_bid_micros=100000
+                    ),
+                )
+            ]
+        )
+        service.search_stream.side_effect = [[details_batch], [criteria_batch]]
+
+        plan = self.optimizer.plan_increase_bids(self.customer_id, ["1", "2"])
+
+        service.mutate_ad_group_criteria.assert_not_called()
+        service.mutate_campaigns.assert_not_called()
+        self.assertEqual(
+            [
+                (c.resource_name, c.field, c.old_value, c.new_value)
+                for c in plan.changes
+            ],
+            [
+                ("kw1", "cpc_bid_micros", 100000, 120000),
+                (
+                    f"customers/{self.customer_id}/campaigns/200",
+                    "maximize_clicks.cpc_bid_limit_micros",
+                    1000000,
+                    1200000,
+                ),
+            ],
+        )
+        self.assertEqual(
+            [(c.journal_key, c.journal_action, c.journal_delta) for c in plan.changes],
+            [
+                (
+                    f"customers/{self.customer_id}/adGroups/1",
+                    ACTION_INCREASE_BID,
+                    0.20,
+                ),
+                (
+                    f"customers/{self.customer_id}/campaigns/200",
+                    ACTION_INCREASE_BID,
+                    0.20,
+                ),
+            ],
+        )
+
+    def test_plan_pause_ad_groups(self):
+        """Test planning pauses makes no API call and dedupes ad groups."""
+        service = self.mock_client.get_service.return_value
+        service.ad_group_path.side_effect = lambda c, i: f"customers/{c}/adGroups/{i}"
+
+        plan = self.optimizer.plan_pause_ad_groups(self.customer_id, ["1", "2", "1"])
+
+        service.mutate_ad_groups.assert_not_called()
+        self.assertEqual(
+            [c.resource_name for c in plan.changes],
+            [
+                f"customers/{self.customer_id}/adGroups/1",
+                f"customers/{self.customer_id}/adGroups/2",
+            ],
+        )
+        self.assertEqual(plan.summary(), {"update ad_group.status": 2})
+
+    def test_plan_with_journal_applies_daily_limits(self):
+        """Test plans skip today's pauses and cap bid increases like mutates do."""
+        journal = ActionJournal()
+        journal.record([f"customers/{self.customer_id}/adGroups/1"], "pause")
+        journal.record(
+            [f"customers/{self.customer_id}/campaigns/200"], ACTION_INCREASE_BID, 0.20
+        )
+        bidding_strategy_enum = (
+            self.mock_client.get_type.return_value.BiddingStrategyType
+        )
+        service = self.mock_client.get_service.return_value
+        service.ad_group_path.side_effect = lambda c, i: f"customers/{c}/adGroups/{i}"
+        service.search_stream.side_effect = lambda **kwargs: [
+            MagicMock(
+                results=[
+                    MagicMock(
+                        ad_group=MagicMock(id=2),
+                        campaign=MagicMock(
+                            id=200,
+                            bidding_strategy_type=bidding_strategy_enum.MAXIMIZE_CLICKS,
+                            maximize_clicks=MagicMock(cpc_bid_limit_micros=1000000),
+                        ),
+                    )
+                ]
+            )
+        ]
+
+        plan = self.optimizer.plan_pause_ad_groups(
+            self.customer_id, ["1", "2"], journal=journal
+        )
+        self.optimizer.plan_increase_bids(
+            self.customer_id, ["2"], plan=plan, journal=journal
+        )
+
+        self.assertEqual(
+            [c.resource_name for c in plan.changes],
+            [f"customers/{self.customer_id}/adGroups/2"],
+        )
+
+    def test_pause_ad_groups_with_journal_skips_repeats(self):
+        """Test a same-day rerun with a journal sends no second pause."""
+        journal = ActionJournal()
+        service = self.mock_client.get_service.return_value
+
+        self.optimizer.pause_ad_groups(self.customer_id, ["1", "2"], journal=journal)
+        self.optimizer.pause_ad_groups(self.customer_id, ["2", "3"], journal=journal)
+
+        self.assertEqual(service.mutate_ad_groups.call_count, 2)
+        second_ops = service.mutate_ad_groups.call_args.kwargs["operations"]
+        self.assertEqual(len(second_ops), 1)
+
+    def test_increase_bids_bulk_with_journal_does_not_compound(self):
+        """Test a same-day rerun with a journal does not raise bids again."""
+        journal = ActionJournal()
+        bidding_strategy_enum = (
+            self.mock_client.get_type.return_value.BiddingStrategyType
+        )
+        service = self.mock_client.get_service.return_value
+        details_batch = MagicMock(
+            results=[
+                MagicMock(
+                    ad_group=MagicMock(id=1),
+                    campaign=MagicMock(
+                        id=300,
+                        bidding_strategy_type=bidding_strategy_enum.MAXIMIZE_CLICKS,
+                        maximize_clicks=MagicMock(cpc_bid_limit_micros=1000000),
+                    ),
+                )
+            ]
+        )
+        service.search_stream.side_effect = lambda **kwargs: [details_batch]
+
+        self.optimizer.increase_bids_bulk(self.customer_id, ["1"], journal=journal)
+        self.optimizer.increase_bids_bulk(self.customer_id, ["1"], journal=journal)
+
+        service.mutate_campaigns.assert_called_once()
+
+    def test_increase_bids_bulk_journals_campaigns_before_a_failure(self):
+        """Test keyword bids mutated before a failing campaign stay journaled."""
+        journal = ActionJournal()
+        bidding_strategy_enum = (
+            self.mock_client.get_type.return_value.BiddingStrategyType
+        )
+        service = self.mock_client.get_service.return_value
+        details_batch = MagicMock(
+            results=[
+                MagicMock(
+                    ad_group=MagicMock(id=ad_group_id),
+                    campaign=MagicMock(
+                        id=campaign_id,
+                        bidding_strategy_type=bidding_strategy_enum.MANUAL_CPC,
+                    ),
+                )
+                for ad_group_id, campaign_id in ((1, 100), (2, 200))
+            ]
+        )
+        criteria_batch = MagicMock(
+            results=[
+                MagicMock(
+                    campaign=MagicMock(id=campaign_id),
+                    ad_group=MagicMock(id=ad_group_id),
+                    ad_group_criterion=MagicMock(
+                        resource_name=f"kw{ad_group_id}", cpc_bid_micros=100000
+                    ),
+                )
+                for ad_group_id, campaign_id in ((1, 100), (2, 200))
+            ]
+        )
+        service.search_stream.side_effect = [[details_batch], [criteria_batch]]
+        service.mutate_ad_group_criteria.side_effect = [None, RuntimeError("boom")]
+
+        with self.assertRaises(RuntimeError):
+            self.optimizer.increase_bids_bulk(
+                self.customer_id, ["1", "2"], journal=journal
+            )
+
+        self.assertAlmostEqual(
+            journal.cumulative_delta(
+                f"customers/{self.customer_id}/adGroups/1", ACTION_INCREASE_BID
+            ),
+            0.20,
+        )
+        self.assertFalse(
+            journal.has_action(
+                f"customers/{self.customer_id}/adGroups/2", ACTION_INCREASE_BID
+            )
+        )
+
+    def test_increase_bids_manual_cpc_without_keywords_is_not_journaled(self):
+        """Test no bid increase is recorded when no keyword bids were updated."""
+        journal = ActionJournal()
+        bidding_strategy_enum = (
+            self.mock_client.get_type.return_value.BiddingStrategyType
+        )
+        self.optimizer._get_ad_group_details = MagicMock(
+            return_value={"bidding_strategy_type": bidding_strategy_enum.MANUAL_CPC}
+        )
+        service = self.mock_client.get_service.return_value
+        service.search_stream.return_value = [MagicMock(results=[])]
+
+        self.optimizer.increase_bids(self.customer_id, "1", journal=journal)
+
+        service.mutate_ad_group_criteria.assert_not_called()
+        key = f"customers/{self.customer_id}/adGroups/1"
+        self.assertEqual(journal.cumulative_delta(key, ACTION_INCREASE_BID), 0.0)
+
 
 if __name__ == "__main__":
     unittest.main()
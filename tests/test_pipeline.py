@@ -0,0 +1,177 @@
+# tests/test_pipeline.py
+
+import asyncio
+
+import pytest
+
+from src.generators.ad_copy_generator import AdCopySchema, AdVariation
+from src.generators.persona_generator import PersonaListSchema, PersonaSchema
+from src.generators.pipeline import AdaptiveLimiter, GenerationPipeline
+from src.models.configuration import CampaignConfiguration
+from src.models.enums import MonetizationModel, VerticalType
+from src.telemetry.llm import telemetry
+
+AD_COPY = AdCopySchema(
+    headlines=["Unlock Potential", "Achieve Goals", "Success Awaits"],
+    descriptions=["Our tool helps you succeed.", "Join thousands of happy users."],
+)
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def make_config(offer_name):
+    return CampaignConfiguration(
+        vertical_type=VerticalType.SAAS,
+        offer_name=offer_name,
+        target_audience_broad="Developers",
+        value_proposition_primary="Write better code.",
+        monetization_model=MonetizationModel.DIRECT_SALE,
+    )
+
+
+def make_personas(prefix):
+    return PersonaListSchema(
+        personas=[
+            PersonaSchema(
+                name=f"{prefix} {i}",
+                pain_point="Pain",
+                purchase_driver="Driver",
+                ad_group_name="persona_test",
+            )
+            for i in range(3)
+        ]
+    )
+
+
+class FakeGenerators:
+    def __init__(self, delay=0.01, fail_offer=None, rate_limit_first=0):
+        self.delay = delay
+        self.fail_offer = fail_offer
+        self.rate_limit_first = rate_limit_first
+        self.in_flight = 0
+        self.peak = 0
+
+    async def _enter(self):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+
+    async def personas(self, config):
+        await self._enter()
+        if config.offer_name == self.fail_offer:
+            raise ValueError("bad personas")
+        return make_personas(config.offer_name)
+
+    async def ad(self, persona, config, angle, max_retries):
+        await self._enter()
+        if self.rate_limit_first:
+            self.rate_limit_first -= 1
+            raise RateLimitError("slow down")
+        return AdVariation(angle=angle, copy=AD_COPY)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_runs_all_jobs_under_concurrency_cap():
+    fake = FakeGenerators()
+    pipeline = GenerationPipeline(
+        max_concurrency=4, generate_personas=fake.personas, generate_ad=fake.ad
+    )
+    configs = [make_config(f"Offer{c}") for c in "abcde"]
+
+    results = await pipeline.run(configs)
+
+    # 5 persona calls + 5 configs x 3 personas x 2 angles.
+    assert len(results) == 35
+    assert sum(r.kind == "ad" for r in results) == 30
+    assert all(r.error is None for r in results)
+    assert fake.peak <= 4
+    stats = pipeline.stats.summary()
+    assert stats["jobs"] == 35
+    assert stats["peak_concurrency"] == 4
+    assert stats["jobs_per_second"] > 0
+    assert len(pipeline.stats.config_latencies) == 5
+
+
+@pytest.mark.asyncio
+async def test_pipeline_streams_results_as_they_complete():
+    fake = FakeGenerators()
+    pipeline = GenerationPipeline(generate_personas=fake.personas, generate_ad=fake.ad)
+
+    stream = pipeline.stream([make_config("Offer")])
+    first = await stream.__anext__()
+    assert first.kind == "personas"
+    remaining = [result async for result in stream]
+    assert {(r.persona.name, r.angle) for r in remaining} == {
+        (f"Offer {i}", angle) for i in range(3) for angle in ("PULL", "PUSH")
+    }
+
+
+@pytest.mark.asyncio
+async def test_failed_config_does_not_stop_others():
+    fake = FakeGenerators(fail_offer="Bad")
+    pipeline = GenerationPipeline(generate_personas=fake.personas, generate_ad=fake.ad)
+
+    results = await pipeline.run([make_config("Bad"), make_config("Good")])
+
+    failed = [r for r in results if r.error]
+    assert [(r.config_index, r.kind) for r in failed] == [(0, "personas")]
+    assert sum(r.kind == "ad" for r in results) == 6
+
+
+@pytest.mark.asyncio
+async def test_rate_limits_back_off_and_shrink_concurrency():
+    fake = FakeGenerators(rate_limit_first=2)
+    pipeline = GenerationPipeline(
+        max_concurrency=8,
+        backoff_seconds=0.001,
+        generate_personas=fake.personas,
+        generate_ad=fake.ad,
+    )
+
+    results = await pipeline.run([make_config("Offer")])
+
+    assert all(r.error is None for r in results)
+    assert pipeline.stats.rate_limited == 2
+    assert pipeline.limiter.limit < 8
+
+
+@pytest.mark.asyncio
+async def test_stats_count_llm_calls_separately_from_jobs():
+    fake = FakeGenerators(delay=0)
+
+    async def ad_with_repair(persona, config, angle, max_retries):
+        # A draft and a repair call behind one ad job
+        for operation in ("ad_copy", "ad_copy_repair"):
+            with telemetry.track(operation, "test-model"):
+                await asyncio.sleep(0)
+        return await fake.ad(persona, config, angle, max_retries)
+
+    async def personas(config):
+        with telemetry.track("personas", "test-model"):
+            return await fake.personas(config)
+
+    pipeline = GenerationPipeline(
+        max_concurrency=4, generate_personas=personas, generate_ad=ad_with_repair
+    )
+
+    await pipeline.run([make_config("Offer")])
+
+    assert pipeline.stats.jobs == 7
+    assert pipeline.stats.llm_calls == 1 + 6 * 2
+    assert pipeline.stats.summary()["llm_calls_per_job"] == pytest.approx(13 / 7)
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limiter_aimd():
+    limiter = AdaptiveLimiter(max_concurrency=8, initial_concurrency=4)
+
+    await limiter.acquire()
+    await limiter.release(rate_limited=True)
+    assert limiter.limit == 2
+    for _ in range(4):
+        await limiter.acquire()
+        await limiter.release()
+    assert limiter.limit == 3
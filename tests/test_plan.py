@@ -0,0 +1,287 @@
+# tests/test_plan.py
+
+from unittest.mock import MagicMock
+
+import pytest
+from google.ads.googleads.client import GoogleAdsClient
+
+from src.models.persona import Persona
+from src.mutations.journal import ACTION_INCREASE_BID, ACTION_PAUSE, ActionJournal
+from src.mutations.plan import MutationPlan, apply_plan
+from src.tools.create_campaign import plan_growth_tier_campaign
+
+
+@pytest.fixture
+def client():
+    """A real (offline) client with a mocked GoogleAdsService."""
+    client = GoogleAdsClient(
+        credentials=None, developer_token="test", use_proto_plus=True
+    )
+    service = MagicMock()
+    service.mutate.side_effect = lambda request: _echo_response(client, request)
+    client.get_service = MagicMock(return_value=service)
+    return client
+
+
+def _echo_response(client, request):
+    """Builds a response naming each operation's resource, like the API does."""
+    response = client.get_type("MutateGoogleAdsResponse")
+    for mutate_operation in request.mutate_operations:
+        name = type(mutate_operation).pb(mutate_operation).WhichOneof("operation")
+        operation = getattr(mutate_operation, name)
+        message = operation.update if "update" in operation else operation.create
+        result = client.get_type("MutateOperationResponse")
+        getattr(
+            result, name.replace("_operation", "_result")
+        ).resource_name = message.resource_name
+        response.mutate_operation_responses.append(result)
+    return response
+
+
+def test_plan_round_trips_through_json(tmp_path):
+    plan = MutationPlan()
+    plan.add("1", "ad_group", "customers/1/adGroups/2", "status", "PAUSED")
+    plan.add(
+        "1",
+        "campaign",
+        "customers/1/campaigns/3",
+        "maximize_clicks.cpc_bid_limit_micros",
+        1200000,
+        old_value=1000000,
+    )
+    path = tmp_path / "plan.json"
+    plan.save(path)
+
+    loaded = MutationPlan.load(path)
+
+    assert loaded == plan
+    assert loaded.summary() == {
+        "update ad_group.status": 1,
+        "update campaign.maximize_clicks.cpc_bid_limit_micros": 1,
+    }
+
+
+def test_apply_plan_merges_fields_and_chunks_per_customer(client):
+    plans = []
+    for customer_id in ("1", "2"):
+        plan = MutationPlan()
+        for ad_group_id in range(3):
+            plan.add(
+                customer_id,
+                "ad_group",
+                f"customers/{customer_id}/adGroups/{ad_group_id}",
+                "status",
+                "PAUSED",
+            )
+        plan.add(
+            customer_id,
+            "campaign",
+            f"customers/{customer_id}/campaigns/9",
+            "target_spend.cpc_bid_ceiling_micros",
+            1200000,
+        )
+        plan.add(
+            customer_id, "campaign", f"customers/{customer_id}/campaigns/9", "name", "x"
+        )
+        plans.append(plan)
+
+    results = apply_plan(client, MutationPlan.merge(plans), chunk_size=3)
+
+    service = client.get_service.return_value
+    requests = [call.kwargs["request"] for call in service.mutate.call_args_list]
+    assert [(r.customer_id, len(r.mutate_operations)) for r in requests] == [
+        ("1", 3),
+        ("1", 1),
+        ("2", 3),
+        ("2", 1),
+    ]
+    campaign_operation = requests[1].mutate_operations[0].campaign_operation
+    assert list(campaign_operation.update_mask.paths) == [
+        "target_spend.cpc_bid_ceiling_micros",
+        "name",
+    ]
+    assert campaign_operation.update.target_spend.cpc_bid_ceiling_micros == 1200000
+    ad_group = requests[0].mutate_operations[0].ad_group_operation.update
+    assert ad_group.status == client.enums.AdGroupStatusEnum.PAUSED
+    assert results[:4] == [
+        "customers/1/adGroups/0",
+        "customers/1/adGroups/1",
+        "customers/1/adGroups/2",
+        "customers/1/campaigns/9",
+    ]
+
+
+def test_apply_empty_plan_makes_no_request(client):
+    assert apply_plan(client, MutationPlan()) == []
+    client.get_service.return_value.mutate.assert_not_called()
+
+
+def _bid_and_pause_plan() -> MutationPlan:
+    plan = MutationPlan()
+    for keyword in ("kw1", "kw2"):
+        plan.add(
+            "1",
+            "ad_group_criterion",
+            f"customers/1/adGroupCriteria/5~{keyword}",
+            "cpc_bid_micros",
+            120000,
+            old_value=100000,
+            journal_key="customers/1/adGroups/5",
+            journal_action=ACTION_INCREASE_BID,
+            journal_delta=0.2,
+        )
+    plan.add(
+        "1",
+        "ad_group",
+        "customers/1/adGroups/6",
+        "status",
+        "PAUSED",
+        journal_key="customers/1/adGroups/6",
+        journal_action=ACTION_PAUSE,
+    )
+    return plan
+
+
+def test_apply_plan_journals_each_entity_once(client):
+    journal = ActionJournal()
+
+    apply_plan(client, _bid_and_pause_plan(), chunk_size=1, journal=journal)
+
+    # Both keywords belong to ad group 5, which is raised once, not twice.
+    assert journal.cumulative_delta(
+        "customers/1/adGroups/5", ACTION_INCREASE_BID
+    ) == pytest.approx(0.2)
+    assert journal.has_action("customers/1/adGroups/6", ACTION_PAUSE)
+
+
+def test_apply_plan_journals_requests_sent_before_a_failure(client):
+    journal = ActionJournal()
+    service = client.get_service.return_value
+    echo = service.mutate.side_effect
+    service.mutate.side_effect = [
+        echo(request=MagicMock(mutate_operations=[])),
+        echo(request=MagicMock(mutate_operations=[])),
+        RuntimeError("boom"),
+    ]
+
+    with pytest.raises(RuntimeError):
+        apply_plan(client, _bid_and_pause_plan(), chunk_size=1, journal=journal)
+
+    assert journal.has_action("customers/1/adGroups/5", ACTION_INCREASE_BID)
+    assert not journal.has_action("customers/1/adGroups/6", ACTION_PAUSE)
+
+
+def test_validate_only_apply_records_nothing(client):
+    journal = ActionJournal()
+
+    apply_plan(client, _bid_and_pause_plan(), validate_only=True, journal=journal)
+
+    assert not journal.has_action("customers/1/adGroups/6", ACTION_PAUSE)
+
+
+def test_growth_tier_plan_applies_in_one_request(client):
+    plan = plan_growth_tier_campaign(
+        customer_id="1",
+        campaign_name="Test Campaign",
+        budget_micros=1000000,
+        monetization_model="TRIPWIRE_UPSELL",
+        personas=[Persona(name="A", description=""), Persona(name="B", description="")],
+        target_cpa_micros=10000,
+    )
+
+    results = apply_plan(client, plan)
+
+    request = client.get_service.return_value.mutate.call_args.kwargs["request"]
+    assert len(request.mutate_operations) == 4
+    budget, campaign, *ad_groups = request.mutate_operations
+    assert budget.campaign_budget_operation.create.amount_micros == 1000000
+    campaign = campaign.campaign_operation.create
+    assert campaign.campaign_budget == "customers/1/campaignBudgets/-1"
+    assert campaign.maximize_conversions.target_cpa_micros == 10000
+    assert [op.ad_group_operation.create.name for op in ad_groups] == [
+        "Test Campaign - A",
+        "Test Campaign - B",
+    ]
+    assert {op.ad_group_operation.create.campaign for op in ad_groups} == {
+        "customers/1/campaigns/-2"
+    }
+    assert results[1] == "customers/1/campaigns/-2"
+
+
+def test_growth_tier_plans_use_distinct_temporary_ids():
+    plan = plan_growth_tier_campaign(
+        "1", "First", 1000000, "BOOK_CALL", [Persona(name="A", description="")]
+    )
+    plan_growth_tier_campaign(
+        "1",
+        "Second",
+        1000000,
+        "BOOK_CALL",
+        [Persona(name="A", description="")],
+        plan=plan,
+    )
+
+    resource_names = {change.resource_name for change in plan.changes}
+    assert len(resource_names) == 6
+
+
+def test_merged_plans_renumber_temporary_ids():
+    plans = [
+        plan_growth_tier_campaign(
+            "1", name, 1000000, "BOOK_CALL", [Persona(name="A", description="")]
+        )
+        for name in ("First", "Second")
+    ]
+
+    merged = MutationPlan.merge(plans)
+
+    campaigns = {
+        change.resource_name: change.new_value
+        for change in merged.changes
+        if change.resource_type == "campaign" and change.field == "campaign_budget"
+    }
+    assert campaigns == {
+        "customers/1/campaigns/-2": "customers/1/campaignBudgets/-1",
+        "customers/1/campaigns/-5": "customers/1/campaignBudgets/-4",
+    }
+    ad_group_campaigns = [
+        change.new_value
+        for change in merged.changes
+        if change.resource_type == "ad_group" and change.field == "campaign"
+    ]
+    assert ad_group_campaigns == list(campaigns)
+    assert merged.next_temp_id("1") == -7
+    # The source plans are left untouched.
+    assert plans[1].changes[0].resource_name == "customers/1/campaignBudgets/-1"
+
+
+def test_apply_plan_keeps_temporary_id_groups_in_one_request(client):
+    plan = MutationPlan()
+    plan.add("1", "ad_group", "customers/1/adGroups/7", "status", "PAUSED")
+    plan_growth_tier_campaign(
+        "1",
+        "Test",
+        1000000,
+        "BOOK_CALL",
+        [Persona(name="A", description=""), Persona(name="B", description="")],
+        plan=plan,
+    )
+    plan.add("1", "ad_group", "customers/1/adGroups/8", "status", "PAUSED")
+
+    apply_plan(client, plan, chunk_size=3)
+
+    service = client.get_service.return_value
+    requests = [call.kwargs["request"] for call in service.mutate.call_args_list]
+    # The budget, campaign and ad groups (4 operations) share one request.
+    assert [len(r.mutate_operations) for r in requests] == [1, 4, 1]
+
+
+def test_loaded_plan_allocates_unused_temporary_ids(tmp_path):
+    plan = plan_growth_tier_campaign(
+        "1", "First", 1000000, "BOOK_CALL", [Persona(name="A", description="")]
+    )
+    path = tmp_path / "plan.json"
+    plan.save(path)
+
+    assert MutationPlan.load(path).next_temp_id("1") == -4
+    assert MutationPlan.load(path).next_temp_id("2") == -1
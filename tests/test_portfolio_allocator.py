@@ -0,0 +1,107 @@
+# tests/test_portfolio_allocator.py
+
+import numpy as np
+import pytest
+
+from src.budget.golden_ratio_scaler import MAX_DAILY_BUDGET_MICROS, GoldenRatioScaler
+from src.budget.portfolio_allocator import allocate_portfolio_budgets
+
+MICROS_IN_RUPEE = 1_000_000
+
+
+@pytest.fixture
+def portfolio():
+    """Four campaigns: pause, maintain, golden ratio and aggressive scaling."""
+    return {
+        "current_budgets_micros": [1000 * MICROS_IN_RUPEE] * 4,
+        "conversions": [10, 10, 10, 10],
+        "total_spend_micros": [
+            5000 * MICROS_IN_RUPEE,  # CAC 500 -> LTV:CAC 0.4
+            1000 * MICROS_IN_RUPEE,  # CAC 100 -> LTV:CAC 2.0
+            600 * MICROS_IN_RUPEE,  # CAC 60 -> LTV:CAC 3.33
+            400 * MICROS_IN_RUPEE,  # CAC 40 -> LTV:CAC 5.0
+        ],
+        "avg_ltv": 200,
+    }
+
+
+def test_matches_scalar_scaler_when_ceiling_not_binding(portfolio):
+    allocation = allocate_portfolio_budgets(
+        **portfolio, total_budget_ceiling_micros=10**12
+    )
+
+    expected = []
+    for budget, conv, spend in zip(
+        portfolio["current_budgets_micros"],
+        portfolio["conversions"],
+        portfolio["total_spend_micros"],
+    ):
+        ratio = GoldenRatioScaler.calculate_ltv_cac_ratio(conv, spend, 200)
+        expected.append(GoldenRatioScaler.calculate_new_budget(budget, ratio))
+
+    assert allocation.budgets_micros.tolist() == expected
+    assert not allocation.ceiling_binding
+
+
+def test_ceiling_cuts_lowest_ltv_cac_first(portfolio):
+    # Unconstrained: 0 + 1000 + 1200 + 1200 = 3400.
+    ceiling = 3200 * MICROS_IN_RUPEE
+
+    allocation = allocate_portfolio_budgets(
+        **portfolio, total_budget_ceiling_micros=ceiling
+    )
+
+    assert allocation.ceiling_binding
+    assert allocation.budgets_micros.sum() <= ceiling
+    assert allocation.budgets_micros.tolist() == [
+        0,
+        800 * MICROS_IN_RUPEE,
+        1200 * MICROS_IN_RUPEE,
+        1200 * MICROS_IN_RUPEE,
+    ]
+
+
+def test_infeasible_ceiling_falls_back_to_change_floor(portfolio):
+    allocation = allocate_portfolio_budgets(
+        **portfolio, total_budget_ceiling_micros=MICROS_IN_RUPEE
+    )
+
+    assert allocation.budgets_micros.tolist() == [0] + [800 * MICROS_IN_RUPEE] * 3
+
+
+def test_zero_conversion_and_zero_spend_edge_cases():
+    allocation = allocate_portfolio_budgets(
+        current_budgets_micros=[1000 * MICROS_IN_RUPEE] * 2,
+        conversions=[0, 5],
+        total_spend_micros=[500 * MICROS_IN_RUPEE, 0],
+        avg_ltv=200,
+        total_budget_ceiling_micros=10**12,
+    )
+
+    assert allocation.ltv_cac[0] == 0.0
+    assert np.isinf(allocation.ltv_cac[1])
+    assert allocation.budgets_micros.tolist() == [0, 1200 * MICROS_IN_RUPEE]
+
+
+def test_constraints_hold_for_large_random_portfolio():
+    rng = np.random.default_rng(42)
+    n = 5000
+    current = rng.integers(100, 2500, size=n) * MICROS_IN_RUPEE
+    conversions = rng.integers(0, 50, size=n)
+    spend = rng.integers(0, 20000, size=n) * MICROS_IN_RUPEE
+    ceiling = int(current.sum() * 0.9)
+
+    allocation = allocate_portfolio_budgets(
+        current, conversions, spend, 200, total_budget_ceiling_micros=ceiling
+    )
+
+    budgets = allocation.budgets_micros
+    active = budgets > 0
+    assert budgets.sum() <= ceiling
+    assert (
+        budgets[active]
+        <= np.minimum(current[active] * 1.2, MAX_DAILY_BUDGET_MICROS) + 1
+    ).all()
+    assert (
+        budgets[active] >= np.minimum(current[active] * 0.8, MAX_DAILY_BUDGET_MICROS)
+    ).all()
@@ -0,0 +1,34 @@
+"""
+Unit tests for prompt-cache messages.
+"""
+
+from src.generators.prompt_cache import (
+    CHARS_PER_TOKEN,
+    MIN_CACHEABLE_TOKENS,
+    cached_user_message,
+)
+
+HAIKU = "claude-3-haiku-20240307"
+
+
+def test_cached_user_message_marks_prefix_only():
+    message = cached_user_message("static rules", "dynamic context")
+
+    assert message["role"] == "user"
+    assert message["content"] == [
+        {
+            "type": "text",
+            "text": "static rules",
+            "cache_control": {"type": "ephemeral"},
+        },
+        {"type": "text", "text": "dynamic context"},
+    ]
+
+
+def test_cached_user_message_skips_prefixes_too_short_for_the_model():
+    short = cached_user_message("static rules", "dynamic context", model=HAIKU)
+    long_prefix = "x" * (MIN_CACHEABLE_TOKENS[HAIKU] * CHARS_PER_TOKEN)
+    long = cached_user_message(long_prefix, "dynamic context", model=HAIKU)
+
+    assert short["content"][0] == {"type": "text", "text": "static rules"}
+    assert long["content"][0]["cache_control"] == {"type": "ephemeral"}
@@ -0,0 +1,133 @@
+# tests/test_runner.py
+
+import threading
+import time
+from collections import Counter
+from unittest.mock import MagicMock, patch
+
+from src.mutations.journal import ActionJournal
+from src.mutations.plan import MutationPlan
+from src.optimization.runner import OptimizerRunner, expand_targets
+
+
+class FakeOptimizer:
+    """Records how many mutate phases overlap, per customer and overall."""
+
+    def __init__(self, read_delay=0.05, mutate_delay=0.02):
+        self.read_delay = read_delay
+        self.mutate_delay = mutate_delay
+        self.lock = threading.Lock()
+        self.active = Counter()
+        self.max_active = Counter()
+        self.max_active_total = 0
+        self.client = MagicMock()
+
+    def identify_losing_personas(self, customer_id, campaign_id, snapshots=None):
+        time.sleep(self.read_delay)
+        if campaign_id == "bad":
+            raise RuntimeError("boom")
+        return [f"{campaign_id}-lose"]
+
+    def identify_winning_personas(self, customer_id, campaign_id, snapshots=None):
+        return [f"{campaign_id}-win"]
+
+    def pause_ad_groups(self, customer_id, ad_group_ids, journal=None, snapshots=None):
+        with self.lock:
+            self.active[customer_id] += 1
+            self.max_active[customer_id] = max(
+                self.max_active[customer_id], self.active[customer_id]
+            )
+            self.max_active_total = max(
+                self.max_active_total, sum(self.active.values())
+            )
+        time.sleep(self.mutate_delay)
+        with self.lock:
+            self.active[customer_id] -= 1
+
+    def increase_bids_bulk(
+        self, customer_id, ad_group_ids, percentage, journal=None, snapshots=None
+    ):
+        pass
+
+    def plan_pause_ad_groups(self, customer_id, ad_group_ids, plan=None, journal=None):
+        plan = plan if plan is not None else MutationPlan()
+        for ad_group_id in ad_group_ids:
+            plan.add(customer_id, "ad_group", ad_group_id, "status", "PAUSED")
+        return plan
+
+    def plan_increase_bids(
+        self, customer_id, ad_group_ids, percentage, plan=None, journal=None
+    ):
+        return plan
+
+
+def test_reads_run_in_parallel_and_mutates_serialize_per_customer():
+    optimizer = FakeOptimizer()
+    targets = [(customer, str(i)) for customer in ("1", "2") for i in range(8)]
+    runner = OptimizerRunner(optimizer, max_workers=16)
+
+    started = time.perf_counter()
+    report = runner.run(targets)
+    elapsed = time.perf_counter() - started
+
+    # 16 reads of 50ms would take 0.8s sequentially.
+    assert elapsed < 0.5
+    assert optimizer.max_active == {"1": 1, "2": 1}
+    assert optimizer.max_active_total == 2
+    assert [(r.customer_id, r.campaign_id) for r in report.results] == targets
+    assert report.summary()["losing_ad_groups"] == 16
+    assert report.targets_per_second > 0
+
+
+def test_failed_targets_are_reported_without_stopping_the_run():
+    report = OptimizerRunner(FakeOptimizer(), max_workers=4).run(
+        [("1", "ok"), ("1", "bad")]
+    )
+
+    assert [r.error for r in report.results] == [None, "boom"]
+    assert report.summary()["failures"] == 1
+
+
+def test_plan_only_collects_a_plan_without_mutating():
+    optimizer = FakeOptimizer()
+    optimizer.pause_ad_groups = MagicMock()
+
+    report = OptimizerRunner(optimizer).run([("1", "a"), ("2", "b")], plan_only=True)
+
+    optimizer.pause_ad_groups.assert_not_called()
+    assert sorted(c.resource_name for c in report.plan.changes) == [
+        "a-lose",
+        "b-lose",
+    ]
+
+
+def test_plan_only_passes_the_journal():
+    optimizer = FakeOptimizer()
+    optimizer.plan_pause_ad_groups = MagicMock(return_value=MutationPlan())
+    optimizer.plan_increase_bids = MagicMock()
+    journal = ActionJournal()
+
+    OptimizerRunner(optimizer, journal=journal).run([("1", "a")], plan_only=True)
+
+    assert optimizer.plan_pause_ad_groups.call_args.kwargs["journal"] is journal
+    assert optimizer.plan_increase_bids.call_args.kwargs["journal"] is journal
+
+
+def test_apply_records_the_plan_in_the_journal():
+    optimizer = FakeOptimizer()
+    journal = ActionJournal()
+    runner = OptimizerRunner(optimizer, journal=journal)
+    plan = optimizer.plan_pause_ad_groups("1", ["customers/1/adGroups/2"])
+
+    with patch("src.optimization.runner.apply_plan") as mock_apply_plan:
+        runner.apply(plan, chunk_size=10)
+
+    mock_apply_plan.assert_called_once_with(
+        optimizer.client, plan, journal=journal, chunk_size=10
+    )
+
+
+def test_expand_targets():
+    assert expand_targets(
+        [{"customer_id": 1, "campaign_ids": [2, 3]}, {"customer_id": 4}]
+    ) == [("1", "2"), ("1", "3")]
@@ -0,0 +1,171 @@
+# tests/test_scheduler.py
+
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.scheduler.scheduler import (
+    JobPriority,
+    MonitorScheduler,
+    ScheduledJob,
+    build_account_jobs,
+)
+
+
+async def _run_for(scheduler: MonitorScheduler, seconds: float):
+    task = asyncio.create_task(scheduler.run(install_signal_handlers=False))
+    await asyncio.sleep(seconds)
+    scheduler.request_shutdown()
+    await asyncio.wait_for(task, timeout=5)
+
+
+@pytest.mark.asyncio
+async def test_due_jobs_run_in_priority_order():
+    order = []
+    scheduler = MonitorScheduler(max_concurrency=1, tick_seconds=0.01)
+    scheduler.add_job(
+        ScheduledJob(
+            "persona",
+            lambda: order.append("persona"),
+            60,
+            JobPriority.PERSONA_OPTIMIZATION,
+        )
+    )
+    scheduler.add_job(
+        ScheduledJob("ctr", lambda: order.append("ctr"), 60, JobPriority.CTR_HYGIENE)
+    )
+    scheduler.add_job(
+        ScheduledJob(
+            "spend", lambda: order.append("spend"), 60, JobPriority.SPEND_GUARDRAIL
+        )
+    )
+
+    await _run_for(scheduler, 0.2)
+
+    assert order == ["spend", "ctr", "persona"]
+
+
+@pytest.mark.asyncio
+async def test_overlapping_runs_are_skipped():
+    active = []
+    max_active = []
+    release = threading.Event()
+
+    def slow_job():
+        active.append(1)
+        max_active.append(len(active))
+        release.wait(timeout=2)
+        active.pop()
+
+    job = ScheduledJob("slow", slow_job, interval_seconds=0.01, jitter=0.0)
+    scheduler = MonitorScheduler(max_concurrency=4, tick_seconds=0.01)
+    scheduler.add_job(job)
+
+    task = asyncio.create_task(scheduler.run(install_signal_handlers=False))
+    await asyncio.sleep(0.2)
+    release.set()
+    await asyncio.sleep(0.05)
+    scheduler.request_shutdown()
+    await asyncio.wait_for(task, timeout=5)
+
+    assert max(max_active) == 1
+    assert job.skipped_overlaps > 0
+    assert job.runs >= 1
+
+
+@pytest.mark.asyncio
+async def test_runs_within_their_interval_are_not_counted_as_overlaps():
+    job = ScheduledJob(
+        "slow", lambda: time.sleep(0.3), interval_seconds=100, jitter=0.0
+    )
+    scheduler = MonitorScheduler(tick_seconds=0.05)
+    scheduler.add_job(job)
+
+    await _run_for(scheduler, 0.2)
+
+    assert job.runs == 1
+    assert job.skipped_overlaps == 0
+
+
+@pytest.mark.asyncio
+async def test_failures_and_stats_are_recorded(tmp_path):
+    def failing_job():
+        raise RuntimeError("boom")
+
+    status_path = tmp_path / "status.json"
+    scheduler = MonitorScheduler(tick_seconds=0.01, status_path=status_path)
+    scheduler.add_job(ScheduledJob("failing", failing_job, interval_seconds=60))
+
+    await _run_for(scheduler, 0.1)
+
+    stats = scheduler.stats()[0]
+    assert stats["runs"] == 1
+    assert stats["failures"] == 1
+    assert stats["last_error"] == "boom"
+    assert stats["last_runtime_seconds"] >= 0
+    assert stats["last_lag_seconds"] >= 0
+    assert json.loads(status_path.read_text())[0]["name"] == "failing"
+
+
+@pytest.mark.asyncio
+async def test_shutdown_waits_for_in_flight_jobs():
+    finished = []
+
+    def job():
+        time.sleep(0.2)
+        finished.append(True)
+
+    scheduler = MonitorScheduler(tick_seconds=0.01)
+    scheduler.add_job(ScheduledJob("job", job, interval_seconds=60))
+
+    await _run_for(scheduler, 0.05)
+
+    assert finished == [True]
+    assert not scheduler.jobs[0].running
+
+
+def test_add_job_spreads_first_run_with_jitter():
+    now = 100.0
+    scheduler = MonitorScheduler(clock=lambda: now)
+    job = ScheduledJob("job", lambda: None, interval_seconds=60, jitter=0.1)
+
+    scheduler.add_job(job, run_immediately=False)
+
+    assert now + 54 <= job.next_run <= now + 66
+
+
+@patch("src.optimization.persona_optimizer.get_google_ads_client")
+def test_build_account_jobs(mock_get_client, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    client = MagicMock()
+    targets = [
+        {"customer_id": "111", "start_date": "2025-01-01", "campaign_ids": ["9"]},
+        {"customer_id": "222", "start_date": "2025-01-01"},
+    ]
+
+    jobs = build_account_jobs(client, targets)
+
+    assert [job.name for job in jobs] == [
+        "spend:111",
+        "ctr:111:9",
+        "persona:111:9",
+        "spend:222",
+    ]
+    assert [job.priority for job in jobs] == [
+        JobPriority.SPEND_GUARDRAIL,
+        JobPriority.CTR_HYGIENE,
+        JobPriority.PERSONA_OPTIMIZATION,
+        JobPriority.SPEND_GUARDRAIL,
+    ]
+    # The shared client is reused rather than cold-started per job.
+    mock_get_client.assert_not_called()
+
+    with patch(
+        "src.monitoring.ctr_monitor.CTRMonitor.pause_underperforming_ads_streaming"
+    ) as mock_pause:
+        jobs[1].func()
+    mock_pause.assert_called_once_with("111", "9", journal=None)
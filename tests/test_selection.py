@@ -0,0 +1,97 @@
+"""
+Unit tests for local ad-copy selection and ad-copy metrics.
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from src.generators.ad_copy_generator import AdCopyCandidates, select_copy
+from src.generators.selection import (
+    AdCopyStats,
+    ad_copy_stats,
+    dedupe,
+    is_near_duplicate,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_stats():
+    ad_copy_stats.reset()
+    yield
+    ad_copy_stats.reset()
+
+
+def test_near_duplicates_ignore_case_and_punctuation():
+    assert is_near_duplicate("Start Today!", "start today")
+    assert is_near_duplicate("Grow Your Business", "Grow Your Businesses")
+    assert not is_near_duplicate("Start Today", "Save Time Daily")
+
+
+def test_dedupe_keeps_first_of_each_group():
+    kept, removed = dedupe(["Start Today", "Start today!", "Save Time", "START TODAY"])
+
+    assert kept == ["Start Today", "Save Time"]
+    assert removed == 2
+
+
+def test_select_copy_filters_dedupes_and_caps():
+    candidates = AdCopyCandidates(
+        headlines=[
+            "Grow Your Business",
+            "grow your business!",
+            "This Headline Is Far Too Long To Use",
+            "Totally Free Setup",
+            "Start Today",
+            "Save Time Daily",
+        ]
+        + [
+            "Boost Productivity",
+            "Join 10K+ Happy Users",
+            "See Real Results Now",
+            "Transform Your Career",
+            "Work Smarter",
+            "Built For Busy Teams",
+            "Less Admin, More Sales",
+            "Your Data, One Place",
+        ],
+        descriptions=[
+            "Boost productivity with our proven solution.",
+            "D" * 91,
+            "See why thousands of teams switched.",
+        ],
+    )
+
+    copy = select_copy(candidates)
+
+    assert copy.headlines[:3] == [
+        "Grow Your Business",
+        "Start Today",
+        "Save Time Daily",
+    ]
+    assert len(copy.headlines) == 10
+    assert copy.descriptions == [
+        "Boost productivity with our proven solution.",
+        "See why thousands of teams switched.",
+    ]
+    assert ad_copy_stats.candidates == 17
+    assert ad_copy_stats.rejected_invalid == 3
+    assert ad_copy_stats.rejected_duplicate >= 1
+
+
+def test_select_copy_raises_when_too_few_remain():
+    candidates = AdCopyCandidates(
+        headlines=["Start Today", "Start today!", "Free Stuff Inside"],
+        descriptions=["Desc one.", "Desc two."],
+    )
+
+    with pytest.raises(ValidationError):
+        select_copy(candidates)
+
+
+def test_stats_rates():
+    stats = AdCopyStats()
+    stats.add(attempts=5, retries=1, calls=6, ads=4)
+
+    assert stats.retry_rate == pytest.approx(0.2)
+    assert stats.calls_per_ad == pytest.approx(1.5)
+    assert stats.summary()["calls_per_ad"] == pytest.approx(1.5)
@@ -0,0 +1,186 @@
+# tests/test_snapshots.py
+
+import threading
+import unittest.mock as mock
+from pathlib import Path
+
+import pytest
+from google.ads.googleads.errors import GoogleAdsException
+
+from src.monitoring import snapshots
+from src.monitoring.ctr_monitor import SNAPSHOT_NAMESPACE, AdPerformance, CTRMonitor
+from src.monitoring.snapshots import SnapshotStore, fingerprint
+
+
+@pytest.fixture
+def snapshot_path(tmp_path: Path) -> Path:
+    return tmp_path / "snapshots.json"
+
+
+def test_fingerprint_is_stable_and_compact():
+    assert fingerprint((1, 0.5, "a")) == fingerprint((1, 0.5, "a"))
+    assert fingerprint((1, 0.5, "a")) != fingerprint((1, 0.6, "a"))
+    assert len(fingerprint((1,))) == 16
+
+
+def test_diff_reports_new_and_changed_entities(snapshot_path):
+    store = SnapshotStore(snapshot_path)
+    entities = {"a": (1, 2), "b": (3, 4)}
+
+    assert store.diff("ns", entities) == {"a", "b"}
+    store.commit("ns", entities)
+    assert store.diff("ns", entities) == set()
+    assert store.diff("ns", {"a": (1, 2), "b": (3, 5), "c": (0, 0)}) == {"b", "c"}
+    # Namespaces are independent.
+    assert store.diff("other", entities) == {"a", "b"}
+
+
+def test_commit_only_selected_keys(snapshot_path):
+    store = SnapshotStore(snapshot_path)
+    entities = {"a": (1,), "b": (2,)}
+
+    store.commit("ns", entities, keys={"a"})
+
+    assert store.diff("ns", entities) == {"b"}
+
+
+def test_snapshots_persist_across_instances(snapshot_path):
+    SnapshotStore(snapshot_path).commit("ns", {"a": (1,)})
+
+    assert SnapshotStore(snapshot_path).diff("ns", {"a": (1,)}) == set()
+
+
+def test_clear_forces_full_re_evaluation(snapshot_path):
+    store = SnapshotStore(snapshot_path)
+    store.commit("ns", {"a": (1,)})
+
+    store.clear("ns")
+
+    assert store.diff("ns", {"a": (1,)}) == {"a"}
+
+
+def test_unreadable_snapshot_file_is_ignored(snapshot_path):
+    snapshot_path.write_text("not json")
+    assert SnapshotStore(snapshot_path).diff("ns", {"a": (1,)}) == {"a"}
+
+
+def test_identify_underperformers_skips_unchanged_ads(snapshot_path):
+    store = SnapshotStore(snapshot_path)
+    monitor = CTRMonitor(client=mock.MagicMock())
+    ads = [
+        AdPerformance(
+            ad_id="1",
+            ad_group_ad_resource_name="r1",
+            ctr=0.005,
+            impressions=200,
+            clicks=1,
+        ),
+        AdPerformance(
+            ad_id="2",
+            ad_group_ad_resource_name="r2",
+            ctr=0.02,
+            impressions=200,
+            clicks=4,
+        ),
+    ]
+
+    assert monitor.identify_underperformers(ads, snapshots=store) == ["r1"]
+    # r1 is only staged until it is paused.
+    assert monitor.identify_underperformers(ads, snapshots=store) == ["r1"]
+    monitor.pause_underperforming_ads("123", ["r1"], snapshots=store)
+    # Nothing moved: no ad is re-evaluated.
+    assert monitor.identify_underperformers(ads, snapshots=store) == []
+
+    ads[1] = AdPerformance(
+        ad_id="2", ad_group_ad_resource_name="r2", ctr=0.008, impressions=500, clicks=4
+    )
+    assert monitor.identify_underperformers(ads, snapshots=store) == ["r2"]
+    # Changing the threshold re-evaluates every ad.
+    assert monitor.identify_underperformers(ads, threshold=0.03, snapshots=store) == [
+        "r1",
+        "r2",
+    ]
+
+
+def test_failed_pause_leaves_ads_to_re_evaluate(snapshot_path):
+    store = SnapshotStore(snapshot_path)
+    client = mock.MagicMock()
+    client.get_service.return_value.mutate_ad_group_ads.side_effect = (
+        GoogleAdsException(
+            mock.MagicMock(), mock.MagicMock(), mock.MagicMock(), "request-id"
+        )
+    )
+    monitor = CTRMonitor(client=client)
+    ads = [
+        AdPerformance(
+            ad_id="1",
+            ad_group_ad_resource_name="r1",
+            ctr=0.005,
+            impressions=200,
+            clicks=1,
+        )
+    ]
+
+    flagged = monitor.identify_underperformers(ads, snapshots=store)
+    monitor.pause_underperforming_ads("123", flagged, snapshots=store)
+
+    assert SnapshotStore(snapshot_path).diff(SNAPSHOT_NAMESPACE, {"r1": (1,)}) == {"r1"}
+    assert monitor.identify_underperformers(ads, snapshots=store) == ["r1"]
+
+
+def test_staged_snapshots_commit_only_selected_keys(snapshot_path):
+    store = SnapshotStore(snapshot_path)
+    entities = {"a": (1,), "b": (2,)}
+
+    store.stage("ns", entities)
+    assert store.diff("ns", entities) == {"a", "b"}
+    store.commit_staged("ns", ["a", "unknown"])
+
+    assert SnapshotStore(snapshot_path).diff("ns", entities) == {"b"}
+
+
+def test_commits_append_and_compact_atomically(snapshot_path, monkeypatch):
+    monkeypatch.setattr(snapshots, "COMPACT_MIN_RECORDS", 4)
+    store = SnapshotStore(snapshot_path)
+
+    store.commit("ns", {"a": (1,), "b": (1,)})
+    store.commit("ns", {"a": (2,)})
+    # Each commit appends only its changed fingerprints.
+    assert len(snapshot_path.read_text().splitlines()) == 2
+
+    for value in range(3, 7):
+        store.commit("ns", {"a": (value,)})
+    # Superseded records outweighed the live ones, so the log was rewritten.
+    assert len(snapshot_path.read_text().splitlines()) == 1
+    assert list(snapshot_path.parent.iterdir()) == [snapshot_path]
+    assert SnapshotStore(snapshot_path).diff("ns", {"a": (6,), "b": (1,)}) == set()
+
+
+def test_truncated_last_record_is_dropped(snapshot_path):
+    SnapshotStore(snapshot_path).commit("ns", {"a": (1,)})
+    with open(snapshot_path, "a") as f:
+        f.write('{"namespace": "ns", "finger')
+
+    store = SnapshotStore(snapshot_path)
+    store.commit("ns", {"b": (1,)})
+
+    assert SnapshotStore(snapshot_path).diff("ns", {"a": (1,), "b": (1,)}) == set()
+
+
+def test_concurrent_commits_are_all_persisted(snapshot_path):
+    store = SnapshotStore(snapshot_path)
+
+    def commit(worker):
+        for i in range(50):
+            store.commit(f"ns{worker}", {str(i): (i,)})
+
+    threads = [threading.Thread(target=commit, args=(w,)) for w in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    reloaded = SnapshotStore(snapshot_path)
+    for worker in range(8):
+        entities = {str(i): (i,) for i in range(50)}
+        assert reloaded.diff(f"ns{worker}", entities) == set()
@@ -0,0 +1,205 @@
+"""
+Unit tests for streaming ad-copy generation with early abort.
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.generators.ad_copy_generator import AdCopySchema
+from src.generators.persona_generator import PersonaSchema
+from src.generators.selection import ad_copy_stats
+from src.generators.streaming import (
+    RuleViolation,
+    StreamingCopyValidator,
+    astream_ad_variation,
+    stream_ad_variation,
+)
+from src.models.configuration import CampaignConfiguration
+from src.models.enums import MonetizationModel, VerticalType
+
+VALID = {
+    "headlines": ["Grow Your Business", "Start Today", "Save Time Daily"],
+    "descriptions": ["Boost productivity today.", "See why teams switched."],
+}
+
+
+@pytest.fixture(autouse=True)
+def reset_stats():
+    ad_copy_stats.reset()
+    yield
+    ad_copy_stats.reset()
+
+
+@pytest.fixture
+def persona():
+    return PersonaSchema(
+        name="Test Persona",
+        pain_point="Struggles with testing.",
+        purchase_driver="Needs reliable code.",
+        ad_group_name="persona_test_group",
+    )
+
+
+@pytest.fixture
+def config():
+    return CampaignConfiguration(
+        vertical_type=VerticalType.SAAS,
+        offer_name="Test Offer",
+        target_audience_broad="Developers",
+        value_proposition_primary="Write better code.",
+        monetization_model=MonetizationModel.DIRECT_SALE,
+    )
+
+
+def chunks(payload, size=7):
+    text = json.dumps(payload)
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+class FakeStream:
+    """Mimics a MessageStream that yields input_json deltas of a tool call."""
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.consumed = 0
+        self.closed = False
+
+    def _events(self):
+        for chunk in chunks(self.payload):
+            self.consumed += 1
+            yield SimpleNamespace(
+                type="content_block_delta",
+                delta=SimpleNamespace(type="input_json_delta", partial_json=chunk),
+            )
+
+    def _final(self):
+        return SimpleNamespace(
+            content=[SimpleNamespace(type="tool_use", input=self.payload)],
+            usage=None,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed = True
+
+    def __iter__(self):
+        return self._events()
+
+    def get_final_message(self):
+        return self._final()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.closed = True
+
+    def __aiter__(self):
+        async def events():
+            for event in self._events():
+                yield event
+
+        return events()
+
+    async def _aget_final_message(self):
+        return self._final()
+
+
+def test_validator_accepts_valid_copy_in_small_chunks():
+    validator = StreamingCopyValidator()
+    for chunk in chunks(VALID, size=3):
+        validator.feed(chunk)
+
+    assert validator.items == VALID
+
+
+def test_validator_aborts_mid_headline_over_the_limit():
+    long_headline = "This Headline Keeps Going And Going Forever"
+    validator = StreamingCopyValidator()
+    text = json.dumps({"headlines": [long_headline], "descriptions": []})
+
+    with pytest.raises(RuleViolation) as excinfo:
+        for consumed, char in enumerate(text, 1):
+            validator.feed(char)
+
+    assert excinfo.value.field == "headlines"
+    assert "30 characters" in excinfo.value.reason
+    assert consumed < text.index(long_headline) + len(long_headline)
+
+
+def test_validator_handles_escapes_and_blocked_keywords():
+    validator = StreamingCopyValidator()
+    validator.feed(json.dumps({"headlines": ['Say "Hi" é']})[:-2])
+    assert validator.items["headlines"] == ['Say "Hi" é']
+
+    with pytest.raises(RuleViolation, match="blocked keyword"):
+        StreamingCopyValidator().feed('{"headlines": ["Get it free')
+
+
+def test_validator_counts_escaped_surrogate_pairs_as_one_character():
+    headline = "\U0001F600" * 30  # 30 emoji, each escaped as a surrogate pair
+    text = json.dumps({"headlines": [headline]})
+    assert "\\ud83d\\ude00" in text
+
+    validator = StreamingCopyValidator()
+    validator.feed(text)
+
+    assert validator.items["headlines"] == [headline]
+    with pytest.raises(RuleViolation, match="30 characters"):
+        StreamingCopyValidator().feed(json.dumps({"headlines": [headline + "!"]}))
+
+
+def test_validator_rejects_too_many_descriptions():
+    payload = {"headlines": VALID["headlines"], "descriptions": ["Short."] * 5}
+
+    with pytest.raises(RuleViolation, match="More than 4 descriptions"):
+        StreamingCopyValidator().feed(json.dumps(payload))
+
+
+@patch("src.generators.streaming.client")
+def test_stream_aborts_and_retries_immediately(mock_client, persona, config):
+    bad = FakeStream(
+        {
+            "headlines": ["Grow Your Business", "A" * 40] + ["Filler"] * 10,
+            "descriptions": ["Boost productivity today."] * 2,
+        }
+    )
+    good = FakeStream(VALID)
+    mock_client.messages.stream.side_effect = [bad, good]
+
+    variation = stream_ad_variation(persona, config, "PULL")
+
+    assert variation.copy == AdCopySchema(**VALID)
+    assert bad.closed
+    assert bad.consumed < len(chunks(bad.payload))
+    params = mock_client.messages.stream.call_args.kwargs
+    assert params["tool_choice"] == {"type": "tool", "name": "AdCopySchema"}
+    assert ad_copy_stats.aborted_streams == 1
+    assert ad_copy_stats.retries == 1
+
+
+@pytest.mark.asyncio
+@patch("src.generators.streaming.async_client")
+async def test_astream_raises_after_max_retries(mock_client, persona, config):
+    def stream(**params):
+        fake = FakeStream({"headlines": ["Totally free stuff"], "descriptions": []})
+        fake.get_final_message = fake._aget_final_message
+        return fake
+
+    mock_client.messages.stream.side_effect = stream
+
+    with pytest.raises(RuleViolation):
+        await astream_ad_variation(persona, config, "PUSH", max_retries=2)
+
+    assert mock_client.messages.stream.call_count == 2
+    assert ad_copy_stats.aborted_streams == 2
+
+
+def test_zero_retries_raise_instead_of_returning_none(persona, config):
+    with pytest.raises(ValueError, match="max_retries must be at least 1"):
+        stream_ad_variation(persona, config, "PULL", max_retries=0)
@@ -0,0 +1,216 @@
+"""
+Unit tests for LLM call telemetry: costs, tracking, aggregation and sinks.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+
+from src.telemetry.llm import (
+    JsonSink,
+    LLMTelemetry,
+    PrometheusSink,
+    compute_cost,
+    make_sink,
+)
+
+HAIKU = "claude-3-haiku-20240307"
+
+
+def _message(**usage):
+    return SimpleNamespace(usage=SimpleNamespace(**usage))
+
+
+def test_compute_cost_uses_per_token_prices():
+    cost = compute_cost(
+        HAIKU,
+        input_tokens=1_000_000,
+        output_tokens=1_000_000,
+        cache_creation_input_tokens=1_000_000,
+        cache_read_input_tokens=1_000_000,
+    )
+
+    assert cost == pytest.approx(0.25 + 1.25 + 0.30 + 0.03)
+    assert compute_cost(HAIKU, input_tokens=1_000_000, batch=True) == 0.125
+    assert compute_cost("unknown-model", input_tokens=100) is None
+
+
+def test_track_records_usage_latency_and_cost():
+    telemetry = LLMTelemetry()
+
+    with telemetry.track("ad_copy", HAIKU) as call:
+        call.record_response(_message(input_tokens=400, output_tokens=100))
+
+    (recorded,) = telemetry.snapshot()
+    assert recorded.operation == "ad_copy"
+    assert recorded.success
+    assert (recorded.input_tokens, recorded.output_tokens) == (400, 100)
+    assert recorded.latency_seconds >= 0
+    assert recorded.time_to_first_token_seconds == recorded.latency_seconds
+    assert recorded.cost_usd == pytest.approx(compute_cost(HAIKU, 400, 100))
+
+
+def test_track_records_failed_calls_and_reraises():
+    telemetry = LLMTelemetry()
+
+    with pytest.raises(ValueError):
+        with telemetry.track("ad_copy", HAIKU, attempt=1):
+            raise ValueError("bad copy")
+
+    (recorded,) = telemetry.snapshot()
+    assert not recorded.success
+    assert recorded.error == "ValueError: bad copy"
+    assert recorded.attempt == 1
+
+
+def test_context_tags_calls_including_child_tasks():
+    telemetry = LLMTelemetry()
+
+    async def call():
+        with telemetry.track("personas", HAIKU):
+            pass
+
+    async def run():
+        with telemetry.context(config="Offer B"):
+            await asyncio.gather(call(), call())
+
+    with telemetry.context(command="generate-batch", config="Offer A"):
+        with telemetry.track("personas", HAIKU):
+            pass
+        asyncio.run(run())
+    with telemetry.track("personas", HAIKU):
+        pass
+
+    tags = [(call.command, call.config) for call in telemetry.snapshot()]
+    assert tags == [
+        ("generate-batch", "Offer A"),
+        ("generate-batch", "Offer B"),
+        ("generate-batch", "Offer B"),
+        ("", ""),
+    ]
+
+
+def test_aggregate_totals_calls_retries_and_failures():
+    telemetry = LLMTelemetry()
+    for attempt, success in ((0, False), (1, True)):
+        with telemetry.context(config="Offer"):
+            with telemetry.track("ad_copy", HAIKU, attempt=attempt) as call:
+                call.record_response(_message(input_tokens=100, output_tokens=10))
+                if not success:
+                    call.fail("Too long.")
+
+    totals = telemetry.aggregate("config")["Offer"]
+
+    assert totals["calls"] == 2
+    assert totals["retries"] == 1
+    assert totals["failures"] == 1
+    assert totals["input_tokens"] == 200
+    assert totals["cost_usd"] == pytest.approx(2 * compute_cost(HAIKU, 100, 10))
+
+
+def test_cache_tokens_from_instructor_models_and_hit_rate():
+    class Copy(BaseModel):
+        text: str
+
+    telemetry = LLMTelemetry()
+    first = Copy(text="a")
+    first._raw_response = _message(
+        input_tokens=50,
+        output_tokens=20,
+        cache_creation_input_tokens=900,
+        cache_read_input_tokens=0,
+    )
+    second = _message(
+        input_tokens=50,
+        output_tokens=25,
+        cache_creation_input_tokens=0,
+        cache_read_input_tokens=900,
+    )
+    for response in (first, second, Copy(text="no usage")):
+        with telemetry.track("ad_copy", HAIKU) as call:
+            call.record_response(response)
+
+    totals = telemetry.aggregate("operation")["ad_copy"]
+
+    assert totals["calls"] == 3
+    assert totals["input_tokens"] == 100
+    assert totals["output_tokens"] == 45
+    assert totals["cache_creation_input_tokens"] == 900
+    assert totals["cache_read_input_tokens"] == 900
+    assert totals["cache_hit_rate"] == pytest.approx(900 / 1900)
+
+
+def test_calls_are_capped_but_totals_cover_every_call(tmp_path):
+    telemetry = LLMTelemetry(max_calls=2)
+    for attempt in range(5):
+        with telemetry.context(command="generate-batch"):
+            with telemetry.track("ad_copy", HAIKU, attempt=attempt) as call:
+                call.record_response(_message(input_tokens=10, output_tokens=1))
+
+    assert [call.attempt for call in telemetry.snapshot()] == [3, 4]
+    assert telemetry.total_calls == 5
+    totals = telemetry.aggregate("command")["generate-batch"]
+    assert (totals["calls"], totals["retries"], totals["input_tokens"]) == (5, 4, 50)
+    text = PrometheusSink(tmp_path / "metrics.prom").render(telemetry)
+    assert 'operation="ad_copy",model="claude-3-haiku-20240307"} 5' in text
+
+    telemetry.reset()
+    assert telemetry.snapshot() == [] and telemetry.aggregate("command") == {}
+
+
+def test_agent_result_usage_dict_and_reported_cost():
+    telemetry = LLMTelemetry()
+    result = SimpleNamespace(
+        usage={"input_tokens": 30, "output_tokens": 5, "cache_read_input_tokens": 7},
+        total_cost_usd=0.12,
+    )
+
+    with telemetry.track("setup_workflow", "unknown") as call:
+        call.first_token()
+        call.record_response(result)
+
+    (recorded,) = telemetry.snapshot()
+    assert (recorded.input_tokens, recorded.cache_read_input_tokens) == (30, 7)
+    assert recorded.cost_usd == 0.12
+    assert recorded.time_to_first_token_seconds <= recorded.latency_seconds
+
+
+def test_json_sink_writes_calls_and_totals(tmp_path):
+    telemetry = LLMTelemetry()
+    with telemetry.context(command="generate-ads"):
+        with telemetry.track("ad_copy", HAIKU) as call:
+            call.record_response(_message(input_tokens=10, output_tokens=2))
+    path = tmp_path / "telemetry.json"
+
+    JsonSink(path).write(telemetry)
+
+    data = json.loads(path.read_text())
+    assert data["calls"][0]["operation"] == "ad_copy"
+    assert data["by_command"]["generate-ads"]["calls"] == 1
+    assert data["by_config"]["(none)"]["input_tokens"] == 10
+
+
+def test_prometheus_sink_renders_labelled_counters(tmp_path):
+    telemetry = LLMTelemetry()
+    with telemetry.context(command="generate-ads", config='Say "hi"'):
+        with telemetry.track("ad_copy", HAIKU) as call:
+            call.record_response(_message(input_tokens=10, output_tokens=2))
+
+    text = PrometheusSink(tmp_path / "metrics.prom").render(telemetry)
+
+    labels = (
+        'command="generate-ads",config="Say \\"hi\\"",'
+        f'operation="ad_copy",model="{HAIKU}"'
+    )
+    assert "# TYPE llm_calls_total counter" in text
+    assert f"llm_calls_total{{{labels}}} 1" in text
+    assert f'llm_tokens_total{{{labels},type="input"}} 10' in text
+
+
+def test_make_sink_rejects_unknown_formats(tmp_path):
+    assert isinstance(make_sink(tmp_path / "m.prom", "prometheus"), PrometheusSink)
+    with pytest.raises(ValueError):
+        make_sink(tmp_path / "m.csv", "csv")
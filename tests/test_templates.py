@@ -0,0 +1,78 @@
+"""
+Unit tests for the compiled prompt-template registry.
+"""
+
+import os
+
+import pytest
+from jinja2 import TemplateNotFound
+
+from src.generators.templates import PROMPTS_DIR, TemplateRegistry, get_registry
+
+
+@pytest.fixture
+def prompts_dir(tmp_path):
+    """Provides a small prompts directory with a file and a YAML mapping."""
+    (tmp_path / "setup").mkdir()
+    (tmp_path / "setup" / "greeting.yaml").write_text("Hello {{ name }}!")
+    (tmp_path / "setup" / "angles.yaml").write_text(
+        'pull_template: "Pull for {{ name }}"\npush_template: "Push for {{ name }}"\n'
+    )
+    return tmp_path
+
+
+@pytest.fixture
+def registry(prompts_dir, tmp_path_factory):
+    return TemplateRegistry(prompts_dir, tmp_path_factory.mktemp("bytecode"))
+
+
+def test_render_file(registry):
+    assert registry.render("setup/greeting.yaml", name="Ada") == "Hello Ada!"
+
+
+def test_render_yaml_key(registry):
+    assert registry.render("setup/angles.yaml#push_template", name="Ada") == (
+        "Push for Ada"
+    )
+
+
+def test_template_is_compiled_once(registry):
+    assert registry.get("setup/greeting.yaml") is registry.get("setup/greeting.yaml")
+
+
+def test_template_reloads_when_file_changes(registry, prompts_dir):
+    path = prompts_dir / "setup" / "greeting.yaml"
+    first = registry.get("setup/greeting.yaml")
+
+    path.write_text("Goodbye {{ name }}!")
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+    assert registry.get("setup/greeting.yaml") is not first
+    assert registry.render("setup/greeting.yaml", name="Ada") == "Goodbye Ada!"
+
+
+def test_missing_templates_raise(registry):
+    with pytest.raises(TemplateNotFound):
+        registry.get("setup/missing.yaml")
+    with pytest.raises(TemplateNotFound):
+        registry.get("setup/angles.yaml#missing_template")
+
+
+def test_preload_compiles_files_and_yaml_keys(registry):
+    # Two files plus the two templates in the angles mapping
+    assert registry.preload() == 4
+
+
+def test_shared_registry_renders_repo_prompts():
+    registry = get_registry()
+
+    assert registry is get_registry()
+    assert registry.environment.loader.prompts_dir == PROMPTS_DIR
+    rendered = registry.render(
+        "setup/generate_polarity_ads.yaml#pull_template",
+        persona=None,
+        config=None,
+        keyword_blocklist=["free"],
+    )
+    assert '"Pull"' in rendered